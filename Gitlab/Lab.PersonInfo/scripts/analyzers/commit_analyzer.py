@@ -7,16 +7,49 @@ Commit 品質分析器
 
 from pathlib import Path
 from typing import Optional, Dict
+import numpy as np
 import pandas as pd
 import re
 
 from config.analysis_config import CommitQualityConfig
+from storage.table_store import get_table_store
+
+
+# 評分結果欄位（依輸出順序）
+RESULT_COLUMNS = [
+    "total_commits",
+    # Message 規範性
+    "message_score",
+    "conventional_count",
+    "conventional_rate",
+    # 變更粒度
+    "size_score",
+    "small_changes",
+    "medium_changes",
+    "large_changes",
+    "small_rate",
+    # 修復率
+    "fix_score",
+    "fix_count",
+    "fix_rate",
+    # 總分
+    "commit_quality_score",
+]
 
 
 class CommitQualityAnalyzer:
     """Commit 品質分析器"""
 
-    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None):
+    # 讀取中間數據時只載入評分需要的欄位
+    COMMIT_COLUMNS = ["author_email", "title", "message", "total"]
+    DEVELOPER_COLUMNS = ["email", "username", "name"]
+
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist: bool = True,
+    ):
         if input_dir:
             self.input_dir = Path(input_dir)
         else:
@@ -29,6 +62,139 @@ class CommitQualityAnalyzer:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        self.input_store = get_table_store(self.input_dir)
+        self.output_store = get_table_store(self.output_dir)
+        self.persist = persist
+
+    # ==================== 向量化計算 ====================
+
+    @staticmethod
+    def _annotate_commits(commits_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        以向量化字串運算標記每個 commit 的評估特徵
+
+        Returns:
+            含 email_key、is_conventional、is_small / is_medium / is_large、is_fix 欄位的 DataFrame
+        """
+        titles = (
+            commits_df["title"].fillna("").astype(str)
+            if "title" in commits_df
+            else pd.Series("", index=commits_df.index)
+        )
+        messages = (
+            commits_df["message"].fillna("").astype(str)
+            if "message" in commits_df
+            else pd.Series("", index=commits_df.index)
+        )
+        totals = commits_df["total"] if "total" in commits_df else pd.Series(0, index=commits_df.index)
+
+        # 修復性關鍵字（子字串比對）合併為單一正規表示式
+        fix_pattern = "|".join(re.escape(keyword) for keyword in CommitQualityConfig.FIX_KEYWORDS)
+
+        # 變更行數為空值時與原逐筆判斷相同：不屬於小型與中型，歸為大型
+        is_small = totals <= CommitQualityConfig.CHANGE_SIZE_SMALL
+        is_medium = ~is_small & (totals <= CommitQualityConfig.CHANGE_SIZE_MEDIUM)
+
+        return pd.DataFrame(
+            {
+                "email_key": commits_df["author_email"].fillna("").astype(str).str.lower(),
+                "is_conventional": titles.str.match(
+                    CommitQualityConfig.CONVENTIONAL_COMMIT_PATTERN, na=False
+                ),
+                "is_small": is_small,
+                "is_medium": is_medium,
+                "is_large": ~is_small & ~is_medium,
+                "is_fix": (titles + " " + messages).str.lower().str.contains(fix_pattern, regex=True, na=False),
+            },
+            index=commits_df.index,
+        )
+
+    def score_developers(self, commits_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        一次計算所有開發者的 Commit 品質（以小寫 email 分組）
+
+        Args:
+            commits_df: Commits DataFrame
+
+        Returns:
+            以 email_key 為索引的評分 DataFrame（欄位同 analyze_developer 結果）
+        """
+        annotated = self._annotate_commits(commits_df)
+        stats = annotated.groupby("email_key").agg(
+            total_commits=("is_conventional", "size"),
+            conventional_count=("is_conventional", "sum"),
+            small_changes=("is_small", "sum"),
+            medium_changes=("is_medium", "sum"),
+            large_changes=("is_large", "sum"),
+            fix_count=("is_fix", "sum"),
+        )
+
+        total = stats["total_commits"]
+        stats["conventional_rate"] = stats["conventional_count"] / total
+        stats["small_rate"] = stats["small_changes"] / total
+        stats["fix_rate"] = stats["fix_count"] / total
+
+        stats["message_score"] = self._message_score(stats["conventional_rate"])
+        stats["size_score"] = self._size_score(stats["small_rate"])
+        stats["fix_score"] = self._fix_score(stats["fix_rate"])
+
+        # 綜合評分（三個子維度平均）
+        stats["commit_quality_score"] = (
+            stats["message_score"] + stats["size_score"] + stats["fix_score"]
+        ) / 3
+
+        return stats[RESULT_COLUMNS]
+
+    @staticmethod
+    def _message_score(conventional_rate: pd.Series) -> pd.Series:
+        """Message 規範性評分"""
+        thresholds = CommitQualityConfig.MESSAGE_QUALITY_THRESHOLDS
+        return pd.Series(
+            np.select(
+                [conventional_rate >= thresholds["excellent"], conventional_rate >= thresholds["good"]],
+                [
+                    9 + (conventional_rate - 0.8) / 0.2,  # 9-10分
+                    5 + (conventional_rate - 0.4) / 0.4 * 4,  # 5-9分
+                ],
+                1 + (conventional_rate / 0.4) * 4,  # 1-5分
+            ),
+            index=conventional_rate.index,
+        )
+
+    @staticmethod
+    def _size_score(small_rate: pd.Series) -> pd.Series:
+        """變更粒度評分"""
+        thresholds = CommitQualityConfig.CHANGE_SIZE_THRESHOLDS
+        return pd.Series(
+            np.select(
+                [small_rate >= thresholds["excellent"], small_rate >= thresholds["good"]],
+                [
+                    9 + (small_rate - 0.6) / 0.4,  # 9-10分
+                    6 + (small_rate - 0.4) / 0.2 * 3,  # 6-9分
+                ],
+                1 + (small_rate / 0.4) * 5,  # 1-6分
+            ),
+            index=small_rate.index,
+        )
+
+    @staticmethod
+    def _fix_score(fix_rate: pd.Series) -> pd.Series:
+        """修復率評分（修復率越低越好）"""
+        thresholds = CommitQualityConfig.FIX_RATE_THRESHOLDS
+        return pd.Series(
+            np.select(
+                [fix_rate < thresholds["excellent"], fix_rate < thresholds["good"]],
+                [
+                    9 + (0.15 - fix_rate) / 0.15,  # 9-10分
+                    7 + (0.3 - fix_rate) / 0.15 * 2,  # 7-9分
+                ],
+                np.maximum(1, 7 - (fix_rate - 0.3) / 0.1 * 2),  # 1-7分
+            ),
+            index=fix_rate.index,
+        )
+
+    # ==================== 開發者評分 ====================
+
     def analyze_developer(self, email: str, commits_df: pd.DataFrame) -> Dict:
         """
         分析單個開發者的 Commit 品質
@@ -41,132 +207,18 @@ class CommitQualityAnalyzer:
             評分結果字典
         """
         # 篩選該開發者的 commits
-        dev_commits = commits_df[
-            commits_df["author_email"].str.lower() == email.lower()
-        ].copy()
+        dev_commits = commits_df[commits_df["author_email"].str.lower() == email.lower()]
 
         if len(dev_commits) == 0:
-            return self._empty_result()
-
-        # A. Message 規範性
-        message_score, message_details = self._analyze_message_quality(dev_commits)
-
-        # B. 變更粒度
-        size_score, size_details = self._analyze_change_size(dev_commits)
-
-        # C. 修復率
-        fix_score, fix_details = self._analyze_fix_rate(dev_commits)
-
-        # 綜合評分（三個子維度平均）
-        total_score = (message_score + size_score + fix_score) / 3
-
-        return {
-            "email": email,
-            "total_commits": len(dev_commits),
-            # Message 規範性
-            "message_score": message_score,
-            "conventional_count": message_details["conventional_count"],
-            "conventional_rate": message_details["conventional_rate"],
-            # 變更粒度
-            "size_score": size_score,
-            "small_changes": size_details["small_count"],
-            "medium_changes": size_details["medium_count"],
-            "large_changes": size_details["large_count"],
-            "small_rate": size_details["small_rate"],
-            # 修復率
-            "fix_score": fix_score,
-            "fix_count": fix_details["fix_count"],
-            "fix_rate": fix_details["fix_rate"],
-            # 總分
-            "commit_quality_score": total_score,
-        }
-
-    def _analyze_message_quality(self, commits_df: pd.DataFrame) -> tuple:
-        """分析 Commit Message 規範性"""
-        total = len(commits_df)
-        conventional_count = 0
-
-        for _, row in commits_df.iterrows():
-            title = str(row.get("title", ""))
-            if CommitQualityConfig.CONVENTIONAL_COMMIT_PATTERN.match(title):
-                conventional_count += 1
-
-        conventional_rate = conventional_count / total if total > 0 else 0
-
-        # 評分
-        if conventional_rate >= CommitQualityConfig.MESSAGE_QUALITY_THRESHOLDS["excellent"]:
-            score = 9 + (conventional_rate - 0.8) / 0.2  # 9-10分
-        elif conventional_rate >= CommitQualityConfig.MESSAGE_QUALITY_THRESHOLDS["good"]:
-            score = 5 + (conventional_rate - 0.4) / 0.4 * 4  # 5-9分
-        else:
-            score = 1 + (conventional_rate / 0.4) * 4  # 1-5分
-
-        return score, {
-            "conventional_count": conventional_count,
-            "conventional_rate": conventional_rate,
-        }
-
-    def _analyze_change_size(self, commits_df: pd.DataFrame) -> tuple:
-        """分析變更粒度"""
-        total = len(commits_df)
-        small_count = 0
-        medium_count = 0
-        large_count = 0
-
-        for _, row in commits_df.iterrows():
-            total_changes = row.get("total", 0)
-            if total_changes <= CommitQualityConfig.CHANGE_SIZE_SMALL:
-                small_count += 1
-            elif total_changes <= CommitQualityConfig.CHANGE_SIZE_MEDIUM:
-                medium_count += 1
-            else:
-                large_count += 1
-
-        small_rate = small_count / total if total > 0 else 0
-
-        # 評分
-        if small_rate >= CommitQualityConfig.CHANGE_SIZE_THRESHOLDS["excellent"]:
-            score = 9 + (small_rate - 0.6) / 0.4  # 9-10分
-        elif small_rate >= CommitQualityConfig.CHANGE_SIZE_THRESHOLDS["good"]:
-            score = 6 + (small_rate - 0.4) / 0.2 * 3  # 6-9分
-        else:
-            score = 1 + (small_rate / 0.4) * 5  # 1-6分
-
-        return score, {
-            "small_count": small_count,
-            "medium_count": medium_count,
-            "large_count": large_count,
-            "small_rate": small_rate,
-        }
-
-    def _analyze_fix_rate(self, commits_df: pd.DataFrame) -> tuple:
-        """分析修復率"""
-        total = len(commits_df)
-        fix_count = 0
+            return self._empty_result(email)
 
-        for _, row in commits_df.iterrows():
-            title = str(row.get("title", "")).lower()
-            message = str(row.get("message", "")).lower()
-            combined = title + " " + message
+        result = self.score_developers(dev_commits).iloc[0].to_dict()
+        return {"email": email, **result}
 
-            if any(keyword in combined for keyword in CommitQualityConfig.FIX_KEYWORDS):
-                fix_count += 1
-
-        fix_rate = fix_count / total if total > 0 else 0
-
-        # 評分（修復率越低越好）
-        if fix_rate < CommitQualityConfig.FIX_RATE_THRESHOLDS["excellent"]:
-            score = 9 + (0.15 - fix_rate) / 0.15  # 9-10分
-        elif fix_rate < CommitQualityConfig.FIX_RATE_THRESHOLDS["good"]:
-            score = 7 + (0.3 - fix_rate) / 0.15 * 2  # 7-9分
-        else:
-            score = max(1, 7 - (fix_rate - 0.3) / 0.1 * 2)  # 1-7分
-
-        return score, {"fix_count": fix_count, "fix_rate": fix_rate}
-
-    def _empty_result(self) -> Dict:
+    def _empty_result(self, email: str) -> Dict:
         """空結果"""
         return {
+            "email": email,
             "total_commits": 0,
             "message_score": 0,
             "size_score": 0,
@@ -174,41 +226,64 @@ class CommitQualityAnalyzer:
             "commit_quality_score": 0,
         }
 
-    def analyze_all_developers(self) -> pd.DataFrame:
-        """分析所有開發者的 Commit 品質"""
+    def analyze_all_developers(
+        self,
+        commits_df: Optional[pd.DataFrame] = None,
+        developers_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        分析所有開發者的 Commit 品質
+
+        Args:
+            commits_df: 合併後的 Commit 數據，None 時從 all_commits_merged 表格讀取
+            developers_df: 統一開發者身份，None 時從 unified_developers 表格讀取
+
+        Returns:
+            Commit 品質評分 DataFrame
+        """
         print("\n🔍 分析 Commit 品質...")
 
         # 讀取數據
-        commits_file = self.input_dir / "all_commits_merged.csv"
-        developers_file = self.input_dir / "unified_developers.csv"
-
-        if not commits_file.exists():
-            print("❌ 找不到 Commit 數據檔案")
-            return pd.DataFrame()
-
-        if not developers_file.exists():
-            print("❌ 找不到開發者數據檔案")
-            return pd.DataFrame()
-
-        commits_df = pd.read_csv(commits_file)
-        developers_df = pd.read_csv(developers_file)
-
-        results = []
-        for _, dev in developers_df.iterrows():
-            email = dev["email"]
-            result = self.analyze_developer(email, commits_df)
-            result["username"] = dev.get("username", "")
-            result["name"] = dev.get("name", "")
-            results.append(result)
-
-        # 轉換為 DataFrame
-        df = pd.DataFrame(results)
+        if commits_df is None:
+            if not self.input_store.exists("all_commits_merged"):
+                print("❌ 找不到 Commit 數據檔案")
+                return pd.DataFrame()
+            commits_df = self.input_store.read("all_commits_merged", columns=self.COMMIT_COLUMNS)
+
+        if developers_df is None:
+            if not self.input_store.exists("unified_developers"):
+                print("❌ 找不到開發者數據檔案")
+                return pd.DataFrame()
+            developers_df = self.input_store.read(
+                "unified_developers", columns=self.DEVELOPER_COLUMNS
+            )
+
+        # 一次計算所有開發者的評分，再依開發者列表對應（email 不分大小寫）
+        scores = self.score_developers(commits_df)
+
+        developers = pd.DataFrame(
+            {
+                "email": developers_df["email"],
+                "username": developers_df.get("username", ""),
+                "name": developers_df.get("name", ""),
+            }
+        )
+        df = developers.join(scores, on=developers["email"].astype(str).str.lower())
+
+        # 沒有 commit 的開發者：數量與分數為 0，其餘明細留空（同 _empty_result）
+        no_commits = df["total_commits"].isna()
+        for column in ["total_commits", "message_score", "size_score", "fix_score", "commit_quality_score"]:
+            df.loc[no_commits, column] = 0
+        df["total_commits"] = df["total_commits"].astype(int)
+
+        # 欄位順序與逐筆分析時相同
+        df = df[["email"] + RESULT_COLUMNS + ["username", "name"]]
         df = df.sort_values("commit_quality_score", ascending=False)
 
         # 儲存
-        output_file = self.output_dir / "commit_quality_scores.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ Commit 品質評分已儲存: {output_file}")
+        if self.persist:
+            output_file = self.output_store.write("commit_quality_scores", df)
+            print(f"✅ Commit 品質評分已儲存: {output_file}")
 
         return df
 
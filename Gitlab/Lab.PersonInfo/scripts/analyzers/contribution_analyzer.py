@@ -11,12 +11,23 @@ import pandas as pd
 from datetime import datetime
 
 from config.analysis_config import ContributionConfig
+from storage.table_store import get_table_store
 
 
 class ContributionAnalyzer:
     """程式碼貢獻量分析器"""
 
-    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None):
+    # 讀取中間數據時只載入評分需要的欄位
+    COMMIT_COLUMNS = ["author_email", "additions", "deletions", "authored_date"]
+    FILE_CHANGE_COLUMNS = ["author_email", "file_path"]
+    DEVELOPER_COLUMNS = ["email", "username", "name"]
+
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist: bool = True,
+    ):
         if input_dir:
             self.input_dir = Path(input_dir)
         else:
@@ -27,6 +38,10 @@ class ContributionAnalyzer:
         else:
             self.output_dir = Path(__file__).parent.parent / "output" / "processed"
 
+        self.input_store = get_table_store(self.input_dir)
+        self.output_store = get_table_store(self.output_dir)
+        self.persist = persist
+
     def analyze_developer(self, email: str, commits_df: pd.DataFrame, file_changes_df: pd.DataFrame) -> Dict:
         """分析單個開發者的貢獻量"""
         dev_commits = commits_df[commits_df["author_email"].str.lower() == email.lower()]
@@ -83,21 +98,41 @@ class ContributionAnalyzer:
             "contribution_score": 0,
         }
 
-    def analyze_all_developers(self) -> pd.DataFrame:
-        """分析所有開發者的貢獻量"""
+    def analyze_all_developers(
+        self,
+        commits_df: Optional[pd.DataFrame] = None,
+        file_changes_df: Optional[pd.DataFrame] = None,
+        developers_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        分析所有開發者的貢獻量
+
+        Args:
+            commits_df: 合併後的 Commit 數據，None 時從 all_commits_merged 表格讀取
+            file_changes_df: 清洗後的檔案變更，None 時從 file_changes_cleaned 表格讀取
+            developers_df: 統一開發者身份，None 時從 unified_developers 表格讀取
+
+        Returns:
+            貢獻量評分 DataFrame
+        """
         print("\n🔍 分析程式碼貢獻量...")
 
-        commits_file = self.input_dir / "all_commits_merged.csv"
-        file_changes_file = self.input_dir / "file_changes_cleaned.csv"
-        developers_file = self.input_dir / "unified_developers.csv"
-
-        if not all([commits_file.exists(), developers_file.exists()]):
-            print("❌ 缺少必要的數據檔案")
-            return pd.DataFrame()
-
-        commits_df = pd.read_csv(commits_file)
-        developers_df = pd.read_csv(developers_file)
-        file_changes_df = pd.read_csv(file_changes_file) if file_changes_file.exists() else pd.DataFrame()
+        store = self.input_store
+        for name, df in [("all_commits_merged", commits_df), ("unified_developers", developers_df)]:
+            if df is None and not store.exists(name):
+                print("❌ 缺少必要的數據檔案")
+                return pd.DataFrame()
+
+        if commits_df is None:
+            commits_df = store.read("all_commits_merged", columns=self.COMMIT_COLUMNS)
+        if developers_df is None:
+            developers_df = store.read("unified_developers", columns=self.DEVELOPER_COLUMNS)
+        if file_changes_df is None:
+            file_changes_df = (
+                store.read("file_changes_cleaned", columns=self.FILE_CHANGE_COLUMNS)
+                if store.exists("file_changes_cleaned")
+                else pd.DataFrame()
+            )
 
         results = []
         for _, dev in developers_df.iterrows():
@@ -108,9 +143,9 @@ class ContributionAnalyzer:
 
         df = pd.DataFrame(results).sort_values("contribution_score", ascending=False)
 
-        output_file = self.output_dir / "contribution_scores.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 貢獻量評分已儲存: {output_file}")
+        if self.persist:
+            output_file = self.output_store.write("contribution_scores", df)
+            print(f"✅ 貢獻量評分已儲存: {output_file}")
 
         return df
 
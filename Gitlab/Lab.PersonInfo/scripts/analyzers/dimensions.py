@@ -0,0 +1,113 @@
+"""
+評分維度註冊表
+
+每個評分維度宣告其分析器、輸入表格與輸出的評分欄位，
+分析管線依此建立 DAG 節點，ScoreCalculator 依此彙總最終評分。
+
+新增維度（例如 code_review、collaboration、work_pattern）時：
+1. 實作分析器類別，提供 analyze_all_developers(*inputs) 並回傳含 email 與評分欄位的 DataFrame；
+   以 COMMIT_COLUMNS 等類別屬性（見 INPUT_COLUMN_ATTRS）宣告需要的欄位，節點只會收到這些欄位
+2. 以 register_dimension 註冊，key 需與 AnalysisWeights 的屬性名稱相同
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+from analyzers.commit_analyzer import CommitQualityAnalyzer
+from analyzers.contribution_analyzer import ContributionAnalyzer
+from analyzers.tech_breadth_analyzer import TechBreadthAnalyzer
+
+
+# 數據合併後可作為節點輸入的表格
+BASE_INPUTS = ("developers", "commits", "file_changes", "reviews")
+
+# 基礎輸入 -> 分析器宣告所需欄位的類別屬性（未宣告時傳入完整表格）
+INPUT_COLUMN_ATTRS = {
+    "developers": "DEVELOPER_COLUMNS",
+    "commits": "COMMIT_COLUMNS",
+    "file_changes": "FILE_CHANGE_COLUMNS",
+    "reviews": "REVIEW_COLUMNS",
+}
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """評分維度定義"""
+
+    key: str  # AnalysisWeights 的屬性名稱，例如 commit_quality
+    label: str  # 顯示名稱
+    analyzer: Type  # 分析器類別（建構參數 input_dir、output_dir、persist）
+    inputs: Tuple[str, ...]  # analyze_all_developers 的參數，依序對應 BASE_INPUTS 或其他維度的 key
+    table: str  # 評分表格名稱
+    score_column: str  # 評分欄位名稱
+
+
+_DIMENSIONS: Dict[str, Dimension] = {}
+
+
+def register_dimension(dimension: Dimension) -> Dimension:
+    """
+    註冊評分維度（同 key 重複註冊時覆寫）
+
+    Args:
+        dimension: 維度定義
+
+    Returns:
+        註冊的維度定義
+    """
+    _DIMENSIONS[dimension.key] = dimension
+    return dimension
+
+
+def get_dimensions(keys: Optional[List[str]] = None) -> List[Dimension]:
+    """
+    取得已註冊的評分維度（依註冊順序）
+
+    Args:
+        keys: 只取得這些維度，None 表示全部
+
+    Returns:
+        維度定義列表
+
+    Raises:
+        ValueError: 指定了未註冊的維度
+    """
+    if keys is None:
+        return list(_DIMENSIONS.values())
+
+    unknown = [key for key in keys if key not in _DIMENSIONS]
+    if unknown:
+        raise ValueError(f"未註冊的評分維度: {', '.join(unknown)}（可用: {', '.join(_DIMENSIONS)}）")
+    return [_DIMENSIONS[key] for key in keys]
+
+
+register_dimension(
+    Dimension(
+        key="commit_quality",
+        label="Commit 品質分析",
+        analyzer=CommitQualityAnalyzer,
+        inputs=("commits", "developers"),
+        table="commit_quality_scores",
+        score_column="commit_quality_score",
+    )
+)
+register_dimension(
+    Dimension(
+        key="contribution",
+        label="程式碼貢獻量分析",
+        analyzer=ContributionAnalyzer,
+        inputs=("commits", "file_changes", "developers"),
+        table="contribution_scores",
+        score_column="contribution_score",
+    )
+)
+register_dimension(
+    Dimension(
+        key="tech_breadth",
+        label="技術廣度分析",
+        analyzer=TechBreadthAnalyzer,
+        inputs=("file_changes", "developers"),
+        table="tech_breadth_scores",
+        score_column="tech_breadth_score",
+    )
+)
@@ -0,0 +1,300 @@
+"""
+記憶體分析管線
+
+依序執行數據合併、各維度分析與綜合評分，階段之間直接傳遞 DataFrame，
+合併後的 Commit 與開發者表格只讀取一次；中間數據只在 persist_intermediates=True 時寫入磁碟，
+最終評分一律匯出為 CSV 報表。每個階段記錄耗時與行程最大常駐記憶體（ru_maxrss），
+trace_memory=True 時另以 tracemalloc 記錄 Python 配置的記憶體峰值（較慢）。
+
+各評分維度（analyzers.dimensions）彼此沒有數據相依，以 DAG 排程器在行程池中平行執行，
+全部完成後再由 ScoreCalculator 彙總。
+"""
+
+import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Type
+
+import pandas as pd
+
+from collectors.data_merger import DataMerger
+from analyzers.dimensions import BASE_INPUTS, INPUT_COLUMN_ATTRS, Dimension, get_dimensions
+from analyzers.scheduler import RSS_AVAILABLE, DagScheduler, NodeResult, StageNode, max_rss_mb
+from analyzers.score_calculator import ScoreCalculator
+
+
+@dataclass
+class StageStats:
+    """單一階段的執行統計"""
+
+    name: str
+    seconds: float
+    peak_mb: float  # tracemalloc 峰值（trace_memory=False 時為 0）
+    rows: int
+    detail: bool = False  # 平行執行的子節點（不計入合計耗時）
+    rss_mb: float = 0.0  # 階段結束時行程的最大常駐記憶體（平行節點為其子行程）
+    rss_growth_mb: float = 0.0  # 階段期間最大常駐記憶體的增加量
+
+
+def _run_analyzer(
+    analyzer_cls: Type, output_dir: Optional[str], persist: bool, *frames: pd.DataFrame
+) -> pd.DataFrame:
+    """在子行程中建立分析器並執行（DAG 節點函式）"""
+    analyzer = analyzer_cls(output_dir, output_dir, persist=persist)
+    return analyzer.analyze_all_developers(*frames)
+
+
+class AnalysisPipeline:
+    """記憶體分析管線（合併 → 分析 → 評分 → 匯出）"""
+
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist_intermediates: bool = False,
+        trace_memory: bool = False,
+        max_workers: Optional[int] = None,
+        dimensions: Optional[List[Dimension]] = None,
+    ):
+        """
+        初始化管線
+
+        Args:
+            input_dir: raw 數據目錄，預設為 scripts/output/raw/
+            output_dir: processed 數據與報表目錄，預設為 scripts/output/processed/
+            persist_intermediates: 是否寫出中間表格（合併後數據、各維度評分、final_scores）
+            trace_memory: 是否另以 tracemalloc 記錄各階段記憶體峰值（會增加執行時間；RSS 峰值一律記錄）
+            max_workers: 各維度分析的平行行程數，預設為 CPU 核心數；1 表示依序執行
+            dimensions: 要執行的評分維度，預設為所有已註冊的維度
+        """
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.persist_intermediates = persist_intermediates
+        self.trace_memory = trace_memory
+        self.max_workers = max_workers
+        self.dimensions = dimensions if dimensions is not None else get_dimensions()
+
+        self.stages: List[StageStats] = []
+        self.report_files: List[Path] = []
+
+    def _run_stage(self, name: str, func: Callable, *args, **kwargs):
+        """執行一個階段並記錄耗時、記憶體峰值與輸出筆數"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        rss_before = max_rss_mb()
+        start = time.perf_counter()
+
+        result = func(*args, **kwargs)
+
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else 0
+        rss_after = max_rss_mb()
+
+        if isinstance(result, pd.DataFrame):
+            rows = len(result)
+        elif isinstance(result, dict):
+            values = [value.value if isinstance(value, NodeResult) else value for value in result.values()]
+            rows = sum(len(value) for value in values if isinstance(value, pd.DataFrame))
+        else:
+            rows = len(result)
+
+        self.stages.append(
+            StageStats(
+                name,
+                elapsed,
+                peak / 1024 / 1024,
+                rows,
+                rss_mb=rss_after,
+                rss_growth_mb=rss_after - rss_before,
+            )
+        )
+        return result
+
+    def run(self, manual_developer_mapping: Optional[Dict[str, str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        執行完整管線
+
+        Args:
+            manual_developer_mapping: 手動開發者映射（email -> canonical_email）
+
+        Returns:
+            各階段輸出的字典（developers、commits、file_changes、reviews、各維度評分、final_scores）
+        """
+        persist = self.persist_intermediates
+        self.stages = []
+
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            # 步驟 1: 數據合併與清洗（raw 表格只讀取一次）
+            print("\n📦 步驟 1: 數據合併與清洗")
+            merger = DataMerger(self.input_dir, self.output_dir, persist=persist)
+            merged = self._run_stage("數據合併與清洗", merger.process_all, manual_developer_mapping)
+
+            developers = merged["developers"]
+            commits = merged["commits"]
+            file_changes = merged["file_changes"]
+            if file_changes.empty:
+                file_changes = pd.DataFrame(
+                    columns=["author_email", "file_path", "file_extension"]
+                )
+
+            # 步驟 2: 各維度分析（DAG 排程，互不相依的維度平行執行）
+            print("\n📊 步驟 2: 執行分析")
+            frames = {
+                "developers": developers,
+                "commits": commits,
+                "file_changes": file_changes,
+                "reviews": merged["reviews"],
+            }
+            score_tables = self._run_dimensions(frames, persist)
+
+            # 步驟 3: 綜合評分
+            print("\n🎯 步驟 3: 計算綜合評分")
+            calculator = ScoreCalculator(
+                self.output_dir, self.output_dir, persist=persist, dimensions=self.dimensions
+            )
+            final_scores = self._run_stage(
+                "綜合評分", calculator.calculate_final_scores, score_tables, developers
+            )
+
+            # 步驟 4: 匯出 CSV 報表
+            self.report_files = self._run_stage(
+                "匯出報表",
+                calculator.export_reports,
+                frames={"final_scores": final_scores, **score_tables},
+            )
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return {
+            **merged,
+            **score_tables,
+            "final_scores": final_scores,
+        }
+
+    def _run_dimensions(
+        self, frames: Dict[str, pd.DataFrame], persist: bool
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        以 DAG 排程器執行各評分維度
+
+        輸入來源不存在（沒有任何欄位）的維度，以及相依於它們的維度會被略過。
+        送入行程池前，基礎輸入先裁切為各分析器宣告的欄位，避免序列化整個表格到每個子行程。
+
+        Returns:
+            評分表格名稱 -> DataFrame
+        """
+        skipped = set()
+        for dimension in self.dimensions:
+            missing = [
+                key
+                for key in dimension.inputs
+                if (key in BASE_INPUTS and len(frames[key].columns) == 0) or key in skipped
+            ]
+            if missing:
+                print(f"⚠️ 缺少 {', '.join(missing)} 數據，略過{dimension.label}")
+                skipped.add(dimension.key)
+
+        inputs = dict(frames)
+        nodes = [
+            StageNode(
+                name=dimension.key,
+                func=partial(_run_analyzer, dimension.analyzer, self.output_dir, persist),
+                inputs=tuple(self._project_input(inputs, dimension, key) for key in dimension.inputs),
+                label=dimension.label,
+            )
+            for dimension in self.dimensions
+            if dimension.key not in skipped
+        ]
+        if not nodes:
+            return {}
+
+        scheduler = DagScheduler(nodes, max_workers=self.max_workers, trace_memory=self.trace_memory)
+        workers = min(scheduler.max_workers, len(nodes))
+        print(f"   {len(nodes)} 個評分維度，{workers} 個行程")
+
+        def on_complete(result: NodeResult) -> None:
+            print(f"   ✅ {result.label}完成（{result.seconds:.2f} 秒）")
+
+        results = self._run_stage(
+            f"各維度分析 ×{workers}", scheduler.run, inputs, on_complete=on_complete
+        )
+        for dimension in self.dimensions:
+            if dimension.key in results:
+                result = results[dimension.key]
+                self.stages.append(
+                    StageStats(
+                        result.label,
+                        result.seconds,
+                        result.peak_mb,
+                        len(result.value),
+                        detail=True,
+                        rss_mb=result.rss_mb,
+                        rss_growth_mb=result.rss_growth_mb,
+                    )
+                )
+
+        tables = {dimension.key: dimension.table for dimension in self.dimensions}
+        return {tables[name]: result.value for name, result in results.items()}
+
+    @staticmethod
+    def _project_input(inputs: Dict[str, pd.DataFrame], dimension: Dimension, key: str) -> str:
+        """
+        將基礎輸入裁切為分析器宣告的欄位（相同欄位組合的維度共用同一份）
+
+        Args:
+            inputs: 排程器的初始輸入，裁切後的表格以新的鍵加入
+            dimension: 維度定義
+            key: 維度的輸入鍵
+
+        Returns:
+            節點使用的輸入鍵（非基礎輸入或分析器未宣告欄位時為原鍵）
+        """
+        columns = getattr(dimension.analyzer, INPUT_COLUMN_ATTRS.get(key, ""), None)
+        if key not in BASE_INPUTS or not columns:
+            return key
+
+        frame = inputs[key]
+        columns = [column for column in columns if column in frame.columns]
+        projected_key = f"{key}[{','.join(columns)}]"
+        if projected_key not in inputs:
+            inputs[projected_key] = frame[columns]
+        return projected_key
+
+    def print_stage_report(self) -> None:
+        """
+        列印各階段耗時與記憶體峰值
+
+        RSS 峰值為階段結束時行程的最大常駐記憶體，+RSS 為階段期間的增加量
+        （平行執行的維度為其子行程的數值）；追蹤峰值只在 trace_memory=True 時顯示。
+        """
+
+        def mb(value: float, enabled: bool) -> str:
+            return f"{value:.1f}" if enabled else "-"
+
+        print("\n⏱️ 各階段執行統計：")
+        print(
+            f"   {'階段':<16}{'耗時(秒)':>10}{'RSS峰值(MB)':>13}{'+RSS(MB)':>10}"
+            f"{'追蹤峰值(MB)':>14}{'輸出筆數':>10}"
+        )
+        for stage in self.stages:
+            name = f"└ {stage.name}" if stage.detail else stage.name
+            print(
+                f"   {name:<16}{stage.seconds:>10.2f}{mb(stage.rss_mb, RSS_AVAILABLE):>13}"
+                f"{mb(stage.rss_growth_mb, RSS_AVAILABLE):>10}"
+                f"{mb(stage.peak_mb, self.trace_memory):>14}{stage.rows:>10}"
+            )
+
+        total = sum(stage.seconds for stage in self.stages if not stage.detail)
+        overall_rss = max((stage.rss_mb for stage in self.stages), default=0)
+        overall_peak = max((stage.peak_mb for stage in self.stages), default=0)
+        print(
+            f"   {'合計':<16}{total:>10.2f}{mb(overall_rss, RSS_AVAILABLE):>13}{'':>10}"
+            f"{mb(overall_peak, self.trace_memory):>14}"
+        )
@@ -0,0 +1,201 @@
+"""
+DAG 階段排程器
+
+依節點宣告的輸入建立相依關係：輸入都就緒的節點立即送入行程池平行執行，
+每個節點完成後再送出因此就緒的節點。max_workers=1 時在目前行程中依拓撲順序執行。
+
+節點函式會被序列化送到子行程，需為模組層級的函式（或其 functools.partial）。
+每個節點一律記錄執行行程的最大常駐記憶體（ru_maxrss，幾乎沒有額外成本），
+trace_memory=True 時另以 tracemalloc 記錄 Python 配置的記憶體峰值。
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows 沒有 resource 模組
+    resource = None
+
+
+# 是否能取得行程的最大常駐記憶體
+RSS_AVAILABLE = resource is not None
+
+
+def max_rss_mb() -> float:
+    """目前行程的最大常駐記憶體（MB）；不支援的平台回傳 0"""
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 為單位，macOS 以 bytes 為單位
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+@dataclass(frozen=True)
+class StageNode:
+    """DAG 節點"""
+
+    name: str  # 節點名稱，亦為輸出結果的鍵
+    func: Callable  # 節點函式，參數依 inputs 順序傳入
+    inputs: Tuple[str, ...]  # 輸入鍵（初始輸入或其他節點的名稱）
+    label: str = ""  # 顯示名稱
+
+
+@dataclass
+class NodeResult:
+    """節點執行結果"""
+
+    name: str
+    label: str
+    value: Any
+    seconds: float
+    peak_mb: float  # tracemalloc 峰值（trace_memory=False 時為 0）
+    rss_mb: float = 0.0  # 執行後行程的最大常駐記憶體
+    rss_growth_mb: float = 0.0  # 執行期間最大常駐記憶體的增加量
+
+
+def _execute(
+    func: Callable, args: Tuple, trace_memory: bool
+) -> Tuple[Any, float, float, float, float]:
+    """
+    執行節點函式並量測耗時與記憶體（在子行程或目前行程中執行）
+
+    Returns:
+        (結果, 秒數, tracemalloc 峰值 MB, 執行後最大常駐記憶體 MB, 最大常駐記憶體增加量 MB)
+    """
+    rss_before = max_rss_mb()
+    started_tracing = False
+    if trace_memory:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+
+    start = time.perf_counter()
+    try:
+        value = func(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if started_tracing:
+            tracemalloc.stop()
+
+    rss_after = max_rss_mb()
+    return value, elapsed, peak / 1024 / 1024, rss_after, rss_after - rss_before
+
+
+class DagScheduler:
+    """DAG 階段排程器"""
+
+    def __init__(
+        self,
+        nodes: Iterable[StageNode],
+        max_workers: Optional[int] = None,
+        trace_memory: bool = False,
+    ):
+        """
+        初始化排程器
+
+        Args:
+            nodes: DAG 節點
+            max_workers: 平行行程數，預設為 CPU 核心數；1 表示在目前行程中依序執行
+            trace_memory: 是否另以 tracemalloc 記錄各節點的記憶體峰值
+
+        Raises:
+            ValueError: 節點名稱重複
+        """
+        self.nodes: Dict[str, StageNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"節點名稱重複: {node.name}")
+            self.nodes[node.name] = node
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.trace_memory = trace_memory
+
+    def topological_order(self, available: Iterable[str]) -> List[StageNode]:
+        """
+        依相依關係排序節點
+
+        Args:
+            available: 執行前已就緒的輸入鍵
+
+        Returns:
+            拓撲排序後的節點列表
+
+        Raises:
+            ValueError: 節點輸入不存在或存在循環相依
+        """
+        ready = set(available)
+        for node in self.nodes.values():
+            missing = [key for key in node.inputs if key not in ready and key not in self.nodes]
+            if missing:
+                raise ValueError(f"節點 {node.name} 的輸入不存在: {', '.join(missing)}")
+
+        order = []
+        pending = dict(self.nodes)
+        while pending:
+            runnable = [node for node in pending.values() if all(key in ready for key in node.inputs)]
+            if not runnable:
+                raise ValueError(f"節點存在循環相依: {', '.join(pending)}")
+            for node in runnable:
+                order.append(node)
+                ready.add(node.name)
+                del pending[node.name]
+        return order
+
+    def run(
+        self,
+        inputs: Dict[str, Any],
+        on_complete: Optional[Callable[[NodeResult], None]] = None,
+    ) -> Dict[str, NodeResult]:
+        """
+        執行所有節點
+
+        Args:
+            inputs: 初始輸入（鍵 -> 值）
+            on_complete: 每個節點完成時的回呼
+
+        Returns:
+            節點名稱 -> 執行結果
+        """
+        order = self.topological_order(inputs)
+        values = dict(inputs)
+        results: Dict[str, NodeResult] = {}
+
+        def finish(node: StageNode, outcome: Tuple[Any, float, float, float, float]) -> None:
+            value, *measures = outcome
+            values[node.name] = value
+            results[node.name] = NodeResult(node.name, node.label or node.name, value, *measures)
+            if on_complete:
+                on_complete(results[node.name])
+
+        workers = min(self.max_workers, len(order))
+        if workers <= 1:
+            for node in order:
+                args = tuple(values[key] for key in node.inputs)
+                finish(node, _execute(node.func, args, self.trace_memory))
+            return results
+
+        pending = list(order)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while pending or running:
+                # 送出所有輸入已就緒的節點
+                for node in [n for n in pending if all(key in values for key in n.inputs)]:
+                    args = tuple(values[key] for key in node.inputs)
+                    future = executor.submit(_execute, node.func, args, self.trace_memory)
+                    running[future] = node
+                    pending.remove(node)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
+
+        return results
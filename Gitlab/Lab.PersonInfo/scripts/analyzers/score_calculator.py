@@ -1,20 +1,28 @@
 """
 綜合評分計算器
 
-整合所有分析器的結果，計算最終評分。
+整合所有已註冊評分維度（見 analyzers.dimensions）的結果，計算最終評分。
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 import pandas as pd
 
 from config.analysis_config import AnalysisWeights, GradingConfig
+from analyzers.dimensions import Dimension, get_dimensions
+from storage.table_store import CsvTableStore, get_table_store
 
 
 class ScoreCalculator:
     """綜合評分計算器"""
 
-    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None):
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist: bool = True,
+        dimensions: Optional[List[Dimension]] = None,
+    ):
         if input_dir:
             self.input_dir = Path(input_dir)
         else:
@@ -25,73 +33,96 @@ class ScoreCalculator:
         else:
             self.output_dir = Path(__file__).parent.parent / "output" / "processed"
 
-        self.weights = AnalysisWeights()
+        self.input_store = get_table_store(self.input_dir)
+        self.output_store = get_table_store(self.output_dir)
+        self.persist = persist
 
-    def calculate_final_scores(self) -> pd.DataFrame:
-        """計算所有開發者的最終評分"""
+        self.weights = AnalysisWeights()
+        self.dimensions = dimensions if dimensions is not None else get_dimensions()
+
+    @property
+    def report_tables(self) -> List[str]:
+        """最終匯出為 CSV 的報表表格"""
+        return ["final_scores"] + [dimension.table for dimension in self.dimensions]
+
+    def _read_scores(
+        self, name: str, column: str, score_tables: Dict[str, pd.DataFrame]
+    ) -> Optional[pd.Series]:
+        """
+        取得某個維度的評分（email -> 分數）
+
+        優先使用 score_tables 中已在記憶體的表格，否則只讀取 email 與評分欄位；
+        兩者皆無時回傳 None
+        """
+        df = score_tables.get(name)
+        if df is None:
+            if not self.input_store.exists(name):
+                return None
+            df = self.input_store.read(name, columns=["email", column])
+        if df.empty or column not in df:
+            return None
+        return df.set_index("email")[column]
+
+    def calculate_final_scores(
+        self,
+        score_tables: Optional[Dict[str, pd.DataFrame]] = None,
+        developers_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        計算所有開發者的最終評分
+
+        依 dimensions 註冊表彙總各維度評分，權重取自 AnalysisWeights 中同名的屬性。
+
+        Args:
+            score_tables: 各維度評分表格（表格名稱 -> DataFrame），未提供的維度從儲存後端讀取
+            developers_df: 統一開發者身份，None 時從 unified_developers 表格讀取
+
+        Returns:
+            綜合評分 DataFrame
+        """
         print("\n🔍 計算綜合評分...")
+        score_tables = score_tables or {}
 
         # 讀取所有分析結果
         scores_data = {}
-
-        # 1. Commit 品質 (23%)
-        commit_file = self.input_dir / "commit_quality_scores.csv"
-        if commit_file.exists():
-            df = pd.read_csv(commit_file)
-            scores_data["commit_quality"] = df.set_index("email")["commit_quality_score"]
-        else:
-            print("⚠️ 缺少 Commit 品質評分")
-
-        # 2. 貢獻量 (12%)
-        contribution_file = self.input_dir / "contribution_scores.csv"
-        if contribution_file.exists():
-            df = pd.read_csv(contribution_file)
-            scores_data["contribution"] = df.set_index("email")["contribution_score"]
-        else:
-            print("⚠️ 缺少貢獻量評分")
-
-        # 3. 技術廣度 (18%)
-        tech_file = self.input_dir / "tech_breadth_scores.csv"
-        if tech_file.exists():
-            df = pd.read_csv(tech_file)
-            scores_data["tech_breadth"] = df.set_index("email")["tech_breadth_score"]
-        else:
-            print("⚠️ 缺少技術廣度評分")
+        for dimension in self.dimensions:
+            scores = self._read_scores(dimension.table, dimension.score_column, score_tables)
+            if scores is not None:
+                scores_data[dimension.key] = scores
+            else:
+                print(f"⚠️ 缺少{dimension.label}評分")
 
         # 讀取開發者列表
-        developers_file = self.input_dir / "unified_developers.csv"
-        if not developers_file.exists():
-            print("❌ 找不到開發者列表")
-            return pd.DataFrame()
-
-        developers_df = pd.read_csv(developers_file)
+        if developers_df is None:
+            if not self.input_store.exists("unified_developers"):
+                print("❌ 找不到開發者列表")
+                return pd.DataFrame()
+            developers_df = self.input_store.read(
+                "unified_developers", columns=["email", "username", "name"]
+            )
 
         # 計算每位開發者的最終評分
         results = []
         for _, dev in developers_df.iterrows():
             email = dev["email"]
 
-            # 獲取各維度分數（如果缺失則為 0）
-            commit_quality = scores_data.get("commit_quality", pd.Series()).get(email, 0)
-            contribution = scores_data.get("contribution", pd.Series()).get(email, 0)
-            tech_breadth = scores_data.get("tech_breadth", pd.Series()).get(email, 0)
+            result = {
+                "email": email,
+                "username": dev.get("username", ""),
+                "name": dev.get("name", ""),
+            }
 
-            # 簡化版本：只計算已有的維度
-            # 完整版本應包含所有 7 個維度
+            # 只計算已有的維度（缺失或 0 分的維度不列入權重）
             total_weight = 0
             total_score = 0
+            for dimension in self.dimensions:
+                score = scores_data.get(dimension.key, pd.Series()).get(email, 0)
+                result[dimension.score_column] = score
 
-            if commit_quality > 0:
-                total_score += commit_quality * self.weights.commit_quality
-                total_weight += self.weights.commit_quality
-
-            if contribution > 0:
-                total_score += contribution * self.weights.contribution
-                total_weight += self.weights.contribution
-
-            if tech_breadth > 0:
-                total_score += tech_breadth * self.weights.tech_breadth
-                total_weight += self.weights.tech_breadth
+                if score > 0:
+                    weight = getattr(self.weights, dimension.key)
+                    total_score += score * weight
+                    total_weight += weight
 
             # 正規化到 10 分制
             final_score = (total_score / total_weight * 10) if total_weight > 0 else 0
@@ -99,24 +130,19 @@ class ScoreCalculator:
             # 取得等級
             grade_title, grade_level, _ = GradingConfig.get_grade(final_score)
 
-            results.append({
-                "email": email,
-                "username": dev.get("username", ""),
-                "name": dev.get("name", ""),
-                "commit_quality_score": commit_quality,
-                "contribution_score": contribution,
-                "tech_breadth_score": tech_breadth,
+            result.update({
                 "final_score": round(final_score, 2),
                 "grade": grade_title,
                 "grade_level": grade_level,
             })
+            results.append(result)
 
         df = pd.DataFrame(results).sort_values("final_score", ascending=False)
 
         # 儲存
-        output_file = self.output_dir / "final_scores.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 綜合評分已儲存: {output_file}")
+        if self.persist:
+            output_file = self.output_store.write("final_scores", df)
+            print(f"✅ 綜合評分已儲存: {output_file}")
 
         # 顯示統計
         print("\n📊 評分統計：")
@@ -126,10 +152,37 @@ class ScoreCalculator:
 
         return df
 
+    def export_reports(
+        self,
+        tables: Optional[List[str]] = None,
+        frames: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> List[Path]:
+        """
+        將評分表格匯出為 utf-8-sig CSV（中間數據以 Parquet 儲存時，CSV 只作為最終報表）
+
+        Args:
+            tables: 要匯出的表格名稱，預設為 report_tables
+            frames: 已在記憶體的表格（表格名稱 -> DataFrame），直接寫出而不從儲存後端讀取
+
+        Returns:
+            匯出的 CSV 檔案路徑列表
+        """
+        frames = frames or {}
+        csv_store = CsvTableStore(self.output_dir)
+
+        exported = []
+        for name in tables or self.report_tables:
+            if name in frames:
+                exported.append(csv_store.write(name, frames[name]))
+            elif self.output_store.exists(name):
+                exported.append(self.output_store.export_csv(name))
+        return exported
+
 
 if __name__ == "__main__":
     calculator = ScoreCalculator()
     results = calculator.calculate_final_scores()
+    calculator.export_reports()
     if len(results) > 0:
         print("\n🏆 前 10 位開發者：")
         print(results.head(10)[["name", "final_score", "grade"]])
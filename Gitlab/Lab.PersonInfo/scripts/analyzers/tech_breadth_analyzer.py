@@ -10,12 +10,22 @@ from typing import Optional, Dict, Set
 import pandas as pd
 
 from config.analysis_config import TechBreadthConfig
+from storage.table_store import get_table_store
 
 
 class TechBreadthAnalyzer:
     """技術廣度分析器"""
 
-    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None):
+    # 讀取中間數據時只載入評分需要的欄位
+    FILE_CHANGE_COLUMNS = ["author_email", "file_extension"]
+    DEVELOPER_COLUMNS = ["email", "username", "name"]
+
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist: bool = True,
+    ):
         if input_dir:
             self.input_dir = Path(input_dir)
         else:
@@ -26,6 +36,10 @@ class TechBreadthAnalyzer:
         else:
             self.output_dir = Path(__file__).parent.parent / "output" / "processed"
 
+        self.input_store = get_table_store(self.input_dir)
+        self.output_store = get_table_store(self.output_dir)
+        self.persist = persist
+
     def analyze_developer(self, email: str, file_changes_df: pd.DataFrame) -> Dict:
         """分析單個開發者的技術廣度"""
         dev_files = file_changes_df[file_changes_df["author_email"].str.lower() == email.lower()]
@@ -98,19 +112,33 @@ class TechBreadthAnalyzer:
             "tech_breadth_score": 0,
         }
 
-    def analyze_all_developers(self) -> pd.DataFrame:
-        """分析所有開發者的技術廣度"""
+    def analyze_all_developers(
+        self,
+        file_changes_df: Optional[pd.DataFrame] = None,
+        developers_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        分析所有開發者的技術廣度
+
+        Args:
+            file_changes_df: 清洗後的檔案變更，None 時從 file_changes_cleaned 表格讀取
+            developers_df: 統一開發者身份，None 時從 unified_developers 表格讀取
+
+        Returns:
+            技術廣度評分 DataFrame
+        """
         print("\n🔍 分析技術廣度...")
 
-        file_changes_file = self.input_dir / "file_changes_cleaned.csv"
-        developers_file = self.input_dir / "unified_developers.csv"
-
-        if not all([file_changes_file.exists(), developers_file.exists()]):
-            print("❌ 缺少必要的數據檔案")
-            return pd.DataFrame()
+        store = self.input_store
+        for name, df in [("file_changes_cleaned", file_changes_df), ("unified_developers", developers_df)]:
+            if df is None and not store.exists(name):
+                print("❌ 缺少必要的數據檔案")
+                return pd.DataFrame()
 
-        file_changes_df = pd.read_csv(file_changes_file)
-        developers_df = pd.read_csv(developers_file)
+        if file_changes_df is None:
+            file_changes_df = store.read("file_changes_cleaned", columns=self.FILE_CHANGE_COLUMNS)
+        if developers_df is None:
+            developers_df = store.read("unified_developers", columns=self.DEVELOPER_COLUMNS)
 
         results = []
         for _, dev in developers_df.iterrows():
@@ -121,9 +149,9 @@ class TechBreadthAnalyzer:
 
         df = pd.DataFrame(results).sort_values("tech_breadth_score", ascending=False)
 
-        output_file = self.output_dir / "tech_breadth_scores.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 技術廣度評分已儲存: {output_file}")
+        if self.persist:
+            output_file = self.output_store.write("tech_breadth_scores", df)
+            print(f"✅ 技術廣度評分已儲存: {output_file}")
 
         return df
 
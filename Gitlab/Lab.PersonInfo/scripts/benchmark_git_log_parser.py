@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+git log 解析器基準測試
+
+以 git fast-import 建立合成 Repository（預設 100,000 個 commit），
+比較 GitLocalCollector 的 record 與 legacy 解析模式的吞吐量與正確性。
+
+合成歷史刻意包含會破壞舊版 | 分隔解析的內容：
+- 標題含有 |
+- 多行 commit 訊息（含空行）
+- 路徑含有 |、空白
+- 檔案重新命名
+
+使用方式：
+    uv run python scripts/benchmark_git_log_parser.py
+    uv run python scripts/benchmark_git_log_parser.py --commits 20000 --keep-repo /tmp/synthetic-repo
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from collectors.git_local_collector import GitLocalCollector, PARSER_MODES
+
+
+# 合成 Repository 中輪流修改的檔案數
+FILE_POOL_SIZE = 200
+
+
+def _file_path(index: int) -> str:
+    """第 index 個檔案的路徑（部分路徑含有 | 與空白）"""
+    if index % 20 == 0:
+        return f"docs/notes|{index}.md"
+    if index % 15 == 0:
+        return f"src/module {index}/file.py"
+    return f"src/mod{index % 10}/file{index}.py"
+
+
+def build_synthetic_repo(repo_path: Path, commit_count: int) -> List[Dict]:
+    """
+    以 git fast-import 建立合成 Repository
+
+    Args:
+        repo_path: Repository 路徑
+        commit_count: commit 數量
+
+    Returns:
+        預期的解析結果（依 git log 順序，最新的在前）
+    """
+    subprocess.run(["git", "init", "-q", "-b", "main", str(repo_path)], check=True)
+
+    paths = {index: _file_path(index) for index in range(FILE_POOL_SIZE)}
+    line_counts: Dict[str, int] = {}
+    expected = []
+    base_time = 1_600_000_000
+
+    process = subprocess.Popen(
+        ["git", "-C", str(repo_path), "fast-import", "--quiet"], stdin=subprocess.PIPE
+    )
+
+    def write(data: bytes) -> None:
+        process.stdin.write(data)
+
+    for i in range(1, commit_count + 1):
+        author = f"Dev {i % 37}"
+        email = f"dev{i % 37}@example.com"
+        title = f"feat: change {i} | part {i % 7}" if i % 10 == 0 else f"feat: change {i}"
+        message = title
+        if i % 7 == 0:
+            message += f"\n\nDetails for change {i}\n\n- item | one\n- item two"
+
+        index = i % FILE_POOL_SIZE
+        path = paths[index]
+        renamed = i % 97 == 0 and path in line_counts
+
+        write(f"commit refs/heads/main\nmark :{i}\n".encode())
+        write(f"author {author} <{email}> {base_time + i} +0000\n".encode())
+        write(f"committer {author} <{email}> {base_time + i} +0000\n".encode())
+        data = message.encode()
+        write(f"data {len(data)}\n".encode() + data + b"\n")
+        if i > 1:
+            write(f"from :{i - 1}\n".encode())
+
+        if renamed:
+            # 只重新命名、不修改內容：numstat 為 0 0
+            new_path = path.replace("file", "renamed", 1) if "file" in path else path + ".moved"
+            write(f'R "{path}" "{new_path}"\n'.encode())
+            line_counts[new_path] = line_counts.pop(path)
+            paths[index] = new_path
+            additions, deletions = 0, 0
+        else:
+            added_lines = i % 5 + 1
+            content = "".join(f"line {i}-{n}\n" for n in range(added_lines)).encode()
+            write(f'M 100644 inline "{path}"\n'.encode())
+            write(f"data {len(content)}\n".encode() + content + b"\n")
+            additions, deletions = added_lines, line_counts.get(path, 0)
+            line_counts[path] = added_lines
+
+        write(b"\n")
+        expected.append(
+            {
+                "title": title,
+                "message": message,
+                "author_email": email,
+                "additions": additions,
+                "deletions": deletions,
+                "changed_files": 1,
+            }
+        )
+
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError("git fast-import 執行失敗")
+
+    subprocess.run(["git", "-C", str(repo_path), "checkout", "-q", "main"], check=True)
+    expected.reverse()
+    return expected
+
+
+def run_parser(repo_path: Path, parser: str, expected: List[Dict]) -> Dict:
+    """
+    執行指定解析模式並與預期結果比對
+
+    Returns:
+        測試結果字典
+    """
+    collector = GitLocalCollector(str(repo_path), output_dir=tempfile.gettempdir(), parser=parser)
+
+    start = time.perf_counter()
+    commits = list(collector.iter_commits())
+    elapsed = time.perf_counter() - start
+
+    fields = list(expected[0].keys()) if expected else []
+    correct = 0
+    field_errors = {field: 0 for field in fields}
+    for actual, wanted in zip(commits, expected):
+        mismatched = [field for field in fields if actual.get(field) != wanted[field]]
+        for field in mismatched:
+            field_errors[field] += 1
+        if not mismatched:
+            correct += 1
+
+    return {
+        "parser": parser,
+        "seconds": elapsed,
+        "parsed": len(commits),
+        "correct": correct,
+        "field_errors": {field: count for field, count in field_errors.items() if count},
+        "throughput": len(commits) / elapsed if elapsed else 0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="git log 解析器基準測試")
+    parser.add_argument("--commits", type=int, default=100_000, help="合成 commit 數量（預設 100000）")
+    parser.add_argument("--keep-repo", help="將合成 Repository 建立在指定路徑並保留")
+    parser.add_argument(
+        "--parsers", nargs="+", default=list(PARSER_MODES), choices=PARSER_MODES, help="要測試的解析模式"
+    )
+    args = parser.parse_args()
+
+    work_dir = Path(args.keep_repo) if args.keep_repo else Path(tempfile.mkdtemp(prefix="git-log-bench-"))
+    try:
+        print(f"🔧 建立合成 Repository: {work_dir} ({args.commits} commits)")
+        start = time.perf_counter()
+        expected = build_synthetic_repo(work_dir, args.commits)
+        print(f"   完成，耗時 {time.perf_counter() - start:.1f} 秒\n")
+
+        print(f"{'解析模式':<10}{'耗時(秒)':>10}{'commits/秒':>14}{'解析筆數':>10}{'正確筆數':>10}{'正確率':>9}")
+        for mode in args.parsers:
+            result = run_parser(work_dir, mode, expected)
+            accuracy = result["correct"] / len(expected) * 100 if expected else 0
+            print(
+                f"{result['parser']:<10}{result['seconds']:>10.2f}{result['throughput']:>14.0f}"
+                f"{result['parsed']:>10}{result['correct']:>10}{accuracy:>8.1f}%"
+            )
+            if result["field_errors"]:
+                errors = ", ".join(f"{field}={count}" for field, count in result["field_errors"].items())
+                print(f"{'':<10}錯誤欄位: {errors}")
+    finally:
+        if not args.keep_repo:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,11 +14,25 @@ GitLab 數據收集腳本
 
     # 只收集 MR 數據
     uv run python scripts/collect_data.py --only-mr
+
+    # MR 行數統計改為下載完整 diff 計算（較慢，傳輸量大）
+    uv run python scripts/collect_data.py --only-mr --full-mr-diffs
+
+    # 增量同步（只抓取上次收集之後的新數據，適合排程每日執行）
+    uv run python scripts/collect_data.py --incremental
+
+    # 續傳上次中斷的收集（參數需相同；略過已完成的專案，未完成的專案從上次的分頁繼續）
+    uv run python scripts/collect_data.py --from 2024-01-01 --to 2024-12-31 --resume
+
+    # 平行收集多個本地 Git Repository（clone 所在目錄，或每行一個路徑的清單檔）
+    uv run python scripts/collect_data.py --local-repos ~/src/team-repos --repo-workers 8
 """
 
 import click
 from datetime import datetime, timedelta
 from collectors.gitlab_api_collector import GitLabAPICollector
+from collectors.multi_repo_collector import MultiRepoCollector, discover_repos
+from config.env import load_env
 
 
 @click.command()
@@ -54,6 +68,39 @@ from collectors.gitlab_api_collector import GitLabAPICollector
 @click.option(
     "--only-commits", is_flag=True, help="只收集 Commit 數據"
 )
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="增量模式：依各專案同步水位只抓取新數據，並合併到 output/raw 既有檔案",
+)
+@click.option(
+    "--full-mr-diffs",
+    is_flag=True,
+    help="MR 行數統計一律下載完整 diff 計算（預設在 commit 統計都已快取時以其加總，為近似值）",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="續傳上次中斷的收集（參數需相同）：略過已完成的專案，未完成的專案從上次的分頁繼續",
+)
+@click.option(
+    "--local-repos",
+    type=str,
+    default=None,
+    help="改為收集本地 Git Repository：包含多個 clone 的目錄，或每行一個路徑的清單檔",
+)
+@click.option(
+    "--repo-workers",
+    type=int,
+    default=None,
+    help="搭配 --local-repos：同時處理的本地 Repository 行程數（預設為 CPU 核心數）",
+)
+@click.option(
+    "--api-workers",
+    type=int,
+    default=None,
+    help="API 完整收集時同時處理的專案執行緒數（預設 API_MAX_WORKERS）",
+)
 def main(
     start_date: str,
     end_date: str,
@@ -62,6 +109,12 @@ def main(
     only_mr: bool,
     only_comments: bool,
     only_commits: bool,
+    incremental: bool,
+    full_mr_diffs: bool,
+    resume: bool,
+    local_repos: str,
+    repo_workers: int,
+    api_workers: int,
 ):
     """GitLab 數據收集主程式"""
 
@@ -71,6 +124,16 @@ def main(
     if end_date is None:
         end_date = datetime.now().strftime("%Y-%m-%d")
 
+    # 本地 Git Repository 收集（不呼叫 GitLab API）
+    if local_repos:
+        repo_paths = discover_repos(local_repos)
+        print(f"📅 時間範圍: {start_date} 至 {end_date}")
+        print(f"📂 本地 Repository: {len(repo_paths)} 個")
+        MultiRepoCollector(repo_paths, max_workers=repo_workers).collect_all(
+            since=start_date, until=end_date
+        )
+        return
+
     # 處理專案 ID
     project_ids = None
     if projects:
@@ -82,8 +145,14 @@ def main(
     else:
         print(f"📦 範圍: 所有可訪問的專案")
 
+    if incremental:
+        print("🔁 增量模式：只抓取上次同步之後的數據")
+
     # 建立收集器
-    collector = GitLabAPICollector()
+    collector = GitLabAPICollector(incremental=incremental, full_mr_diffs=full_mr_diffs)
+
+    if resume and (only_projects or only_mr or only_comments or only_commits):
+        print("⚠️ --resume 只適用於完整收集，--only-* 模式會重新收集")
 
     # 根據選項收集數據
     if only_projects:
@@ -103,9 +172,14 @@ def main(
     else:
         # 收集所有數據
         collector.collect_all(
-            project_ids=project_ids, start_date=start_date, end_date=end_date
+            project_ids=project_ids,
+            start_date=start_date,
+            end_date=end_date,
+            max_workers=api_workers,
+            resume=resume,
         )
 
 
 if __name__ == "__main__":
+    load_env()
     main()
@@ -0,0 +1,226 @@
+"""
+分塊表格寫入器
+
+逐筆接收資料列，累積到指定筆數後才寫入檔案（CSV 追加或 Parquet row group），
+讓大量數據的匯出不需先在記憶體中組成完整的 DataFrame。
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+
+class ChunkedTableWriter:
+    """分塊寫入 CSV / Parquet（依副檔名判斷格式）"""
+
+    def __init__(
+        self, output_file: Path, chunk_size: int = 10000, columns: Optional[List[str]] = None
+    ):
+        """
+        初始化寫入器
+
+        Args:
+            output_file: 輸出檔案路徑（.csv 或 .parquet）
+            chunk_size: 每次寫入的資料列數
+            columns: 欄位順序，預設取第一筆資料列的欄位；沒有任何資料時仍以此建立空表格
+        """
+        self.output_file = Path(output_file)
+        self.chunk_size = chunk_size
+        self.format = "parquet" if self.output_file.suffix == ".parquet" else "csv"
+        self.rows_written = 0
+
+        self._buffer: List[Dict] = []
+        self._columns: Optional[List[str]] = list(columns) if columns else None
+        self._parquet_writer = None
+        self._parquet_schema = None
+
+        # 覆寫既有檔案
+        if self.output_file.exists():
+            self.output_file.unlink()
+
+    def __enter__(self) -> "ChunkedTableWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write(self, row: Dict) -> None:
+        """寫入一筆資料列（緩衝滿時自動寫入檔案）"""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Dict]) -> None:
+        """寫入多筆資料列"""
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """將緩衝中的資料列寫入檔案"""
+        if not self._buffer:
+            return
+
+        if self._columns is None:
+            self._columns = list(self._buffer[0].keys())
+        df = pd.DataFrame(self._buffer, columns=self._columns)
+        self._buffer = []
+        self._write_frame(df)
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """寫入一個 DataFrame 分塊（先寫出緩衝中的資料列以維持順序）"""
+        self.flush()
+        if df.empty:
+            return
+        if self._columns is None:
+            self._columns = list(df.columns)
+        self._write_frame(df.reindex(columns=self._columns))
+
+    def _write_frame(self, df: pd.DataFrame) -> None:
+        """將分塊寫入檔案"""
+        if self.format == "parquet":
+            self._write_parquet(df)
+        else:
+            df.to_csv(
+                self.output_file,
+                mode="a",
+                header=self.rows_written == 0,
+                index=False,
+                encoding="utf-8-sig" if self.rows_written == 0 else "utf-8",
+            )
+        self.rows_written += len(df)
+
+    def _write_parquet(self, df: pd.DataFrame) -> None:
+        """
+        以 row group 寫入 Parquet（需安裝 pyarrow）
+
+        欄位型別隨分塊放寬：全為空值的欄位在出現值後決定型別，整數欄位出現小數時改為浮點數，
+        型別無法合併的欄位（例如整數與字串）改以字串儲存；型別改變時以新型別重寫已寫出的 row group。
+
+        Raises:
+            ValueError: 型別轉換會失真（例如超過 2**53 的整數轉為浮點數）
+        """
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 分塊內混合型別的欄位（例如同時有數字與字串）以字串儲存
+            df = df.copy()
+            for column in df.columns[df.dtypes == object]:
+                df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata()
+
+        if self._parquet_schema is None:
+            merged = table.schema
+        else:
+            merged = _widen_schema(self._parquet_schema, table.schema)
+        # 仍全為空值的欄位先以字串儲存
+        target = pa.schema(
+            [
+                pa.field(field.name, pa.string() if pa.types.is_null(field.type) else field.type)
+                for field in merged
+            ]
+        )
+        if self._parquet_writer is None or target != self._parquet_writer.schema:
+            self._open_parquet_writer(target)
+        self._parquet_schema = merged
+        self._parquet_writer.write_table(_cast_table(table, target))
+
+    def _open_parquet_writer(self, schema) -> None:
+        """以指定型別開啟 Parquet 寫入器；已有寫出的 row group 時以新型別重寫"""
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(str(self.output_file), schema)
+            return
+
+        self._parquet_writer.close()
+        previous = self.output_file.with_name(f"{self.output_file.name}.tmp")
+        self.output_file.replace(previous)
+        self._parquet_writer = pq.ParquetWriter(str(self.output_file), schema)
+        source = pq.ParquetFile(previous)
+        try:
+            for index in range(source.num_row_groups):
+                self._parquet_writer.write_table(_cast_table(source.read_row_group(index), schema))
+        finally:
+            source.close()
+            previous.unlink()
+
+    def close(self) -> None:
+        """寫入剩餘資料並關閉檔案；未寫入任何資料時仍建立空檔案"""
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        elif self.rows_written == 0 and not self.output_file.exists():
+            empty = pd.DataFrame(columns=self._columns or [])
+            if self.format == "parquet":
+                empty.to_parquet(self.output_file, index=False)
+            else:
+                empty.to_csv(self.output_file, index=False, encoding="utf-8-sig")
+
+
+def _widen_schema(current, incoming):
+    """
+    合併兩個分塊的欄位型別（null 取另一方型別、整數與浮點數取浮點數），無法合併的欄位改為字串
+
+    Args:
+        current: 已寫出數據的欄位型別
+        incoming: 新分塊的欄位型別（欄位順序相同）
+
+    Returns:
+        放寬後的欄位型別
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field, other in zip(current, incoming):
+        try:
+            merged = pa.unify_schemas(
+                [pa.schema([field]), pa.schema([other])], promote_options="permissive"
+            )
+            fields.append(merged.field(0))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fields.append(pa.field(field.name, pa.string()))
+    return pa.schema(fields)
+
+
+def _cast_table(table, schema):
+    """將表格轉為指定型別（只做不失真的轉換）"""
+    import pyarrow as pa
+
+    try:
+        return table.cast(schema)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"parquet 欄位型別轉換會失真: {e}") from e
+
+
+def iter_table_chunks(input_file: Path, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    分塊讀取 CSV / Parquet 表格（依副檔名判斷格式），記憶體只保留目前分塊
+
+    CSV 一律以字串讀取，避免空值與數字被轉型，寫回 CSV 時內容不變。
+
+    Args:
+        input_file: 表格檔案路徑
+        chunk_size: 每個分塊的資料列數
+
+    Yields:
+        DataFrame 分塊
+    """
+    input_file = Path(input_file)
+    if input_file.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(input_file).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+
+    try:
+        yield from pd.read_csv(
+            input_file, chunksize=chunk_size, dtype=str, keep_default_na=False
+        )
+    except pd.errors.EmptyDataError:
+        return
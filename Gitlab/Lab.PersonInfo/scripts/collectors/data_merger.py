@@ -4,25 +4,32 @@
 整合 GitLab API 和 Git 本地數據，建立開發者統一身份映射，並進行數據清洗。
 """
 
-import re
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 import pandas as pd
 from tqdm import tqdm
 
 from config.analysis_config import ExclusionConfig
+from collectors.exclusion_matcher import get_bot_matcher, get_path_matcher
+from storage.table_store import get_table_store
 
 
 class DataMerger:
     """數據合併與清洗器"""
 
-    def __init__(self, input_dir: Optional[str] = None, output_dir: Optional[str] = None):
+    def __init__(
+        self,
+        input_dir: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        persist: bool = True,
+    ):
         """
         初始化合併器
 
         Args:
             input_dir: 輸入目錄（raw 數據），預設為 scripts/output/raw/
             output_dir: 輸出目錄（processed 數據），預設為 scripts/output/processed/
+            persist: 是否將處理後的表格寫入 output_dir（記憶體管線可關閉）
         """
         if input_dir:
             self.input_dir = Path(input_dir)
@@ -36,126 +43,275 @@ class DataMerger:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # raw 與 processed 表格的儲存後端（預設 Parquet，見 STORAGE_FORMAT）
+        self.input_store = get_table_store(self.input_dir)
+        self.output_store = get_table_store(self.output_dir)
+        self.persist = persist
+
+        # email 別名 -> 代表 email（由 unify_developers 建立）
+        self._email_aliases: Optional[Dict[str, str]] = None
+
     # ==================== 開發者身份統一 ====================
 
     def unify_developers(
-        self, manual_mapping: Optional[Dict[str, str]] = None
+        self,
+        manual_mapping: Optional[Dict[str, str]] = None,
+        merge_by_name: bool = False,
     ) -> pd.DataFrame:
         """
         統一開發者身份（建立 username <-> email <-> name 映射表）
 
+        以欄位運算彙總三個來源，再以 union-find 合併同一人的多個身份：
+        - Git 本地開發者列表（email、name、commit 數）
+        - GitLab MR（username、name，若有 email 欄位一併使用）
+        - GitLab Commits（email、name，累加 commit 數）
+        同一筆記錄中的 email、username 視為同一人；手動映射可遞移合併
+        （a -> b、b -> c 會把 a、b、c 合併為 c）。
+
         Args:
             manual_mapping: 手動映射（email -> canonical_email）
+            merge_by_name: 是否也以相同名稱（不分大小寫）合併身份，預設關閉；
+                           同名的不同人會被合併，只在確認名稱不重複時開啟
+                           （MR 只有 username 與 name，開啟後 username 才能經由名稱對應到 email）
 
         Returns:
-            統一開發者身份 DataFrame
+            統一開發者身份 DataFrame（email 為代表 email，aliases 為合併的其他 email）
         """
         print("\n🔍 統一開發者身份...")
 
-        developers_map = {}  # email -> {username, name, commit_count}
+        identities = _IdentityUnion()
 
         # 1. 從 Git 本地數據取得開發者
-        git_devs_file = self.input_dir / "git_developers.csv"
-        if git_devs_file.exists():
-            git_devs = pd.read_csv(git_devs_file)
-            for _, row in git_devs.iterrows():
-                email = row["email"].lower()
-                if not self._is_bot(row["name"], email):
-                    if email not in developers_map:
-                        developers_map[email] = {
-                            "username": "",
-                            "name": row["name"],
-                            "email": email,
-                            "commit_count": row["commit_count"],
-                            "source": "git",
-                        }
+        git_devs = self._read_identity_source(
+            "git_developers", {"email": "email", "name": "name"}
+        )
+        if not git_devs.empty:
+            git_devs["git_count"] = pd.to_numeric(
+                git_devs.pop("commit_count"), errors="coerce"
+            ).fillna(0)
 
         # 2. 從 GitLab MR 數據補充 username
-        mr_file = self.input_dir / "gitlab_merge_requests.csv"
-        if mr_file.exists():
-            mrs = pd.read_csv(mr_file)
-            for _, row in mrs.iterrows():
-                email = str(row.get("author_email", "")).lower()
-                username = row.get("author_username", "")
-                name = row.get("author_name", "")
-
-                if email and not self._is_bot(name, email):
-                    if email in developers_map:
-                        if not developers_map[email]["username"]:
-                            developers_map[email]["username"] = username
-                    else:
-                        developers_map[email] = {
-                            "username": username,
-                            "name": name,
-                            "email": email,
-                            "commit_count": 0,
-                            "source": "gitlab_mr",
-                        }
-
-        # 3. 從 GitLab Commits 數據補充
-        gitlab_commits_file = self.input_dir / "gitlab_commits.csv"
-        if gitlab_commits_file.exists():
-            commits = pd.read_csv(gitlab_commits_file)
-            for _, row in commits.iterrows():
-                email = str(row.get("author_email", "")).lower()
-                name = row.get("author_name", "")
-
-                if email and email in developers_map and not self._is_bot(name, email):
-                    developers_map[email]["commit_count"] = (
-                        developers_map[email].get("commit_count", 0) + 1
-                    )
-
-        # 4. 應用手動映射
+        mrs = self._read_identity_source(
+            "gitlab_merge_requests",
+            {"author_email": "email", "author_username": "username", "author_name": "name"},
+        )
+
+        # 3. 從 GitLab Commits 數據補充 commit 數
+        commits = self._read_identity_source(
+            "gitlab_commits", {"author_email": "email", "author_name": "name"}
+        )
+        gitlab_counts = (
+            commits["email"][commits["email"] != ""].value_counts()
+            if not commits.empty
+            else pd.Series(dtype="int64")
+        )
+
+        # 4. 建立身份關聯：同一筆記錄的 email / username（/ name）屬於同一人
+        keys = ["email", "username", "name"] if merge_by_name else ["email", "username"]
+        for source in (git_devs, mrs, commits):
+            if source.empty:
+                continue
+            pairs = source[[key for key in keys if key in source]].drop_duplicates()
+            for record in pairs.itertuples(index=False):
+                identities.link(record._asdict())
+
+        # 5. 應用手動映射（遞移合併）
+        canonical_emails = set()
         if manual_mapping:
             print(f"   應用 {len(manual_mapping)} 個手動映射")
-            merged_map = {}
             for email, canonical_email in manual_mapping.items():
                 email = email.lower()
                 canonical_email = canonical_email.lower()
+                identities.union(("email", email), ("email", canonical_email))
+                canonical_emails.add(canonical_email)
+            # 鏈狀映射只以最終目標為代表（a -> b、b -> c 時 b 不是代表）
+            canonical_emails -= {email.lower() for email in manual_mapping}
+
+        # 6. 彙總每個 email 的資訊（只納入 Git 開發者與 MR 中出現過的 email）
+        emails = pd.DataFrame(
+            {
+                "email": pd.concat(
+                    [
+                        git_devs.get("email", pd.Series(dtype=str)),
+                        mrs.get("email", pd.Series(dtype=str)),
+                        pd.Series(sorted(canonical_emails), dtype=str),
+                    ],
+                    ignore_index=True,
+                )
+            }
+        )
+        emails = emails[emails["email"] != ""].drop_duplicates("email")
 
-                if email in developers_map:
-                    if canonical_email not in merged_map:
-                        merged_map[canonical_email] = developers_map[email]
-                    else:
-                        # 合併 commit_count
-                        merged_map[canonical_email]["commit_count"] += developers_map[
-                            email
-                        ]["commit_count"]
-
-            developers_map.update(merged_map)
-
-        # 轉換為 DataFrame
-        developers = []
-        for email, info in developers_map.items():
-            developers.append(
-                {
-                    "email": email,
-                    "username": info.get("username", ""),
-                    "name": info.get("name", ""),
-                    "commit_count": info.get("commit_count", 0),
-                    "source": info.get("source", ""),
-                }
-            )
+        # 與手動映射目標同組的其他 Commits email 也一併納入
+        commit_emails = pd.DataFrame({"email": gitlab_counts.index.astype(str)})
+        emails["group"] = emails["email"].map(lambda email: identities.group_of("email", email))
+        commit_emails["group"] = commit_emails["email"].map(
+            lambda email: identities.group_of("email", email)
+        )
+        emails = pd.concat(
+            [emails, commit_emails[commit_emails["group"].isin(emails["group"])]],
+            ignore_index=True,
+        ).drop_duplicates("email")
+
+        first_git = git_devs.drop_duplicates("email").set_index("email") if not git_devs.empty else None
+        emails["git_count"] = (
+            emails["email"].map(first_git["git_count"]).fillna(0) if first_git is not None else 0
+        )
+        emails["gitlab_count"] = emails["email"].map(gitlab_counts).fillna(0)
+        emails["commit_count"] = (emails["git_count"] + emails["gitlab_count"]).astype(int)
+        emails["name"] = emails["email"].map(
+            self._first_display_name([git_devs, mrs, commits], "email")
+        ).fillna("")
+        emails["source"] = "gitlab_mr"
+        if first_git is not None:
+            emails.loc[emails["email"].isin(first_git.index), "source"] = "git"
+        emails["is_canonical"] = emails["email"].isin(canonical_emails)
+
+        if emails.empty:
+            df = pd.DataFrame(columns=["email", "username", "name", "commit_count", "source", "aliases"])
+        else:
+            df = self._collapse_identity_groups(emails, mrs, identities)
+
+        # email 別名 -> 代表 email（供合併 Commits 與檔案變更時統一作者）
+        self._email_aliases = {
+            alias: row.email
+            for row in df.itertuples(index=False)
+            for alias in str(row.aliases).split(";")
+            if alias
+        }
 
-        df = pd.DataFrame(developers)
         df = df.sort_values("commit_count", ascending=False)
 
-        # 儲存
-        output_file = self.output_dir / "unified_developers.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 統一開發者身份已儲存: {output_file} (共 {len(df)} 位)")
+        self._save("unified_developers", df, "統一開發者身份", unit="位")
 
         return df
 
-    def _is_bot(self, name: str, email: str) -> bool:
-        """判斷是否為 Bot 賬號"""
-        name_lower = name.lower() if name else ""
-        email_lower = email.lower() if email else ""
+    def _read_identity_source(self, name: str, columns: Dict[str, str]) -> pd.DataFrame:
+        """
+        讀取身份來源表格並正規化欄位（email、username、name 轉為小寫字串，排除 Bot）
+
+        Args:
+            name: 輸入表格名稱
+            columns: 原欄位 -> 正規化欄位名稱（不存在的欄位略過，只讀取這些欄位）
 
-        return any(
-            bot.lower() in name_lower or bot.lower() in email_lower
-            for bot in ExclusionConfig.EXCLUDED_BOTS
+        Returns:
+            正規化後的 DataFrame；name 保留原始大小寫於 display_name
+        """
+        if not self.input_store.exists(name):
+            return pd.DataFrame()
+
+        raw = self.input_store.read(name, columns=[*columns, "commit_count"])
+        df = pd.DataFrame(index=raw.index)
+        for source_column, column in columns.items():
+            if source_column in raw:
+                df[column] = raw[source_column].fillna("").astype(str).str.strip()
+        if "commit_count" in raw:
+            df["commit_count"] = raw["commit_count"]
+
+        if "name" in df:
+            df["display_name"] = df["name"]
+            df["name"] = df["name"].str.lower()
+        for column in ("email", "username"):
+            if column in df:
+                df[column] = df[column].str.lower()
+
+        bots = get_bot_matcher().mask(
+            df.get("display_name", pd.Series("", index=df.index)),
+            df.get("email"),
         )
+        return df[~bots]
+
+    @staticmethod
+    def _first_display_name(sources: List[pd.DataFrame], key: str) -> pd.Series:
+        """依來源優先順序取得每個 key 第一個非空的顯示名稱"""
+        frames = [
+            source[[key, "display_name"]]
+            for source in sources
+            if not source.empty and key in source and "display_name" in source
+        ]
+        if not frames:
+            return pd.Series(dtype=str)
+        values = pd.concat(frames, ignore_index=True)
+        values = values[(values[key] != "") & (values["display_name"] != "")]
+        return values.drop_duplicates(key).set_index(key)["display_name"]
+
+    @staticmethod
+    def _collapse_identity_groups(
+        emails: pd.DataFrame, mrs: pd.DataFrame, identities: "_IdentityUnion"
+    ) -> pd.DataFrame:
+        """
+        將同一組的 email 合併為一位開發者
+
+        代表 email：手動映射的目標優先，其次為 commit 數最多者（同數時取先出現者）
+        """
+        emails = emails.reset_index(drop=True)
+        emails["order"] = emails.index
+        ranked = emails.sort_values(
+            ["group", "is_canonical", "commit_count", "order"],
+            ascending=[True, False, False, True],
+        )
+
+        canonical = ranked.drop_duplicates("group").set_index("group")
+        grouped = ranked.groupby("group", sort=False)
+        aliases = grouped["email"].agg(lambda values: ";".join(sorted(values.iloc[1:])))
+
+        usernames = pd.Series(dtype=str)
+        if not mrs.empty and "username" in mrs:
+            mr_users = mrs[mrs["username"] != ""].drop_duplicates("username").copy()
+            mr_users["group"] = mr_users["username"].map(
+                lambda username: identities.group_of("username", username)
+            )
+            usernames = mr_users.drop_duplicates("group").set_index("group")["username"]
+
+        return pd.DataFrame(
+            {
+                "email": canonical["email"],
+                "username": canonical.index.to_series().map(usernames).fillna(""),
+                "name": canonical["name"],
+                "commit_count": grouped["commit_count"].sum(),
+                "source": canonical["source"],
+                "aliases": aliases,
+            }
+        ).reset_index(drop=True)
+
+    def _canonicalize_authors(self, df: pd.DataFrame) -> pd.DataFrame:
+        """將 author_email 的別名換成代表 email（需先執行 unify_developers 或已有 unified_developers 表格）"""
+        aliases = self._get_email_aliases()
+        if not aliases or "author_email" not in df:
+            return df
+
+        canonical = df["author_email"].astype(str).str.lower().map(aliases)
+        changed = canonical.notna()
+        if changed.any():
+            df = df.copy()
+            df.loc[changed, "author_email"] = canonical[changed]
+            print(f"   統一 {int(changed.sum())} 筆作者 email 別名")
+        return df
+
+    def _get_email_aliases(self) -> Dict[str, str]:
+        """取得 email 別名對照表；尚未統一身份時從 unified_developers 表格載入"""
+        if self._email_aliases is None:
+            self._email_aliases = {}
+            if self.output_store.exists("unified_developers"):
+                developers = self.output_store.read("unified_developers", columns=["email", "aliases"])
+                if "aliases" in developers:
+                    for email, aliases in zip(developers["email"], developers["aliases"].fillna("")):
+                        for alias in str(aliases).split(";"):
+                            if alias:
+                                self._email_aliases[alias] = email
+        return self._email_aliases
+
+    def _save(self, name: str, df: pd.DataFrame, label: str, unit: str = "筆") -> None:
+        """寫入處理後的表格（persist=False 時只保留在記憶體）"""
+        if not self.persist:
+            print(f"✅ {label}完成 (共 {len(df)} {unit}，未寫入磁碟)")
+            return
+        output_file = self.output_store.write(name, df)
+        print(f"✅ {label}已儲存: {output_file} (共 {len(df)} {unit})")
+
+    def _is_bot(self, name: str, email: str) -> bool:
+        """判斷是否為 Bot 賬號"""
+        return get_bot_matcher().matches(name, email)
 
     # ==================== Commit 數據合併 ====================
 
@@ -171,17 +327,15 @@ class DataMerger:
         commits_list = []
 
         # 1. 讀取 Git 本地數據（更詳細）
-        git_commits_file = self.input_dir / "git_commits.csv"
-        if git_commits_file.exists():
-            git_commits = pd.read_csv(git_commits_file)
+        if self.input_store.exists("git_commits"):
+            git_commits = self.input_store.read("git_commits")
             git_commits["source"] = "git_local"
             commits_list.append(git_commits)
             print(f"   Git 本地 Commits: {len(git_commits)}")
 
         # 2. 讀取 GitLab API 數據（補充）
-        gitlab_commits_file = self.input_dir / "gitlab_commits.csv"
-        if gitlab_commits_file.exists():
-            gitlab_commits = pd.read_csv(gitlab_commits_file)
+        if self.input_store.exists("gitlab_commits"):
+            gitlab_commits = self.input_store.read("gitlab_commits")
             gitlab_commits["source"] = "gitlab_api"
             commits_list.append(gitlab_commits)
             print(f"   GitLab API Commits: {len(gitlab_commits)}")
@@ -197,10 +351,10 @@ class DataMerger:
         # 清洗：排除特定模式的 Commit
         df = self._clean_commits(df)
 
-        # 儲存
-        output_file = self.output_dir / "all_commits_merged.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 合併 Commit 數據已儲存: {output_file} (共 {len(df)} 筆)")
+        # 統一作者 email 別名
+        df = self._canonicalize_authors(df)
+
+        self._save("all_commits_merged", df, "合併 Commit 數據")
 
         return df
 
@@ -229,21 +383,17 @@ class DataMerger:
         """
         print("\n🔍 合併 Review Comments 數據...")
 
-        comments_file = self.input_dir / "gitlab_review_comments.csv"
-        if not comments_file.exists():
+        if not self.input_store.exists("gitlab_review_comments"):
             print("⚠️ 沒有找到 Review Comments 數據檔案")
             return pd.DataFrame()
 
-        df = pd.read_csv(comments_file)
+        df = self.input_store.read("gitlab_review_comments")
 
         # 清洗：排除系統訊息（已在收集時處理）
         # 分類 Comment 類型（LGTM-only vs 有建議）
         df = self._classify_comments(df)
 
-        # 儲存
-        output_file = self.output_dir / "all_reviews_merged.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 合併 Review Comments 數據已儲存: {output_file} (共 {len(df)} 筆)")
+        self._save("all_reviews_merged", df, "合併 Review Comments 數據")
 
         return df
 
@@ -275,35 +425,18 @@ class DataMerger:
         """
         print("\n🔍 清洗檔案變更數據...")
 
-        file_changes_file = self.input_dir / "git_file_changes.csv"
-        if not file_changes_file.exists():
+        if not self.input_store.exists("git_file_changes"):
             print("⚠️ 沒有找到檔案變更數據檔案")
             return pd.DataFrame()
 
-        df = pd.read_csv(file_changes_file)
+        df = self.input_store.read("git_file_changes")
         original_count = len(df)
 
-        # 排除自動生成的檔案
-        def should_exclude(file_path: str) -> bool:
-            """判斷檔案是否應該被排除"""
-            if not file_path:
-                return True
-
-            for pattern in ExclusionConfig.EXCLUDED_FILE_PATTERNS:
-                # 簡單的 glob 模式匹配
-                if "*" in pattern:
-                    # 轉換為正則表達式
-                    regex_pattern = pattern.replace("*", ".*")
-                    if re.match(regex_pattern, file_path):
-                        return True
-                else:
-                    # 精確匹配
-                    if pattern in file_path:
-                        return True
-
-            return False
+        # 排除自動生成的檔案（所有 glob 規則預先編譯為單一正規表示式，向量化比對）
+        df = df[~get_path_matcher().mask(df["file_path"])]
 
-        df = df[~df["file_path"].apply(should_exclude)]
+        # 統一作者 email 別名
+        df = self._canonicalize_authors(df)
 
         cleaned_count = len(df)
         if cleaned_count < original_count:
@@ -311,10 +444,7 @@ class DataMerger:
                 f"   排除 {original_count - cleaned_count} 個檔案變更（lock 檔案、dist/ 等）"
             )
 
-        # 儲存
-        output_file = self.output_dir / "file_changes_cleaned.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 清洗檔案變更數據已儲存: {output_file} (共 {len(df)} 筆)")
+        self._save("file_changes_cleaned", df, "清洗檔案變更數據")
 
         return df
 
@@ -362,6 +492,40 @@ class DataMerger:
         return results
 
 
+class _IdentityUnion:
+    """身份 union-find（節點為 (類型, 值)，例如 ("email", "a@x.com")）"""
+
+    def __init__(self):
+        self._parent: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def find(self, node: Tuple[str, str]) -> Tuple[str, str]:
+        """取得節點所屬組別的代表節點（含路徑壓縮）"""
+        root = self._parent.setdefault(node, node)
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while node != root:
+            self._parent[node], node = root, self._parent[node]
+        return root
+
+    def group_of(self, kind: str, value: str) -> str:
+        """取得 (類型, 值) 所屬組別的識別字串"""
+        return "\x1f".join(self.find((kind, value)))
+
+    def union(self, a: Tuple[str, str], b: Tuple[str, str]) -> None:
+        """合併兩個節點所屬的組別"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+    def link(self, record: Dict[str, str]) -> None:
+        """將同一筆記錄中的非空身份欄位合併為同一組"""
+        nodes = [(kind, value) for kind, value in record.items() if value]
+        for node in nodes:
+            self.find(node)
+        for node in nodes[1:]:
+            self.union(nodes[0], node)
+
+
 # 測試功能
 if __name__ == "__main__":
     print("=" * 60)
@@ -0,0 +1,160 @@
+"""
+排除規則比對器
+
+將 ExclusionConfig 的排除規則預先編譯為單一正規表示式，提供逐筆判斷與向量化遮罩：
+- PathExclusionMatcher：檔案路徑 glob 規則（類 .gitignore 語意）
+- BotMatcher：Bot 賬號關鍵字（name 或 email 包含關鍵字，不分大小寫）
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from config.analysis_config import ExclusionConfig
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    將 glob 規則轉換為正規表示式（類 .gitignore 語意）
+
+    - 不含 / 的規則比對任一層的路徑片段，例如 yarn.lock、*.min.js
+    - 含 / 的規則從路徑開頭比對，例如 dist/*
+    - * 與 ? 不跨越 /，** 可跨越多層目錄
+    - 比對到目錄時，其下所有檔案皆視為符合
+
+    Args:
+        pattern: glob 規則
+
+    Returns:
+        正規表示式字串（未編譯）
+    """
+    anchored = "/" in pattern.rstrip("/")
+    glob = pattern.strip("/")
+
+    parts = []
+    i = 0
+    while i < len(glob):
+        char = glob[i]
+        if glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = glob[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+
+    prefix = "^" if anchored else "(?:^|/)"
+    return f"{prefix}{''.join(parts)}(?:/|$)"
+
+
+class PathExclusionMatcher:
+    """檔案路徑排除比對器（所有規則合併為單一正規表示式）"""
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        初始化比對器
+
+        Args:
+            patterns: glob 規則列表
+        """
+        self.patterns: List[str] = [pattern for pattern in patterns if pattern]
+        self._regex: Optional[re.Pattern] = (
+            re.compile("|".join(f"(?:{glob_to_regex(p)})" for p in self.patterns))
+            if self.patterns
+            else None
+        )
+
+    def matches(self, file_path: str) -> bool:
+        """判斷單一路徑是否應排除（空路徑一律排除）"""
+        if not isinstance(file_path, str) or not file_path:
+            return True
+        return self._regex is not None and self._regex.search(file_path) is not None
+
+    def mask(self, file_paths: pd.Series) -> pd.Series:
+        """
+        向量化判斷路徑是否應排除
+
+        Args:
+            file_paths: 路徑 Series
+
+        Returns:
+            布林 Series（True 表示排除；空值與空字串一律排除）
+        """
+        empty = file_paths.isna() | (file_paths.astype(str) == "")
+        if self._regex is None:
+            return empty
+        return empty | file_paths.astype(str).str.contains(self._regex, na=True)
+
+
+class BotMatcher:
+    """Bot 賬號比對器（關鍵字子字串比對，不分大小寫）"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        初始化比對器
+
+        Args:
+            keywords: Bot 關鍵字列表
+        """
+        self.keywords: List[str] = [keyword.lower() for keyword in keywords if keyword]
+        self._regex: Optional[re.Pattern] = (
+            re.compile("|".join(re.escape(keyword) for keyword in self.keywords), re.IGNORECASE)
+            if self.keywords
+            else None
+        )
+
+    def matches(self, name: Optional[str], email: Optional[str] = None) -> bool:
+        """判斷 name 或 email 是否包含 Bot 關鍵字"""
+        if self._regex is None:
+            return False
+        return any(
+            isinstance(value, str) and self._regex.search(value) is not None
+            for value in (name, email)
+        )
+
+    def mask(self, names: pd.Series, emails: Optional[pd.Series] = None) -> pd.Series:
+        """
+        向量化判斷是否為 Bot 賬號
+
+        Args:
+            names: 名稱 Series
+            emails: email Series（可選）
+
+        Returns:
+            布林 Series（True 表示 Bot）
+        """
+        if self._regex is None:
+            return pd.Series(False, index=names.index)
+
+        result = names.fillna("").astype(str).str.contains(self._regex)
+        if emails is not None:
+            result = result | emails.fillna("").astype(str).str.contains(self._regex)
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_path_matcher() -> PathExclusionMatcher:
+    """取得依 ExclusionConfig.EXCLUDED_FILE_PATTERNS 建立的共用比對器"""
+    return PathExclusionMatcher(ExclusionConfig.EXCLUDED_FILE_PATTERNS)
+
+
+@lru_cache(maxsize=None)
+def get_bot_matcher() -> BotMatcher:
+    """取得依 ExclusionConfig.EXCLUDED_BOTS 建立的共用比對器"""
+    return BotMatcher(ExclusionConfig.EXCLUDED_BOTS)
@@ -7,29 +7,90 @@ Git 本地數據收集器
 import os
 import re
 import subprocess
+import tempfile
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 from datetime import datetime
 from tqdm import tqdm
 import pandas as pd
 
-from config.analysis_config import ExclusionConfig
+from config.analysis_config import CommitQualityConfig
+from collectors.chunked_writer import ChunkedTableWriter
+from collectors.exclusion_matcher import get_bot_matcher
+from storage.table_store import TableStore, get_table_store
+
+
+# git log 串流解析使用的分隔字元：記錄分隔 (RS, 0x1E) 與欄位分隔 (US, 0x1F)
+RECORD_SEPARATOR = "\x1e"
+FIELD_SEPARATOR = "\x1f"
+
+# git log 解析模式：record 為分隔字元 + -z numstat 的單次掃描解析，legacy 為舊版以 | 分隔的解析
+PARSER_MODES = ("record", "legacy")
+
+# 每次從 git 輸出讀取的位元組數
+STREAM_READ_SIZE = 1 << 16
+
+# Commit 記錄的欄位（依 git log --format 順序）
+COMMIT_FIELDS = [
+    "commit_sha",
+    "author_name",
+    "author_email",
+    "authored_date",
+    "committer_name",
+    "committer_email",
+    "committed_date",
+    "title",
+    "message",
+]
+
+# 檔案變更記錄的欄位
+FILE_CHANGE_FIELDS = [
+    "commit_sha",
+    "author_name",
+    "author_email",
+    "date",
+    "file_path",
+    "file_extension",
+    "additions",
+    "deletions",
+    "old_path",
+]
+
+# 單次掃描串流寫出的表格：結果鍵 → (表格名稱, 欄位)
+HISTORY_TABLES = {
+    "commits": (
+        "git_commits",
+        COMMIT_FIELDS + ["additions", "deletions", "total", "changed_files"],
+    ),
+    "file_changes": ("git_file_changes", FILE_CHANGE_FIELDS),
+    "time_distribution": ("git_time_distribution", ["weekday", "hour"]),
+}
+
+# 串流寫出時每個分塊的資料列數
+WRITE_CHUNK_SIZE = 10000
 
 
 class GitLocalCollector:
     """Git 本地數據收集器"""
 
-    def __init__(self, repo_path: str, output_dir: Optional[str] = None):
+    def __init__(
+        self, repo_path: str, output_dir: Optional[str] = None, parser: str = "record"
+    ):
         """
         初始化收集器
 
         Args:
             repo_path: Git Repository 路徑
             output_dir: 輸出目錄路徑，預設為 scripts/output/raw/
+            parser: git log 解析模式（'record' 或 'legacy'）
         """
         self.repo_path = Path(repo_path)
         if not self._is_git_repo():
             raise ValueError(f"{repo_path} 不是有效的 Git Repository")
+        if parser not in PARSER_MODES:
+            raise ValueError(f"不支援的解析模式: {parser}（可用: {', '.join(PARSER_MODES)}）")
+        self.parser = parser
 
         # 設定輸出目錄
         if output_dir:
@@ -38,6 +99,7 @@ class GitLocalCollector:
             self.output_dir = Path(__file__).parent.parent / "output" / "raw"
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.store = get_table_store(self.output_dir)
 
     def _is_git_repo(self) -> bool:
         """檢查是否為 Git Repository"""
@@ -62,17 +124,86 @@ class GitLocalCollector:
         )
         return result
 
+    def _stream_git_records(self, args: List[str]) -> Iterator[str]:
+        """
+        以串流方式執行 Git 命令，逐筆產生以 RECORD_SEPARATOR 分隔的記錄
+
+        輸出是分塊讀取並即時切分，記憶體用量只與單筆記錄大小有關，與歷史長度無關。
+
+        Args:
+            args: Git 命令參數（格式字串需以 %x1e 開頭標示每筆記錄）
+
+        Yields:
+            單筆記錄文字（不含分隔字元）
+
+        Raises:
+            subprocess.CalledProcessError: Git 命令執行失敗
+        """
+        cmd = ["git", "-C", str(self.repo_path)] + args
+        separator = RECORD_SEPARATOR.encode()
+
+        # stderr 寫入暫存檔，避免管線緩衝區塞滿造成死結
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+            try:
+                buffer = b""
+                while True:
+                    chunk = process.stdout.read(STREAM_READ_SIZE)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    *records, buffer = buffer.split(separator)
+                    for record in records:
+                        if record:
+                            yield record.decode("utf-8", errors="replace")
+                if buffer:
+                    yield buffer.decode("utf-8", errors="replace")
+
+                returncode = process.wait()
+                if returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().decode("utf-8", errors="replace")
+                    raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+            finally:
+                # 提前結束迭代時終止 git 程序
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
+
+    @staticmethod
+    def _build_log_args(
+        log_format: str,
+        extra_args: List[str],
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        branch: Optional[str] = None,
+    ) -> List[str]:
+        """組出 git log 命令參數"""
+        args = ["log", f"--format={log_format}", "--date=iso"] + extra_args
+
+        if author:
+            args.append(f"--author={author}")
+        if since:
+            args.append(f"--since={since}")
+        if until:
+            args.append(f"--until={until}")
+        if branch:
+            args.append(branch)
+        return args
+
     # ==================== Commit 收集 ====================
 
-    def collect_commits(
+    def iter_commits(
         self,
         author: Optional[str] = None,
         since: Optional[str] = None,
         until: Optional[str] = None,
         branch: Optional[str] = None,
-    ) -> pd.DataFrame:
+    ) -> Iterator[Dict]:
         """
-        收集 Commit 數據
+        串流解析 git log，逐筆產生 Commit 數據
 
         Args:
             author: 作者名稱或 Email（支援部分匹配）
@@ -80,52 +211,107 @@ class GitLocalCollector:
             until: 結束日期 (格式: YYYY-MM-DD)
             branch: 分支名稱（預設為當前分支）
 
-        Returns:
-            Commit 列表 DataFrame
+        Yields:
+            Commit 數據字典（欄位同 collect_commits）
         """
-        print(f"\n🔍 收集 Commit 數據（本地 Git）...")
-        if author:
-            print(f"   作者篩選: {author}")
-        if since or until:
-            print(f"   時間範圍: {since or '最早'} ~ {until or '現在'}")
+        if self.parser == "legacy":
+            yield from self._iter_commits_legacy(author, since, until, branch)
+            return
 
-        commit_data = []
+        for commit_info, _, _ in self._iter_commit_records(author, since, until, branch):
+            yield commit_info
 
-        # 建立 git log 命令
-        # 格式: SHA|作者名稱|作者Email|提交時間|Committer名稱|Committer Email|提交時間|標題|完整訊息
-        log_format = "%H|%an|%ae|%ad|%cn|%ce|%cd|%s|%B"
-        args = [
-            "log",
-            f"--format={log_format}",
-            "--date=iso",
-            "--numstat",  # 顯示變更統計
-        ]
+    def _iter_commit_records(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        branch: Optional[str] = None,
+    ) -> Iterator[Tuple[Dict, List[str], List[Tuple[int, int, str, str]]]]:
+        """
+        以單一 git log 串流產生每個 commit 的完整記錄
 
-        if author:
-            args.append(f"--author={author}")
-        if since:
-            args.append(f"--since={since}")
-        if until:
-            args.append(f"--until={until}")
-        if branch:
-            args.append(branch)
+        Yields:
+            (Commit 數據字典, parent SHA 列表, 檔案變更列表)；
+            檔案變更為 _iter_numstat_z 產生的 (新增, 刪除, 路徑, 舊路徑)
+        """
+        # 每筆記錄: RS + 9 個 Commit 欄位與 parent 列表（皆以 US 結尾），之後接 -z --numstat 的輸出
+        log_format = "%x1e" + "".join(
+            f"{placeholder}%x1f"
+            for placeholder in ["%H", "%an", "%ae", "%ad", "%cn", "%ce", "%cd", "%s", "%B", "%P"]
+        )
+        args = self._build_log_args(
+            log_format, ["-z", "--numstat"], author=author, since=since, until=until, branch=branch
+        )
+        parents_index = len(COMMIT_FIELDS)
 
-        result = self._run_git_command(args)
-        output = result.stdout
+        for record in self._stream_git_records(args):
+            parts = record.split(FIELD_SEPARATOR)
+            if len(parts) <= parents_index + 1:
+                continue
 
-        # 解析輸出
-        commits = self._parse_commit_log(output)
-        commit_data.extend(commits)
+            commit_info = dict(zip(COMMIT_FIELDS, parts))
+            commit_info["message"] = commit_info["message"].strip()
+            parents = parts[parents_index].split()
+            files = list(self._iter_numstat_z(parts[parents_index + 1]))
 
-        # 轉換為 DataFrame
-        df = pd.DataFrame(commit_data)
+            additions = sum(file[0] for file in files)
+            deletions = sum(file[1] for file in files)
+            commit_info["additions"] = additions
+            commit_info["deletions"] = deletions
+            commit_info["total"] = additions + deletions
+            commit_info["changed_files"] = len(files)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "git_commits.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ Commit 數據已儲存: {output_file} (共 {len(df)} 筆)")
+            yield commit_info, parents, files
 
-        return df
+    @staticmethod
+    def _iter_numstat_z(text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        解析 -z --numstat 輸出
+
+        每個檔案為「新增<TAB>刪除<TAB>路徑<NUL>」；重新命名或複製時路徑欄位為空，
+        其後接「舊路徑<NUL>新路徑<NUL>」。路徑不做跳脫，可包含 |、空白或換行。
+
+        Yields:
+            (新增行數, 刪除行數, 路徑, 舊路徑)；二進位檔案（-）以 0 行計，非重新命名時舊路徑為空字串
+        """
+        tokens = text.lstrip("\x00\n").split("\x00")
+        i = 0
+        while i < len(tokens):
+            parts = tokens[i].split("\t")
+            i += 1
+            if len(parts) != 3:
+                continue
+
+            added, deleted, path = parts
+            old_path = ""
+            if not path and i + 1 < len(tokens):
+                old_path, path = tokens[i], tokens[i + 1]
+                i += 2
+
+            yield (
+                int(added) if added.isdigit() else 0,
+                int(deleted) if deleted.isdigit() else 0,
+                path,
+                old_path,
+            )
+
+    def _iter_commits_legacy(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        branch: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """舊版解析：一次讀入完整輸出並以 | 分隔（保留供比對與基準測試）"""
+        # 格式: SHA|作者名稱|作者Email|提交時間|Committer名稱|Committer Email|提交時間|標題|完整訊息
+        log_format = "%H|%an|%ae|%ad|%cn|%ce|%cd|%s|%B"
+        args = self._build_log_args(
+            log_format, ["--numstat"], author=author, since=since, until=until, branch=branch
+        )
+
+        result = self._run_git_command(args)
+        yield from self._parse_commit_log(result.stdout)
 
     def _parse_commit_log(self, output: str) -> List[Dict]:
         """解析 git log 輸出"""
@@ -191,91 +377,135 @@ class GitLocalCollector:
 
         return commits
 
-    # ==================== 檔案變更統計 ====================
-
-    def collect_file_changes(
+    def export_commits(
         self,
+        output_file: Optional[Path] = None,
+        chunk_size: int = WRITE_CHUNK_SIZE,
         author: Optional[str] = None,
         since: Optional[str] = None,
         until: Optional[str] = None,
-    ) -> pd.DataFrame:
+        branch: Optional[str] = None,
+    ) -> int:
         """
-        收集檔案變更統計
+        串流匯出 Commit 數據到檔案（記憶體用量固定，適用大型 Repository）
 
         Args:
+            output_file: 輸出檔案（.csv 或 .parquet），預設為儲存後端的 git_commits 表格
+            chunk_size: 每次寫入的資料列數
             author: 作者名稱或 Email
             since: 開始日期
             until: 結束日期
+            branch: 分支名稱
 
         Returns:
-            檔案變更統計 DataFrame
+            寫入的 Commit 筆數
         """
-        print(f"\n🔍 收集檔案變更統計...")
+        output_file = Path(output_file) if output_file else self.store.path("git_commits")
+        print(f"\n🔍 串流匯出 Commit 數據（本地 Git）...")
+        if author:
+            print(f"   作者篩選: {author}")
+        if since or until:
+            print(f"   時間範圍: {since or '最早'} ~ {until or '現在'}")
 
-        # 建立 git log 命令（只顯示檔案名稱）
-        args = ["log", "--name-only", "--pretty=format:%H|%an|%ae|%ad", "--date=iso"]
+        with ChunkedTableWriter(output_file, chunk_size=chunk_size) as writer:
+            for commit_info in tqdm(
+                self.iter_commits(author=author, since=since, until=until, branch=branch),
+                desc="解析 Commits",
+                unit=" commits",
+            ):
+                writer.write(commit_info)
 
-        if author:
-            args.append(f"--author={author}")
-        if since:
-            args.append(f"--since={since}")
-        if until:
-            args.append(f"--until={until}")
+        print(f"✅ Commit 數據已儲存: {output_file} (共 {writer.rows_written} 筆)")
+        return writer.rows_written
 
-        result = self._run_git_command(args)
-        output = result.stdout
+    def collect_commits(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        branch: Optional[str] = None,
+    ) -> int:
+        """
+        收集 Commit 數據（分塊串流寫入 git_commits 表格，不在記憶體中保留）
 
-        # 解析輸出
-        file_changes = self._parse_file_changes(output)
+        Args:
+            author: 作者名稱或 Email（支援部分匹配）
+            since: 開始日期 (格式: YYYY-MM-DD)
+            until: 結束日期 (格式: YYYY-MM-DD)
+            branch: 分支名稱（預設為當前分支）
 
-        # 轉換為 DataFrame
-        df = pd.DataFrame(file_changes)
+        Returns:
+            寫入的 Commit 筆數
+        """
+        return self.export_commits(author=author, since=since, until=until, branch=branch)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "git_file_changes.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
-        print(f"✅ 檔案變更統計已儲存: {output_file} (共 {len(df)} 筆)")
+    # ==================== 檔案變更統計 ====================
 
-        return df
+    def collect_file_changes(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> int:
+        """
+        收集檔案變更統計（分塊串流寫入 git_file_changes 表格，不在記憶體中保留）
 
-    def _parse_file_changes(self, output: str) -> List[Dict]:
-        """解析檔案變更輸出"""
-        changes = []
-        lines = output.split("\n")
+        Args:
+            author: 作者名稱或 Email
+            since: 開始日期
+            until: 結束日期
 
-        current_commit = None
-        current_author_name = None
-        current_author_email = None
-        current_date = None
+        Returns:
+            寫入的檔案變更筆數
+        """
+        print(f"\n🔍 收集檔案變更統計...")
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        output_file = self.store.path("git_file_changes")
+        with ChunkedTableWriter(output_file, chunk_size=WRITE_CHUNK_SIZE) as writer:
+            writer.write_many(self.iter_file_changes(author=author, since=since, until=until))
 
-            # 解析 commit 資訊行
-            if "|" in line:
-                parts = line.split("|")
-                if len(parts) >= 4:
-                    current_commit = parts[0]
-                    current_author_name = parts[1]
-                    current_author_email = parts[2]
-                    current_date = parts[3]
-            else:
-                # 檔案名稱
-                if current_commit:
-                    changes.append(
-                        {
-                            "commit_sha": current_commit,
-                            "author_name": current_author_name,
-                            "author_email": current_author_email,
-                            "date": current_date,
-                            "file_path": line,
-                            "file_extension": self._get_file_extension(line),
-                        }
-                    )
+        print(f"✅ 檔案變更統計已儲存: {output_file} (共 {writer.rows_written} 筆)")
+        return writer.rows_written
 
-        return changes
+    def iter_file_changes(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        串流解析 git log --name-only，逐筆產生檔案變更記錄
+
+        Args:
+            author: 作者名稱或 Email
+            since: 開始日期
+            until: 結束日期
+
+        Yields:
+            檔案變更字典（欄位同 collect_file_changes）
+        """
+        log_format = "%x1e%H%x1f%an%x1f%ae%x1f%ad%x1f"
+        args = self._build_log_args(
+            log_format, ["--name-only"], author=author, since=since, until=until
+        )
+
+        for record in self._stream_git_records(args):
+            parts = record.split(FIELD_SEPARATOR)
+            if len(parts) < 5:
+                continue
+
+            commit_sha, author_name, author_email, date = parts[:4]
+            for file_path in parts[4].split("\n"):
+                file_path = file_path.strip()
+                if file_path:
+                    yield {
+                        "commit_sha": commit_sha,
+                        "author_name": author_name,
+                        "author_email": author_email,
+                        "date": date,
+                        "file_path": file_path,
+                        "file_extension": self._get_file_extension(file_path),
+                    }
 
     def _get_file_extension(self, file_path: str) -> str:
         """取得檔案副檔名"""
@@ -323,12 +553,7 @@ class GitLocalCollector:
                     email = match.group(3)
 
                     # 排除 Bot 賬號
-                    is_bot = any(
-                        bot.lower() in name.lower() or bot.lower() in email.lower()
-                        for bot in ExclusionConfig.EXCLUDED_BOTS
-                    )
-
-                    if not is_bot:
+                    if not self._is_bot(name, email):
                         developers.append(
                             {
                                 "name": name,
@@ -337,19 +562,26 @@ class GitLocalCollector:
                             }
                         )
 
-        # 轉換為 DataFrame
-        df = pd.DataFrame(developers)
-
-        # 按提交次數排序
-        df = df.sort_values("commit_count", ascending=False)
+        # 轉換為 DataFrame，按提交次數排序
+        df = self._build_developers_df(developers)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "git_developers.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存
+        output_file = self.store.write("git_developers", df)
         print(f"✅ 開發者列表已儲存: {output_file} (共 {len(df)} 位)")
 
         return df
 
+    @staticmethod
+    def _is_bot(name: str, email: str) -> bool:
+        """判斷是否為 Bot 賬號"""
+        return get_bot_matcher().matches(name, email)
+
+    @staticmethod
+    def _build_developers_df(developers: List[Dict]) -> pd.DataFrame:
+        """建立開發者列表 DataFrame（按提交次數排序）"""
+        df = pd.DataFrame(developers, columns=["name", "email", "commit_count"])
+        return df.sort_values("commit_count", ascending=False)
+
     # ==================== Commit Message 分析 ====================
 
     def analyze_commit_messages(
@@ -384,41 +616,66 @@ class GitLocalCollector:
         result = self._run_git_command(args)
         messages = [line.strip() for line in result.stdout.split("\n") if line.strip()]
 
-        if not messages:
-            return {"total": 0}
+        result = self._summarize_messages(messages)
+        self.print_message_analysis(result)
+        return result
 
-        # 分析規範性
-        from config.analysis_config import CommitQualityConfig
+    @staticmethod
+    def _summarize_messages(messages: List[str]) -> Dict:
+        """
+        統計 Commit Message 的規範性與修復性提交比例
 
-        conventional_count = 0
-        fix_count = 0
+        Args:
+            messages: Commit 標題列表（不含 merge commit）
 
+        Returns:
+            分析結果字典
+        """
+        counts = Counter()
         for msg in messages:
-            # 檢查 Conventional Commits
-            if CommitQualityConfig.CONVENTIONAL_COMMIT_PATTERN.match(msg):
-                conventional_count += 1
-
-            # 檢查修復性關鍵字
-            msg_lower = msg.lower()
-            if any(keyword in msg_lower for keyword in CommitQualityConfig.FIX_KEYWORDS):
-                fix_count += 1
-
-        conventional_rate = conventional_count / len(messages)
-        fix_rate = fix_count / len(messages)
-
-        result = {
-            "total": len(messages),
-            "conventional_count": conventional_count,
-            "conventional_rate": conventional_rate,
-            "fix_count": fix_count,
-            "fix_rate": fix_rate,
+            GitLocalCollector._count_message(counts, msg)
+        return GitLocalCollector._build_message_analysis(counts)
+
+    @staticmethod
+    def _count_message(counts: Counter, msg: str) -> None:
+        """累計單一 Commit 標題的規範性與修復性（total / conventional / fix）"""
+        counts["total"] += 1
+
+        # 檢查 Conventional Commits
+        if CommitQualityConfig.CONVENTIONAL_COMMIT_PATTERN.match(msg):
+            counts["conventional"] += 1
+
+        # 檢查修復性關鍵字
+        msg_lower = msg.lower()
+        if any(keyword in msg_lower for keyword in CommitQualityConfig.FIX_KEYWORDS):
+            counts["fix"] += 1
+
+    @staticmethod
+    def _build_message_analysis(counts: Counter) -> Dict:
+        """由累計數量組出 Message 分析結果"""
+        total = counts["total"]
+        if not total:
+            return {"total": 0}
+
+        return {
+            "total": total,
+            "conventional_count": counts["conventional"],
+            "conventional_rate": counts["conventional"] / total,
+            "fix_count": counts["fix"],
+            "fix_rate": counts["fix"] / total,
         }
 
+    @staticmethod
+    def print_message_analysis(result: Dict) -> None:
+        """顯示 Commit Message 分析結果"""
+        if not result.get("total"):
+            return
         print(f"   總 Commit 數: {result['total']}")
-        print(f"   符合 Conventional Commits: {conventional_count} ({conventional_rate*100:.1f}%)")
-        print(f"   修復性提交: {fix_count} ({fix_rate*100:.1f}%)")
-
-        return result
+        print(
+            f"   符合 Conventional Commits: {result['conventional_count']} "
+            f"({result['conventional_rate']*100:.1f}%)"
+        )
+        print(f"   修復性提交: {result['fix_count']} ({result['fix_rate']*100:.1f}%)")
 
     # ==================== 時間分佈分析 ====================
 
@@ -467,15 +724,120 @@ class GitLocalCollector:
                 hour = int(parts[1])
                 time_data.append({"weekday": weekday, "hour": hour})
 
-        df = pd.DataFrame(time_data)
+        df = pd.DataFrame(time_data, columns=["weekday", "hour"])
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "git_time_distribution.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存
+        output_file = self.store.write("git_time_distribution", df)
         print(f"✅ 時間分佈已儲存: {output_file}")
 
         return df
 
+    # ==================== 單次掃描 ====================
+
+    def extract_history(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        branch: Optional[str] = None,
+        progress: bool = True,
+        store: Optional[TableStore] = None,
+        extra_columns: Optional[Dict] = None,
+    ) -> Dict:
+        """
+        以單一 git log 同時產生 Commits、檔案變更、開發者、Message 分析與時間分佈
+
+        Commits、檔案變更與時間分佈逐筆分塊寫入表格，記憶體中只保留開發者與 Message 的彙總，
+        用量與歷史長度無關。
+
+        與個別收集方法的差異：開發者統計範圍與 Commits 相同（同一分支與篩選條件），
+        而非 git shortlog --all 的所有分支；Message 分析與時間分佈依 parent 數排除 merge commit。
+
+        Args:
+            author: 作者名稱或 Email
+            since: 開始日期
+            until: 結束日期
+            branch: 分支名稱（預設為當前分支）
+            progress: 是否顯示進度（平行收集時關閉）
+            store: 寫入的儲存後端，預設為收集器的輸出目錄
+            extra_columns: 加在每筆資料列最前面的固定欄位（例如 {"repo": 名稱}）
+
+        Returns:
+            包含 developers（DataFrame）、message_analysis（字典）、
+            counts（各表格寫入筆數）與 paths（各表格檔案路徑）的字典
+        """
+        if progress:
+            print(f"\n🔍 單次掃描 Git 歷史...")
+
+        store = store or self.store
+        extra_columns = extra_columns or {}
+        prefix = list(extra_columns)
+
+        developer_counts = Counter()
+        message_counts = Counter()
+        writers = {
+            key: ChunkedTableWriter(
+                store.path(name), chunk_size=WRITE_CHUNK_SIZE, columns=prefix + columns
+            )
+            for key, (name, columns) in HISTORY_TABLES.items()
+        }
+
+        try:
+            for commit_info, parents, files in tqdm(
+                self._iter_commit_records(author, since, until, branch),
+                desc="解析 Commits",
+                unit=" commits",
+                disable=not progress,
+            ):
+                writers["commits"].write({**extra_columns, **commit_info})
+                developer_counts[(commit_info["author_name"], commit_info["author_email"])] += 1
+
+                for additions, deletions, file_path, old_path in files:
+                    writers["file_changes"].write(
+                        {
+                            **extra_columns,
+                            "commit_sha": commit_info["commit_sha"],
+                            "author_name": commit_info["author_name"],
+                            "author_email": commit_info["author_email"],
+                            "date": commit_info["authored_date"],
+                            "file_path": file_path,
+                            "file_extension": self._get_file_extension(file_path),
+                            "additions": additions,
+                            "deletions": deletions,
+                            "old_path": old_path,
+                        }
+                    )
+
+                # Message 分析與時間分佈排除 merge commit（等同 --no-merges）
+                if len(parents) > 1:
+                    continue
+                if commit_info["title"].strip():
+                    self._count_message(message_counts, commit_info["title"].strip())
+
+                # 以作者時區的提交時間分桶（等同 --date=format:%A %H）
+                authored = datetime.strptime(
+                    commit_info["authored_date"][:19], "%Y-%m-%d %H:%M:%S"
+                )
+                writers["time_distribution"].write(
+                    {**extra_columns, "weekday": authored.strftime("%A"), "hour": authored.hour}
+                )
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        developers = [
+            {"name": name, "email": email, "commit_count": count}
+            for (name, email), count in developer_counts.items()
+            if not self._is_bot(name, email)
+        ]
+
+        return {
+            "developers": self._build_developers_df(developers),
+            "message_analysis": self._build_message_analysis(message_counts),
+            "counts": {key: writer.rows_written for key, writer in writers.items()},
+            "paths": {key: writer.output_file for key, writer in writers.items()},
+        }
+
     # ==================== 完整收集 ====================
 
     def collect_all(
@@ -483,9 +845,9 @@ class GitLocalCollector:
         author: Optional[str] = None,
         since: Optional[str] = None,
         until: Optional[str] = None,
-    ) -> Dict[str, pd.DataFrame]:
+    ) -> Dict:
         """
-        收集所有本地 Git 數據
+        收集所有本地 Git 數據（Commits、檔案變更與時間分佈串流寫入表格）
 
         Args:
             author: 作者名稱或 Email
@@ -493,43 +855,28 @@ class GitLocalCollector:
             until: 結束日期
 
         Returns:
-            包含所有數據的字典
+            extract_history 的結果（developers、message_analysis、counts、paths）
         """
         print("=" * 60)
         print(f"開始收集本地 Git 數據: {self.repo_path}")
         print("=" * 60)
 
-        results = {}
-
-        # 1. 收集開發者列表
-        results["developers"] = self.collect_developers(since=since, until=until)
+        results = self.extract_history(author=author, since=since, until=until)
 
-        # 2. 收集 Commits
-        results["commits"] = self.collect_commits(
-            author=author, since=since, until=until
-        )
-
-        # 3. 收集檔案變更
-        results["file_changes"] = self.collect_file_changes(
-            author=author, since=since, until=until
-        )
+        # 儲存
+        output_file = self.store.write("git_developers", results["developers"])
+        print(f"✅ 已儲存: {output_file} (共 {len(results['developers'])} 筆)")
+        for key in HISTORY_TABLES:
+            print(f"✅ 已儲存: {results['paths'][key]} (共 {results['counts'][key]} 筆)")
 
-        # 4. 分析 Commit Messages
-        results["message_analysis"] = self.analyze_commit_messages(
-            author=author, since=since, until=until
-        )
-
-        # 5. 分析時間分佈
-        results["time_distribution"] = self.analyze_time_distribution(
-            author=author, since=since, until=until
-        )
+        self.print_message_analysis(results["message_analysis"])
 
         print("\n" + "=" * 60)
         print("✅ 所有本地 Git 數據收集完成！")
         print("=" * 60)
         print(f"開發者數量: {len(results['developers'])}")
-        print(f"Commits 數量: {len(results['commits'])}")
-        print(f"檔案變更記錄: {len(results['file_changes'])}")
+        print(f"Commits 數量: {results['counts']['commits']}")
+        print(f"檔案變更記錄: {results['counts']['file_changes']}")
         print("=" * 60)
 
         return results
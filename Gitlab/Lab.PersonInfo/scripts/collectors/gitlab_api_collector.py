@@ -7,8 +7,9 @@ GitLab API 數據收集器
 import os
 import time
 import csv
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, Iterator, List, Dict, Optional, Any, Tuple
 from datetime import datetime
 from tqdm import tqdm
 import pandas as pd
@@ -16,17 +17,41 @@ import gitlab
 from gitlab.v4.objects import Project, MergeRequest
 
 from config.gitlab_config import get_gitlab_config, get_gitlab_client
+from collectors.sync_state import SyncStateStore, resolve_since
+from storage.table_store import TableStore, get_table_store
+
+
+# 平行收集時逐專案寫入分片的數據集（表格名稱, 去重主鍵）
+PART_DATASETS = [
+    ("gitlab_commits", ["commit_sha"]),
+    ("gitlab_merge_requests", ["project_id", "mr_iid"]),
+    ("gitlab_review_comments", ["note_id"]),
+]
+
+# 平行收集時逐頁記錄檢查點的資源（Review Comments 隨 MR 分頁一起收集）
+CHECKPOINT_RESOURCES = ["commits", "merge_requests"]
+
+# 列表 API 每頁筆數
+PAGE_SIZE = 100
 
 
 class GitLabAPICollector:
     """GitLab API 數據收集器"""
 
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        incremental: bool = False,
+        full_mr_diffs: bool = False,
+    ):
         """
         初始化收集器
 
         Args:
             output_dir: 輸出目錄路徑，預設為 scripts/output/raw/
+            incremental: 增量模式，只抓取各專案同步水位之後的數據並合併到既有檔案
+            full_mr_diffs: MR 行數統計一律下載完整 diff 計算（舊行為，傳輸量大）；
+                           預設在 MR 所含 commit 的統計都已快取時以其加總，否則下載 diff
         """
         self.config = get_gitlab_config()
         self.gl = get_gitlab_client()
@@ -38,10 +63,15 @@ class GitLabAPICollector:
             self.output_dir = Path(__file__).parent.parent / "output" / "raw"
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.store = get_table_store(self.output_dir)
+
+        # 同步狀態：增量模式的同步水位，以及平行收集的分頁檢查點
+        self.incremental = incremental
+        self.sync_state = SyncStateStore(self.output_dir)
 
-    def _rate_limit_wait(self):
-        """API 請求節流"""
-        self.config.rate_limit_wait()
+        # MR 統計模式與 commit 行數統計快取（commit_sha -> (additions, deletions)）
+        self.full_mr_diffs = full_mr_diffs
+        self._commit_stats: Dict[str, Tuple[int, int]] = {}
 
     def _retry_on_error(self, func, *args, max_retries: int = 3, **kwargs):
         """
@@ -67,6 +97,50 @@ class GitLabAPICollector:
                     print(f"❌ 達到最大重試次數，跳過此請求: {e}")
                     raise
 
+    # ==================== 增量同步 ====================
+
+    def _get_watermark(self, project_id: int, resource: str) -> Optional[str]:
+        """取得專案的同步水位（非增量模式一律為 None）"""
+        if not self.incremental:
+            return None
+        return self.sync_state.get_watermark(project_id, resource)
+
+    @staticmethod
+    def _track_watermark(watermarks: Dict[int, str], project_id: int, values: List[str]) -> None:
+        """記錄本次抓到的最新時間，待數據寫入後再更新水位"""
+        values = [v for v in values if v]
+        if values:
+            watermarks[project_id] = max(values, key=pd.Timestamp)
+
+    def _commit_watermarks(self, resource: str, watermarks: Dict[int, str]) -> None:
+        """數據已寫入磁碟後才推進水位，避免中斷時遺漏數據"""
+        if not self.incremental:
+            return
+        for project_id, watermark in watermarks.items():
+            self.sync_state.set_watermark(project_id, resource, watermark)
+
+    def _save_dataset(self, df: pd.DataFrame, name: str, keys: List[str]) -> pd.DataFrame:
+        """
+        儲存數據集；增量模式下與既有檔案合併並依主鍵去重（保留最新一筆）
+
+        Args:
+            df: 本次收集的數據
+            name: 表格名稱（不含副檔名）
+            keys: 去重主鍵欄位
+
+        Returns:
+            實際寫入的完整數據集
+        """
+        if self.incremental and self.store.exists(name):
+            existing = self.store.read(name)
+            if not existing.empty:
+                print(f"   增量合併：既有 {len(existing)} 筆 + 新抓取 {len(df)} 筆")
+                df = pd.concat([existing, df], ignore_index=True)
+                df = df.drop_duplicates(subset=keys, keep="last")
+
+        self.store.write(name, df)
+        return df
+
     # ==================== 專案收集 ====================
 
     def collect_projects(
@@ -120,7 +194,6 @@ class GitLabAPICollector:
                         "archived": getattr(project, "archived", False),
                     }
                 )
-                self._rate_limit_wait()
 
         except Exception as e:
             print(f"❌ 收集專案列表失敗: {e}")
@@ -129,15 +202,118 @@ class GitLabAPICollector:
         # 轉換為 DataFrame
         df = pd.DataFrame(projects_data)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "gitlab_projects.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存
+        output_file = self.store.write("gitlab_projects", df)
         print(f"✅ 專案列表已儲存: {output_file}")
 
         return df
 
     # ==================== Merge Request 收集 ====================
 
+    def _list_project_mrs(
+        self,
+        project: Project,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        state: str = "all",
+        updated_after: Optional[str] = None,
+    ) -> List[MergeRequest]:
+        """
+        取得專案的 MR 列表
+
+        Args:
+            project: 專案物件
+            start_date: 開始日期（MR 建立時間）
+            end_date: 結束日期（MR 建立時間）
+            state: MR 狀態
+            updated_after: 只取得此時間之後更新的 MR（同步水位）
+
+        Returns:
+            MR 物件列表
+        """
+        params = self._mr_list_params(start_date, end_date, state, updated_after)
+        return project.mergerequests.list(all=True, per_page=PAGE_SIZE, **params)
+
+    @staticmethod
+    def _mr_list_params(
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        state: str = "all",
+        updated_after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """MR 列表的查詢參數（不含分頁）"""
+        params = {"state": state}
+        if start_date:
+            params["created_after"] = start_date
+        if end_date:
+            params["created_before"] = end_date
+        if updated_after:
+            params["updated_after"] = updated_after
+        return params
+
+    def _build_mr_rows(self, project_id: int, mrs: List[MergeRequest]) -> List[Dict]:
+        """將 MR 物件轉換為數據列（含行數統計）"""
+        mr_data = []
+        for mr in mrs:
+            # 基本資訊
+            mr_info = {
+                "project_id": project_id,
+                "mr_iid": mr.iid,
+                "mr_id": mr.id,
+                "title": mr.title,
+                "description": getattr(mr, "description", ""),
+                "state": mr.state,
+                "created_at": mr.created_at,
+                "updated_at": mr.updated_at,
+                "merged_at": getattr(mr, "merged_at", None),
+                "closed_at": getattr(mr, "closed_at", None),
+                "author_username": mr.author.get("username", ""),
+                "author_name": mr.author.get("name", ""),
+                "author_id": mr.author.get("id", ""),
+                "source_branch": mr.source_branch,
+                "target_branch": mr.target_branch,
+                "web_url": mr.web_url,
+            }
+
+            # Assignees (可能有多個)
+            assignees = getattr(mr, "assignees", [])
+            if assignees:
+                mr_info["assignee_usernames"] = ",".join(
+                    [a.get("username", "") for a in assignees]
+                )
+            else:
+                mr_info["assignee_usernames"] = ""
+
+            # Reviewers (可能有多個)
+            reviewers = getattr(mr, "reviewers", [])
+            if reviewers:
+                mr_info["reviewer_usernames"] = ",".join(
+                    [r.get("username", "") for r in reviewers]
+                )
+            else:
+                mr_info["reviewer_usernames"] = ""
+
+            # 統計資訊
+            mr_info["upvotes"] = getattr(mr, "upvotes", 0)
+            mr_info["downvotes"] = getattr(mr, "downvotes", 0)
+            mr_info["user_notes_count"] = getattr(mr, "user_notes_count", 0)
+
+            # Diff 統計（需要額外請求）
+            try:
+                mr_info.update(self._mr_diff_stats(mr))
+            except Exception:
+                mr_info["additions"] = 0
+                mr_info["deletions"] = 0
+                mr_info["changed_files"] = 0
+
+            # Labels
+            labels = getattr(mr, "labels", [])
+            mr_info["labels"] = ",".join(labels) if labels else ""
+
+            mr_data.append(mr_info)
+
+        return mr_data
+
     def collect_merge_requests(
         self,
         project_ids: Optional[List[int]] = None,
@@ -165,85 +341,23 @@ class GitLabAPICollector:
             project_ids = projects_df["project_id"].tolist()
 
         mr_data = []
+        watermarks = {}
 
         for project_id in tqdm(project_ids, desc="處理專案 MR"):
             try:
                 project = self.gl.projects.get(project_id)
 
                 # 取得 MR 列表
-                params = {"state": state, "per_page": 100}
-                if start_date:
-                    params["created_after"] = start_date
-                if end_date:
-                    params["created_before"] = end_date
-
-                mrs = project.mergerequests.list(all=True, **params)
-
-                for mr in mrs:
-                    # 基本資訊
-                    mr_info = {
-                        "project_id": project_id,
-                        "mr_iid": mr.iid,
-                        "mr_id": mr.id,
-                        "title": mr.title,
-                        "description": getattr(mr, "description", ""),
-                        "state": mr.state,
-                        "created_at": mr.created_at,
-                        "updated_at": mr.updated_at,
-                        "merged_at": getattr(mr, "merged_at", None),
-                        "closed_at": getattr(mr, "closed_at", None),
-                        "author_username": mr.author.get("username", ""),
-                        "author_name": mr.author.get("name", ""),
-                        "author_id": mr.author.get("id", ""),
-                        "source_branch": mr.source_branch,
-                        "target_branch": mr.target_branch,
-                        "web_url": mr.web_url,
-                    }
+                mrs = self._list_project_mrs(
+                    project,
+                    start_date,
+                    end_date,
+                    state,
+                    updated_after=self._get_watermark(project_id, "merge_requests"),
+                )
+                self._track_watermark(watermarks, project_id, [mr.updated_at for mr in mrs])
 
-                    # Assignees (可能有多個)
-                    assignees = getattr(mr, "assignees", [])
-                    if assignees:
-                        mr_info["assignee_usernames"] = ",".join(
-                            [a.get("username", "") for a in assignees]
-                        )
-                    else:
-                        mr_info["assignee_usernames"] = ""
-
-                    # Reviewers (可能有多個)
-                    reviewers = getattr(mr, "reviewers", [])
-                    if reviewers:
-                        mr_info["reviewer_usernames"] = ",".join(
-                            [r.get("username", "") for r in reviewers]
-                        )
-                    else:
-                        mr_info["reviewer_usernames"] = ""
-
-                    # 統計資訊
-                    mr_info["upvotes"] = getattr(mr, "upvotes", 0)
-                    mr_info["downvotes"] = getattr(mr, "downvotes", 0)
-                    mr_info["user_notes_count"] = getattr(mr, "user_notes_count", 0)
-
-                    # Diff 統計（需要額外請求）
-                    try:
-                        changes = mr.changes()
-                        mr_info["additions"] = sum(
-                            c.get("diff", "").count("\n+") for c in changes.get("changes", [])
-                        )
-                        mr_info["deletions"] = sum(
-                            c.get("diff", "").count("\n-") for c in changes.get("changes", [])
-                        )
-                        mr_info["changed_files"] = len(changes.get("changes", []))
-                    except:
-                        mr_info["additions"] = 0
-                        mr_info["deletions"] = 0
-                        mr_info["changed_files"] = 0
-
-                    # Labels
-                    labels = getattr(mr, "labels", [])
-                    mr_info["labels"] = ",".join(labels) if labels else ""
-
-                    mr_data.append(mr_info)
-                    self._rate_limit_wait()
+                mr_data.extend(self._build_mr_rows(project_id, mrs))
 
             except gitlab.exceptions.GitlabGetError as e:
                 print(f"⚠️ 無法存取專案 {project_id}: {e}")
@@ -255,15 +369,107 @@ class GitLabAPICollector:
         # 轉換為 DataFrame
         df = pd.DataFrame(mr_data)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "gitlab_merge_requests.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存到 CSV（增量模式會合併既有數據）
+        df = self._save_dataset(df, "gitlab_merge_requests", ["project_id", "mr_iid"])
+        output_file = self.store.path("gitlab_merge_requests")
+        self._commit_watermarks("merge_requests", watermarks)
         print(f"✅ Merge Request 數據已儲存: {output_file} (共 {len(df)} 筆)")
 
         return df
 
+    def _mr_diff_stats(self, mr: MergeRequest) -> Dict[str, int]:
+        """
+        計算 MR 的新增、刪除行數與變更檔案數
+
+        預設盡量不下載 diff：MR 物件帶有 changes_count（超過上限時為 "1000+"，取數字部分），
+        且 MR 所含 commit 的統計都已由 collect_commits 快取時，以 commit 統計加總，
+        只需一次列出 MR commit 的請求；否則改為一次 changes() 請求下載 diff 計算。
+        full_mr_diffs=True 時一律下載 diff 計算。
+
+        commit 加總是近似值：同一行在多個 commit 中修改會重複計算，
+        revert 與被 revert 的 commit 也會各計一次，因此通常大於 MR 最終 diff 的行數。
+
+        Args:
+            mr: MR 物件（列表回傳的物件即可）
+
+        Returns:
+            包含 additions、deletions、changed_files 的字典
+        """
+        changes_count = str(getattr(mr, "changes_count", "") or "").rstrip("+")
+        if self.full_mr_diffs or not changes_count.isdigit():
+            return self._mr_changes_stats(mr)
+
+        commits = list(mr.commits(per_page=PAGE_SIZE))
+        if any(commit.id not in self._commit_stats for commit in commits):
+            return self._mr_changes_stats(mr)
+
+        return {
+            "additions": sum(self._commit_stats[commit.id][0] for commit in commits),
+            "deletions": sum(self._commit_stats[commit.id][1] for commit in commits),
+            "changed_files": int(changes_count),
+        }
+
+    @staticmethod
+    def _mr_changes_stats(mr: MergeRequest) -> Dict[str, int]:
+        """下載 MR 的完整 diff 計算新增、刪除行數與變更檔案數"""
+        changes = mr.changes().get("changes", [])
+        return {
+            "additions": sum(c.get("diff", "").count("\n+") for c in changes),
+            "deletions": sum(c.get("diff", "").count("\n-") for c in changes),
+            "changed_files": len(changes),
+        }
+
     # ==================== Review Comments 收集 ====================
 
+    @staticmethod
+    def _build_comment_rows(project_id: int, mrs: List[MergeRequest]) -> List[Dict]:
+        """取得 MR 的留言並轉換為數據列（排除系統訊息）"""
+        comments_data = []
+        for mr in mrs:
+            try:
+                # 取得 MR 的所有 Notes (Comments)
+                notes = mr.notes.list(all=True)
+
+                for note in notes:
+                    # 只收集非系統訊息的 notes
+                    if not getattr(note, "system", False):
+                        comment_info = {
+                            "project_id": project_id,
+                            "mr_iid": mr.iid,
+                            "mr_id": mr.id,
+                            "note_id": note.id,
+                            "author_username": note.author.get("username", ""),
+                            "author_name": note.author.get("name", ""),
+                            "author_id": note.author.get("id", ""),
+                            "body": note.body,
+                            "created_at": note.created_at,
+                            "updated_at": note.updated_at,
+                            "noteable_type": getattr(note, "noteable_type", ""),
+                            "resolvable": getattr(note, "resolvable", False),
+                            "resolved": getattr(note, "resolved", False),
+                        }
+
+                        # Diff Note 相關資訊
+                        if hasattr(note, "position"):
+                            position = note.position
+                            if position:
+                                comment_info["diff_file_path"] = position.get("new_path", "")
+                                comment_info["diff_line"] = position.get("new_line", "")
+                            else:
+                                comment_info["diff_file_path"] = ""
+                                comment_info["diff_line"] = ""
+                        else:
+                            comment_info["diff_file_path"] = ""
+                            comment_info["diff_line"] = ""
+
+                        comments_data.append(comment_info)
+
+            except Exception as e:
+                print(f"⚠️ 處理 MR {mr.iid} 的 Comments 時發生錯誤: {e}")
+                continue
+
+        return comments_data
+
     def collect_review_comments(
         self,
         project_ids: Optional[List[int]] = None,
@@ -289,66 +495,23 @@ class GitLabAPICollector:
             project_ids = projects_df["project_id"].tolist()
 
         comments_data = []
+        watermarks = {}
 
         for project_id in tqdm(project_ids, desc="處理專案 Review Comments"):
             try:
                 project = self.gl.projects.get(project_id)
 
                 # 取得 MR 列表
-                params = {"state": "all", "per_page": 100}
-                if start_date:
-                    params["created_after"] = start_date
-                if end_date:
-                    params["created_before"] = end_date
-
-                mrs = project.mergerequests.list(all=True, **params)
-
-                for mr in mrs:
-                    try:
-                        # 取得 MR 的所有 Notes (Comments)
-                        notes = mr.notes.list(all=True)
-
-                        for note in notes:
-                            # 只收集非系統訊息的 notes
-                            if not getattr(note, "system", False):
-                                comment_info = {
-                                    "project_id": project_id,
-                                    "mr_iid": mr.iid,
-                                    "mr_id": mr.id,
-                                    "note_id": note.id,
-                                    "author_username": note.author.get("username", ""),
-                                    "author_name": note.author.get("name", ""),
-                                    "author_id": note.author.get("id", ""),
-                                    "body": note.body,
-                                    "created_at": note.created_at,
-                                    "updated_at": note.updated_at,
-                                    "noteable_type": getattr(note, "noteable_type", ""),
-                                    "resolvable": getattr(note, "resolvable", False),
-                                    "resolved": getattr(note, "resolved", False),
-                                }
-
-                                # Diff Note 相關資訊
-                                if hasattr(note, "position"):
-                                    position = note.position
-                                    if position:
-                                        comment_info["diff_file_path"] = position.get(
-                                            "new_path", ""
-                                        )
-                                        comment_info["diff_line"] = position.get("new_line", "")
-                                    else:
-                                        comment_info["diff_file_path"] = ""
-                                        comment_info["diff_line"] = ""
-                                else:
-                                    comment_info["diff_file_path"] = ""
-                                    comment_info["diff_line"] = ""
-
-                                comments_data.append(comment_info)
-
-                        self._rate_limit_wait()
-
-                    except Exception as e:
-                        print(f"⚠️ 處理 MR {mr.iid} 的 Comments 時發生錯誤: {e}")
-                        continue
+                # 新留言會更新 MR 的 updated_at，因此以 MR 更新時間作為留言的同步水位
+                mrs = self._list_project_mrs(
+                    project,
+                    start_date,
+                    end_date,
+                    updated_after=self._get_watermark(project_id, "review_comments"),
+                )
+                self._track_watermark(watermarks, project_id, [mr.updated_at for mr in mrs])
+
+                comments_data.extend(self._build_comment_rows(project_id, mrs))
 
             except gitlab.exceptions.GitlabGetError as e:
                 print(f"⚠️ 無法存取專案 {project_id}: {e}")
@@ -360,15 +523,78 @@ class GitLabAPICollector:
         # 轉換為 DataFrame
         df = pd.DataFrame(comments_data)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "gitlab_review_comments.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存到 CSV（增量模式會合併既有數據）
+        df = self._save_dataset(df, "gitlab_review_comments", ["note_id"])
+        output_file = self.store.path("gitlab_review_comments")
+        self._commit_watermarks("review_comments", watermarks)
         print(f"✅ Review Comments 數據已儲存: {output_file} (共 {len(df)} 筆)")
 
         return df
 
     # ==================== Commit 收集 (API 版本) ====================
 
+    def _build_commit_rows(
+        self,
+        project: Project,
+        project_id: int,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        ref_name: Optional[str] = None,
+    ) -> List[Dict]:
+        """取得專案的 Commit 列表並轉換為數據列（同時快取行數統計供 MR 使用）"""
+        params = self._commit_list_params(since, until, ref_name)
+        return [
+            self._build_commit_row(project_id, commit)
+            for commit in project.commits.list(all=True, per_page=PAGE_SIZE, **params)
+        ]
+
+    @staticmethod
+    def _commit_list_params(
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        ref_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Commit 列表的查詢參數（不含分頁；with_stats 讓列表回應直接包含行數統計）"""
+        params = {"with_stats": True}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        if ref_name:
+            params["ref_name"] = ref_name
+        return params
+
+    def _build_commit_row(self, project_id: int, commit: Any) -> Dict:
+        """將 Commit 物件轉換為數據列（同時快取行數統計供 MR 使用）"""
+        commit_info = {
+            "project_id": project_id,
+            "commit_sha": commit.id,
+            "short_id": commit.short_id,
+            "title": commit.title,
+            "message": commit.message,
+            "author_name": commit.author_name,
+            "author_email": commit.author_email,
+            "authored_date": commit.authored_date,
+            "committer_name": commit.committer_name,
+            "committer_email": commit.committer_email,
+            "committed_date": commit.committed_date,
+            "created_at": commit.created_at,
+            "parent_ids": ",".join(commit.parent_ids) if commit.parent_ids else "",
+            "web_url": commit.web_url,
+        }
+
+        # 統計資訊
+        stats = getattr(commit, "stats", {})
+        commit_info["additions"] = stats.get("additions", 0)
+        commit_info["deletions"] = stats.get("deletions", 0)
+        commit_info["total"] = stats.get("total", 0)
+        self._commit_stats[commit.id] = (
+            commit_info["additions"],
+            commit_info["deletions"],
+        )
+
+        return commit_info
+
     def collect_commits(
         self,
         project_ids: Optional[List[int]] = None,
@@ -396,49 +622,18 @@ class GitLabAPICollector:
             project_ids = projects_df["project_id"].tolist()
 
         commit_data = []
+        watermarks = {}
 
         for project_id in tqdm(project_ids, desc="處理專案 Commits"):
             try:
                 project = self.gl.projects.get(project_id)
 
-                # 取得 Commit 列表
-                params = {"per_page": 100}
-                if start_date:
-                    params["since"] = start_date
-                if end_date:
-                    params["until"] = end_date
-                if ref_name:
-                    params["ref_name"] = ref_name
-
-                commits = project.commits.list(all=True, **params)
-
-                for commit in commits:
-                    commit_info = {
-                        "project_id": project_id,
-                        "commit_sha": commit.id,
-                        "short_id": commit.short_id,
-                        "title": commit.title,
-                        "message": commit.message,
-                        "author_name": commit.author_name,
-                        "author_email": commit.author_email,
-                        "authored_date": commit.authored_date,
-                        "committer_name": commit.committer_name,
-                        "committer_email": commit.committer_email,
-                        "committed_date": commit.committed_date,
-                        "created_at": commit.created_at,
-                        "parent_ids": ",".join(commit.parent_ids) if commit.parent_ids else "",
-                        "web_url": commit.web_url,
-                    }
-
-                    # 統計資訊
-                    stats = getattr(commit, "stats", {})
-                    commit_info["additions"] = stats.get("additions", 0)
-                    commit_info["deletions"] = stats.get("deletions", 0)
-                    commit_info["total"] = stats.get("total", 0)
-
-                    commit_data.append(commit_info)
-
-                self._rate_limit_wait()
+                since = resolve_since(start_date, self._get_watermark(project_id, "commits"))
+                rows = self._build_commit_rows(project, project_id, since, end_date, ref_name)
+                self._track_watermark(
+                    watermarks, project_id, [row["committed_date"] for row in rows]
+                )
+                commit_data.extend(rows)
 
             except gitlab.exceptions.GitlabGetError as e:
                 print(f"⚠️ 無法存取專案 {project_id}: {e}")
@@ -450,13 +645,267 @@ class GitLabAPICollector:
         # 轉換為 DataFrame
         df = pd.DataFrame(commit_data)
 
-        # 儲存到 CSV
-        output_file = self.output_dir / "gitlab_commits.csv"
-        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        # 儲存到 CSV（增量模式會合併既有數據）
+        df = self._save_dataset(df, "gitlab_commits", ["commit_sha"])
+        output_file = self.store.path("gitlab_commits")
+        self._commit_watermarks("commits", watermarks)
         print(f"✅ Commit 數據已儲存: {output_file} (共 {len(df)} 筆)")
 
         return df
 
+    # ==================== 專案平行收集 ====================
+
+    def _part_store(self, name: str) -> TableStore:
+        """取得某個數據集的專案分片儲存（output/raw/parts/<name>/project_<id>）"""
+        return get_table_store(self.output_dir / "parts" / name)
+
+    def _iter_pages(
+        self, list_method: Callable, start_page: int = 1, **params
+    ) -> Iterator[Tuple[int, List, bool]]:
+        """
+        逐頁取得列表（offset 分頁，每頁 PAGE_SIZE 筆），每頁請求失敗時重試
+
+        Args:
+            list_method: 列表方法，例如 project.commits.list
+            start_page: 起始分頁
+            **params: 查詢參數
+
+        Yields:
+            (分頁編號, 該頁物件列表, 是否為最後一頁)
+        """
+        page = start_page
+        while True:
+            items = self._retry_on_error(list_method, page=page, per_page=PAGE_SIZE, **params)
+            last = len(items) < PAGE_SIZE
+            yield page, items, last
+            if last:
+                return
+            page += 1
+
+    def _collect_pages(
+        self,
+        project_id: int,
+        resource: str,
+        list_method: Callable,
+        params: Dict[str, Any],
+        handle_page: Callable[[int, List], List[str]],
+        cursor_param: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        從檢查點接續逐頁收集某個資源，每頁處理完（分片已寫入）後記錄檢查點
+
+        offset 分頁在續傳時只適用於新數據排在最後的列表（例如依建立時間遞增排序的 MR）。
+        只能由新到舊列出的資源（Commits）改以時間游標續傳：檢查點記錄已抓到的最舊時間，
+        續傳時以 cursor_param（例如 until）篩選並從第 1 頁重新查詢，新數據不會使分頁位移；
+        游標當下的數據會重抓一次，合併分片時依主鍵去重。
+
+        Args:
+            project_id: 專案 ID
+            resource: 資源類型（CHECKPOINT_RESOURCES）
+            list_method: 列表方法
+            params: 查詢參數（不含分頁）
+            handle_page: 處理一頁物件並寫入分片，回傳用於同步水位（及游標）的時間列表
+            cursor_param: 以時間游標續傳時的查詢參數名稱，None 表示以 offset 分頁續傳
+
+        Returns:
+            此資源抓到的最新時間（含先前分頁），沒有數據則為 None
+        """
+        checkpoint = self.sync_state.get_checkpoint(project_id, resource)
+        if checkpoint and checkpoint["done"]:
+            return checkpoint["watermark"]
+
+        # 分片編號一律接續檢查點，避免覆寫先前分頁的分片
+        start_page = checkpoint["next_page"] if checkpoint else 1
+        latest = checkpoint["watermark"] if checkpoint else None
+        cursor = checkpoint["cursor"] if checkpoint else None
+
+        request_page = start_page
+        if cursor_param and cursor:
+            params = {**params, cursor_param: cursor}
+            request_page = 1
+
+        pages = self._iter_pages(list_method, request_page, **params)
+        for page, (_, items, last) in enumerate(pages, start=start_page):
+            times = [value for value in handle_page(page, items) if value]
+            values = [value for value in [latest, *times] if value]
+            latest = max(values, key=pd.Timestamp) if values else None
+            if cursor_param:
+                values = [value for value in [cursor, *times] if value]
+                cursor = min(values, key=pd.Timestamp) if values else None
+            self.sync_state.save_checkpoint(project_id, resource, page + 1, last, latest, cursor)
+
+        return latest
+
+    def _project_done(self, project_id: int) -> bool:
+        """專案的所有資源是否都已在本次收集中完成（續傳時略過）"""
+        for resource in CHECKPOINT_RESOURCES:
+            checkpoint = self.sync_state.get_checkpoint(project_id, resource)
+            if not (checkpoint and checkpoint["done"]):
+                return False
+        return True
+
+    def _collect_project(
+        self,
+        project_id: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        收集單一專案的 Commits、MR 與 Review Comments，逐頁寫入專案分片並記錄檢查點
+
+        分片以 project_<id>_p<分頁> 命名，重抓同一頁會覆寫同一個分片；
+        MR 列表同時供 MR 與 Review Comments 使用。專案的所有資源完成後才推進同步水位。
+
+        Args:
+            project_id: 專案 ID
+            start_date: 開始日期
+            end_date: 結束日期
+
+        Returns:
+            本次寫入各數據集的筆數
+        """
+        project = self.gl.projects.get(project_id)
+        counts = {name: 0 for name, _ in PART_DATASETS}
+
+        def write_part(name: str, page: int, rows: List[Dict]) -> None:
+            if rows:
+                self._part_store(name).write(
+                    f"project_{project_id}_p{page:05d}", pd.DataFrame(rows)
+                )
+            counts[name] += len(rows)
+
+        # 1. Commits（先收集，MR 行數統計可重用 commit 的統計）
+        def commit_page(page: int, commits: List) -> List[str]:
+            rows = [self._build_commit_row(project_id, commit) for commit in commits]
+            write_part("gitlab_commits", page, rows)
+            return [row["committed_date"] for row in rows]
+
+        since = resolve_since(start_date, self._get_watermark(project_id, "commits"))
+        latest_commit = self._collect_pages(
+            project_id,
+            "commits",
+            project.commits.list,
+            self._commit_list_params(since, end_date),
+            commit_page,
+            cursor_param="until",
+        )
+
+        # 2. MR 列表：以兩者中較早的同步水位查詢，再依各自水位篩選
+        mr_watermark = self._get_watermark(project_id, "merge_requests")
+        note_watermark = self._get_watermark(project_id, "review_comments")
+        updated_after = (
+            min(mr_watermark, note_watermark, key=pd.Timestamp)
+            if mr_watermark and note_watermark
+            else None
+        )
+
+        def updated_since(mr: MergeRequest, watermark: Optional[str]) -> bool:
+            return not watermark or pd.Timestamp(mr.updated_at) >= pd.Timestamp(watermark)
+
+        def mr_page(page: int, mrs: List[MergeRequest]) -> List[str]:
+            mr_rows = self._build_mr_rows(
+                project_id, [mr for mr in mrs if updated_since(mr, mr_watermark)]
+            )
+            comment_rows = self._build_comment_rows(
+                project_id, [mr for mr in mrs if updated_since(mr, note_watermark)]
+            )
+            write_part("gitlab_merge_requests", page, mr_rows)
+            write_part("gitlab_review_comments", page, comment_rows)
+            return [mr.updated_at for mr in mrs]
+
+        # 依建立時間遞增排序：新建立的 MR 排在最後，續傳時已完成的分頁不會位移
+        latest_mr = self._collect_pages(
+            project_id,
+            "merge_requests",
+            project.mergerequests.list,
+            {
+                **self._mr_list_params(start_date, end_date, updated_after=updated_after),
+                "order_by": "created_at",
+                "sort": "asc",
+            },
+            mr_page,
+        )
+
+        # 3. 所有分頁都已寫入分片，推進同步水位
+        if latest_commit:
+            self._commit_watermarks("commits", {project_id: latest_commit})
+        if latest_mr:
+            self._commit_watermarks("merge_requests", {project_id: latest_mr})
+            self._commit_watermarks("review_comments", {project_id: latest_mr})
+
+        return counts
+
+    def _merge_parts(self, name: str, keys: List[str], cleanup: bool = True) -> pd.DataFrame:
+        """
+        將專案分片合併為完整數據集（增量模式會再與既有數據合併）
+
+        Args:
+            name: 數據集表格名稱
+            keys: 去重主鍵欄位
+            cleanup: 合併後是否刪除分片；有專案未完成時保留，供續傳後重新合併
+
+        Returns:
+            實際寫入的完整數據集
+        """
+        part_store = self._part_store(name)
+        part_files = sorted(part_store.base_dir.glob(f"project_*{part_store.extension}"))
+        frames = [part_store.read(part_file.stem) for part_file in part_files]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not df.empty:
+            df = df.drop_duplicates(subset=keys, keep="last")
+
+        df = self._save_dataset(df, name, keys)
+        if cleanup:
+            for part_file in part_files:
+                part_file.unlink()
+        return df
+
+    def _recover_parts(self) -> None:
+        """處理上次收集留下的專案分片：增量模式併入數據集（水位已推進），否則刪除"""
+        for name, keys in PART_DATASETS:
+            part_store = self._part_store(name)
+            part_files = list(part_store.base_dir.glob(f"project_*{part_store.extension}"))
+            if not part_files:
+                continue
+            if self.incremental:
+                print(f"   併入上次收集留下的 {len(part_files)} 個 {name} 分片")
+                self._merge_parts(name, keys)
+            else:
+                for part_file in part_files:
+                    part_file.unlink()
+
+    def _restore_commit_stats(self) -> None:
+        """續傳時從已寫入的 Commit 分片還原行數統計快取，MR 統計不必再逐一查詢這些 commit"""
+        part_store = self._part_store("gitlab_commits")
+        for part_file in sorted(part_store.base_dir.glob(f"project_*{part_store.extension}")):
+            part = part_store.read(part_file.stem, columns=["commit_sha", "additions", "deletions"])
+            for sha, additions, deletions in zip(
+                part["commit_sha"], part["additions"], part["deletions"]
+            ):
+                self._commit_stats[sha] = (int(additions), int(deletions))
+
+    def _prepare_checkpoints(self, params: Dict[str, Any], resume: bool) -> None:
+        """
+        續傳時沿用參數相同的上次收集（保留分片與檢查點），否則清除舊狀態並開始新的收集
+
+        Args:
+            params: 本次收集的參數
+            resume: 是否續傳
+        """
+        if resume:
+            previous = self.sync_state.get_run_params()
+            if previous == params:
+                print("⏯️ 續傳上次中斷的收集：略過已完成的專案，未完成的專案從上次的分頁繼續")
+                self._restore_commit_stats()
+                return
+            if previous is None:
+                print("ℹ️ 沒有可續傳的收集，開始新的收集")
+            else:
+                print(f"⚠️ 上次收集的參數不同，無法續傳，開始新的收集（上次: {previous}）")
+
+        self._recover_parts()
+        self.sync_state.start_run(params)
+
     # ==================== 完整數據收集 ====================
 
     def collect_all(
@@ -464,14 +913,23 @@ class GitLabAPICollector:
         project_ids: Optional[List[int]] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        resume: bool = False,
     ) -> Dict[str, pd.DataFrame]:
         """
         收集所有數據（專案、MR、Comments、Commits）
 
+        以有上限的執行緒池平行處理多個專案；每一頁數據都立即寫入專案分片並記錄檢查點
+        （output/raw/collection_state.db），全部完成後再合併為完整數據集。
+        有專案失敗時仍會合併已收集的數據，但保留分片與檢查點，可以 resume=True 重新執行
+        只補收未完成的專案。
+
         Args:
             project_ids: 專案 ID 列表，None 表示所有專案
             start_date: 開始日期
             end_date: 結束日期
+            max_workers: 同時處理的專案數，預設為 API_MAX_WORKERS
+            resume: 續傳上次中斷的收集（參數需相同）：略過已完成的專案，未完成的專案從上次的分頁繼續
 
         Returns:
             包含所有數據的字典
@@ -483,28 +941,56 @@ class GitLabAPICollector:
         results = {}
 
         # 1. 收集專案列表
+        run_params = {
+            "project_ids": sorted(project_ids) if project_ids is not None else None,
+            "start_date": start_date,
+            "end_date": end_date,
+            "incremental": self.incremental,
+        }
         if project_ids is None:
             projects_df = self.collect_projects()
             project_ids = projects_df["project_id"].tolist()
             results["projects"] = projects_df
 
-        # 2. 收集 Merge Requests
-        results["merge_requests"] = self.collect_merge_requests(
-            project_ids=project_ids, start_date=start_date, end_date=end_date
-        )
-
-        # 3. 收集 Review Comments
-        results["review_comments"] = self.collect_review_comments(
-            project_ids=project_ids, start_date=start_date, end_date=end_date
-        )
-
-        # 4. 收集 Commits
-        results["commits"] = self.collect_commits(
-            project_ids=project_ids, start_date=start_date, end_date=end_date
-        )
+        self._prepare_checkpoints(run_params, resume)
+
+        pending = [project_id for project_id in project_ids if not self._project_done(project_id)]
+        if len(pending) < len(project_ids):
+            print(f"   略過 {len(project_ids) - len(pending)} 個已完成的專案")
+
+        # 2. 平行收集各專案的 Commits、MR、Review Comments
+        workers = max(1, min(max_workers or self.config.api_max_workers, len(pending) or 1))
+        print(f"\n🔍 收集 {len(pending)} 個專案的 Commits、MR、Review Comments（{workers} 個執行緒）...")
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._collect_project, project_id, start_date, end_date): project_id
+                for project_id in pending
+            }
+            for future in tqdm(as_completed(futures), total=len(futures), desc="處理專案"):
+                project_id = futures[future]
+                try:
+                    future.result()
+                except gitlab.exceptions.GitlabGetError as e:
+                    print(f"⚠️ 無法存取專案 {project_id}: {e}")
+                except Exception as e:
+                    print(f"⚠️ 處理專案 {project_id} 時發生錯誤: {e}")
+                    failed.append(project_id)
+
+        # 3. 合併專案分片（全部完成才清除分片與檢查點）
+        for key, (name, keys) in zip(["commits", "merge_requests", "review_comments"], PART_DATASETS):
+            results[key] = self._merge_parts(name, keys, cleanup=not failed)
+            print(f"✅ 已儲存: {self.store.path(name)} (共 {len(results[key])} 筆)")
+
+        if failed:
+            print(f"\n⚠️ {len(failed)} 個專案未完成: {failed}")
+            print("   已保留分片與檢查點，可加上 --resume 重新執行以補收未完成的專案")
+        else:
+            self.sync_state.finish_run()
 
         print("\n" + "=" * 60)
-        print("✅ 所有數據收集完成！")
+        print("⚠️ 數據收集結束（部分專案未完成）" if failed else "✅ 所有數據收集完成！")
         print("=" * 60)
         print(f"專案數量: {len(results.get('projects', []))}")
         print(f"MR 數量: {len(results['merge_requests'])}")
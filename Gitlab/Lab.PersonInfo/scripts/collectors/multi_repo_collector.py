@@ -0,0 +1,265 @@
+"""
+多 Repository 本地數據收集器
+
+平行掃描多個本地 Git Repository（每個 Repository 由一個行程以 GitLocalCollector 單次掃描），
+為每筆數據標記來源 Repository，並合併為 DataMerger 讀取的標準 git_* 表格。
+總耗時取決於最大的 Repository，而非所有 Repository 的總和。
+
+各行程將明細分塊寫入暫存分段表格，只回傳彙總；主行程再逐塊串接分段表格，
+任何階段都不會在記憶體中組出完整的 Commits 或檔案變更。
+"""
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from collectors.chunked_writer import ChunkedTableWriter, iter_table_chunks
+from collectors.git_local_collector import (
+    HISTORY_TABLES,
+    WRITE_CHUNK_SIZE,
+    GitLocalCollector,
+)
+from storage.table_store import get_table_store
+
+# 各 Repository 分段表格的暫存目錄（位於輸出目錄下，合併完成後刪除）
+PARTS_DIR_NAME = "_git_parts"
+
+
+def discover_repos(source: str) -> List[Path]:
+    """
+    解析 Repository 來源
+
+    Args:
+        source: 包含多個 clone 的目錄（取其下一層的 Git Repository），
+                或清單檔（每行一個路徑，# 開頭為註解，相對路徑以清單檔所在目錄為基準）
+
+    Returns:
+        Repository 路徑列表
+
+    Raises:
+        ValueError: 來源不存在
+    """
+    source_path = Path(source)
+
+    if source_path.is_file():
+        repos = []
+        for line in source_path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            repo_path = Path(line).expanduser()
+            if not repo_path.is_absolute():
+                repo_path = source_path.parent / repo_path
+            repos.append(repo_path.resolve())
+        return repos
+
+    if source_path.is_dir():
+        if (source_path / ".git").exists():
+            return [source_path.resolve()]
+        return sorted(
+            child.resolve()
+            for child in source_path.iterdir()
+            if child.is_dir() and (child / ".git").exists()
+        )
+
+    raise ValueError(f"找不到 Repository 來源: {source}")
+
+
+def _extract_repo(
+    repo_path: str,
+    repo_name: str,
+    part_dir: str,
+    author: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+) -> Dict:
+    """在子行程中單次掃描一個 Repository，明細寫入 part_dir，並為每筆數據標記 repo 欄位"""
+    collector = GitLocalCollector(repo_path, output_dir=part_dir)
+    results = collector.extract_history(
+        author=author,
+        since=since,
+        until=until,
+        progress=False,
+        extra_columns={"repo": repo_name},
+    )
+    results["developers"].insert(0, "repo", repo_name)
+    return results
+
+
+class MultiRepoCollector:
+    """多 Repository 平行收集器"""
+
+    def __init__(
+        self,
+        repo_paths: List[Path],
+        output_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        初始化收集器
+
+        Args:
+            repo_paths: Repository 路徑列表（可用 discover_repos 取得）
+            output_dir: 輸出目錄路徑，預設為 scripts/output/raw/
+            max_workers: 平行行程數，預設為 CPU 核心數
+        """
+        self.repo_paths = [Path(path) for path in repo_paths]
+        if not self.repo_paths:
+            raise ValueError("沒有可收集的 Repository")
+
+        if output_dir:
+            self.output_dir = Path(output_dir)
+        else:
+            self.output_dir = Path(__file__).parent.parent / "output" / "raw"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.store = get_table_store(self.output_dir)
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.repo_names = self._assign_repo_names(self.repo_paths)
+
+    @staticmethod
+    def _assign_repo_names(repo_paths: List[Path]) -> Dict[Path, str]:
+        """以目錄名稱識別 Repository；名稱重複時改用 上層目錄/名稱"""
+        names = [path.name for path in repo_paths]
+        return {
+            path: path.name if names.count(path.name) == 1 else f"{path.parent.name}/{path.name}"
+            for path in repo_paths
+        }
+
+    def collect_all(
+        self,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict:
+        """
+        平行收集所有 Repository 並合併
+
+        Args:
+            author: 作者名稱或 Email
+            since: 開始日期
+            until: 結束日期
+
+        Returns:
+            合併後的結果（developers、message_analysis、counts、paths，鍵同 GitLocalCollector.collect_all）
+        """
+        workers = min(self.max_workers, len(self.repo_paths))
+        print("=" * 60)
+        print(f"開始收集 {len(self.repo_paths)} 個本地 Git Repository（{workers} 個行程）")
+        print("=" * 60)
+
+        parts_dir = self.output_dir / PARTS_DIR_NAME
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+        per_repo = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _extract_repo,
+                    str(path),
+                    self.repo_names[path],
+                    str(parts_dir / str(index)),
+                    author,
+                    since,
+                    until,
+                ): path
+                for index, path in enumerate(self.repo_paths)
+            }
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                path = futures[future]
+                name = self.repo_names[path]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"⚠️ [{done}/{len(futures)}] 收集 {name} 失敗: {e}")
+                    continue
+
+                per_repo.append(results)
+                print(
+                    f"   [{done}/{len(futures)}] {name}: "
+                    f"{results['counts']['commits']} commits, "
+                    f"{results['counts']['file_changes']} 檔案變更"
+                )
+
+        try:
+            merged = self._merge_results(per_repo)
+            self._save(merged)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        GitLocalCollector.print_message_analysis(merged["message_analysis"])
+
+        print("\n" + "=" * 60)
+        print("✅ 所有本地 Git 數據收集完成！")
+        print("=" * 60)
+        print(f"Repository 數量: {len(per_repo)}")
+        print(f"開發者數量: {len(merged['developers'])}")
+        print(f"Commits 數量: {merged['counts']['commits']}")
+        print(f"檔案變更記錄: {merged['counts']['file_changes']}")
+        print("=" * 60)
+
+        return merged
+
+    def _merge_results(self, per_repo: List[Dict]) -> Dict:
+        """
+        合併各 Repository 的結果
+
+        明細表格逐塊串接到標準 git_* 表格；開發者與 Message 分析跨 Repository 彙總。
+        """
+        counts = {}
+        paths = {}
+        for key, (name, columns) in HISTORY_TABLES.items():
+            output_file = self.store.path(name)
+            with ChunkedTableWriter(
+                output_file, chunk_size=WRITE_CHUNK_SIZE, columns=["repo"] + columns
+            ) as writer:
+                for results in per_repo:
+                    part_file = results["paths"][key]
+                    if not Path(part_file).exists():
+                        continue
+                    for chunk in iter_table_chunks(part_file, chunk_size=WRITE_CHUNK_SIZE):
+                        writer.write_frame(chunk)
+            counts[key] = writer.rows_written
+            paths[key] = output_file
+
+        frames = [results["developers"] for results in per_repo if not results["developers"].empty]
+        developers = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not developers.empty:
+            developers = (
+                developers.groupby(["name", "email"], as_index=False)["commit_count"]
+                .sum()
+                .sort_values("commit_count", ascending=False)
+            )
+
+        analyses = [results["message_analysis"] for results in per_repo]
+        total = sum(analysis["total"] for analysis in analyses)
+        message_analysis = {"total": total}
+        if total:
+            conventional_count = sum(a.get("conventional_count", 0) for a in analyses)
+            fix_count = sum(a.get("fix_count", 0) for a in analyses)
+            message_analysis.update(
+                {
+                    "conventional_count": conventional_count,
+                    "conventional_rate": conventional_count / total,
+                    "fix_count": fix_count,
+                    "fix_rate": fix_count / total,
+                }
+            )
+
+        return {
+            "developers": developers,
+            "message_analysis": message_analysis,
+            "counts": counts,
+            "paths": paths,
+        }
+
+    def _save(self, merged: Dict) -> None:
+        """儲存開發者表格（明細表格已於合併時寫入）"""
+        output_file = self.store.write("git_developers", merged["developers"])
+        print(f"✅ 已儲存: {output_file} (共 {len(merged['developers'])} 筆)")
+        for key in HISTORY_TABLES:
+            print(f"✅ 已儲存: {merged['paths'][key]} (共 {merged['counts'][key]} 筆)")
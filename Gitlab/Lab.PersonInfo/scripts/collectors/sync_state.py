@@ -0,0 +1,238 @@
+"""
+數據收集狀態儲存
+
+以 SQLite 記錄每個專案、每種資源的同步水位（high-watermark），
+讓增量模式只抓取上次收集之後新增或更新的數據；
+並記錄收集中的分頁檢查點，讓中斷的收集可以從上次完成的分頁繼續（--resume）。
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class SyncStateStore:
+    """同步狀態儲存（預設位於 output/raw/collection_state.db）"""
+
+    def __init__(self, state_dir: Path):
+        """
+        初始化狀態儲存
+
+        Args:
+            state_dir: 狀態資料庫所在目錄
+        """
+        self.db_path = Path(state_dir) / "collection_state.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS watermarks (
+                project_id INTEGER NOT NULL,
+                resource TEXT NOT NULL,
+                watermark TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, resource)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                project_id INTEGER NOT NULL,
+                resource TEXT NOT NULL,
+                next_page INTEGER NOT NULL,
+                done INTEGER NOT NULL,
+                watermark TEXT,
+                updated_at TEXT NOT NULL,
+                cursor TEXT,
+                PRIMARY KEY (project_id, resource)
+            )
+            """
+        )
+        # 舊版資料庫的檢查點沒有 cursor 欄位
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(checkpoints)")]
+        if "cursor" not in columns:
+            self._conn.execute("ALTER TABLE checkpoints ADD COLUMN cursor TEXT")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_run (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                params TEXT NOT NULL,
+                started_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ==================== 同步水位 ====================
+
+    def get_watermark(self, project_id: int, resource: str) -> Optional[str]:
+        """
+        取得同步水位
+
+        Args:
+            project_id: 專案 ID
+            resource: 資源類型 ('commits', 'merge_requests', 'review_comments')
+
+        Returns:
+            ISO 8601 (UTC) 時間字串，尚未同步過則為 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM watermarks WHERE project_id = ? AND resource = ?",
+                (int(project_id), resource),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, project_id: int, resource: str, watermark: str) -> None:
+        """
+        更新同步水位（只會往後推進，不會倒退）
+
+        比較與寫入在同一個 SQL 陳述式中完成，平行寫入時較舊的水位不會覆蓋較新的水位。
+        水位皆為 to_utc_iso 正規化後的字串，可直接以字串比較先後。
+
+        Args:
+            project_id: 專案 ID
+            resource: 資源類型
+            watermark: 時間字串（任意 ISO 8601 格式，會正規化為 UTC）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watermarks VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (project_id, resource) DO UPDATE"
+                " SET watermark = excluded.watermark, updated_at = excluded.updated_at"
+                " WHERE excluded.watermark > watermarks.watermark",
+                (
+                    int(project_id),
+                    resource,
+                    to_utc_iso(watermark),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._conn.commit()
+
+    # ==================== 收集檢查點 ====================
+
+    def get_checkpoint(self, project_id: int, resource: str) -> Optional[Dict]:
+        """
+        取得分頁檢查點
+
+        Args:
+            project_id: 專案 ID
+            resource: 資源類型 ('commits', 'merge_requests')
+
+        Returns:
+            {'next_page', 'done', 'watermark', 'cursor'}，尚無檢查點則為 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_page, done, watermark, cursor FROM checkpoints"
+                " WHERE project_id = ? AND resource = ?",
+                (int(project_id), resource),
+            ).fetchone()
+        if not row:
+            return None
+        return {"next_page": row[0], "done": bool(row[1]), "watermark": row[2], "cursor": row[3]}
+
+    def save_checkpoint(
+        self,
+        project_id: int,
+        resource: str,
+        next_page: int,
+        done: bool = False,
+        watermark: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> None:
+        """
+        記錄分頁檢查點（該分頁的數據寫入分片後才呼叫）
+
+        Args:
+            project_id: 專案 ID
+            resource: 資源類型
+            next_page: 下一個要抓取的分頁
+            done: 此資源是否已全部收集完成
+            watermark: 目前已抓到的最新時間，資源完成後用於推進同步水位
+            cursor: 續傳游標（以時間篩選接續的列表，記錄已抓到的最舊時間）
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints"
+                " (project_id, resource, next_page, done, watermark, updated_at, cursor)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    int(project_id),
+                    resource,
+                    int(next_page),
+                    int(done),
+                    watermark,
+                    datetime.now(timezone.utc).isoformat(),
+                    cursor,
+                ),
+            )
+            self._conn.commit()
+
+    def get_run_params(self) -> Optional[Dict]:
+        """取得目前檢查點所屬收集的參數，沒有進行中的收集則為 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT params FROM checkpoint_run WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def start_run(self, params: Dict) -> None:
+        """
+        開始新的收集：清除所有檢查點並記錄本次收集的參數
+
+        Args:
+            params: 收集參數（日期範圍等），續傳時用於確認是同一次收集
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_run VALUES (1, ?, ?)",
+                (json.dumps(params, sort_keys=True), datetime.now(timezone.utc).isoformat()),
+            )
+            self._conn.commit()
+
+    def finish_run(self) -> None:
+        """收集完成（分片已合併）後清除檢查點"""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.execute("DELETE FROM checkpoint_run")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """關閉資料庫連線"""
+        with self._lock:
+            self._conn.close()
+
+
+def to_utc_iso(value: str) -> str:
+    """將 GitLab 回傳的時間字串正規化為 UTC ISO 8601"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo:
+        timestamp = timestamp.tz_convert("UTC")
+    else:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.isoformat()
+
+
+def resolve_since(start_date: Optional[str], watermark: Optional[str]) -> Optional[str]:
+    """
+    決定增量查詢的起始時間：取開始日期與同步水位中較晚者
+
+    Args:
+        start_date: 使用者指定的開始日期
+        watermark: 同步水位
+
+    Returns:
+        查詢起始時間
+    """
+    if not watermark:
+        return start_date
+    if not start_date:
+        return watermark
+    return watermark if pd.Timestamp(watermark) > pd.Timestamp(to_utc_iso(start_date)) else start_date
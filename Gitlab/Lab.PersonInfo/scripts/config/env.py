@@ -0,0 +1,24 @@
+"""
+環境變數載入模組
+
+從專案根目錄的 .env 載入環境變數；各進入點（main.py、collect_data.py）啟動時呼叫，
+讓 STORAGE_FORMAT 等在 GitLab 連線以外讀取的設定也能使用 .env。
+"""
+
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+# 專案根目錄的 .env
+ENV_PATH = Path(__file__).parent.parent.parent / ".env"
+
+
+def load_env() -> bool:
+    """
+    載入 .env（已存在的環境變數不會被覆寫）
+
+    Returns:
+        是否找到並載入 .env
+    """
+    return load_dotenv(dotenv_path=ENV_PATH)
@@ -7,10 +7,11 @@ GitLab 連線配置模組
 import os
 import sys
 import time
-from pathlib import Path
 from typing import Optional
 import gitlab
-from dotenv import load_dotenv
+
+from config.env import load_env
+from config.rate_limiter import RateLimiter, RateLimitedAdapter
 
 
 class GitLabConfig:
@@ -19,8 +20,7 @@ class GitLabConfig:
     def __init__(self):
         """初始化配置，載入環境變數"""
         # 載入 .env 檔案
-        env_path = Path(__file__).parent.parent.parent / ".env"
-        load_dotenv(dotenv_path=env_path)
+        load_env()
 
         # GitLab 連線設定
         self.gitlab_url = os.getenv("GITLAB_URL", "https://gitlab.com")
@@ -30,6 +30,14 @@ class GitLabConfig:
         self.api_request_delay = float(os.getenv("API_REQUEST_DELAY", "0.3"))
         self.api_max_retries = int(os.getenv("API_MAX_RETRIES", "3"))
         self.api_timeout = int(os.getenv("API_TIMEOUT", "30"))
+        self.api_max_workers = int(os.getenv("API_MAX_WORKERS", "4"))
+
+        # 請求節流：預設不限速，只依伺服器的 RateLimit / Retry-After 標頭調整；
+        # 設定 API_RATE_LIMIT 時以該速率為初始速率
+        rate_limit = os.getenv("API_RATE_LIMIT")
+        self.api_rate_limit = float(rate_limit) if rate_limit else None
+        self.api_rate_burst = int(os.getenv("API_RATE_BURST", "10"))
+        self.rate_limiter = RateLimiter(rate=self.api_rate_limit, burst=self.api_rate_burst)
 
         # 驗證必要設定
         self._validate_config()
@@ -72,6 +80,14 @@ class GitLabConfig:
                     timeout=self.api_timeout,
                 )
 
+                # 所有 API 呼叫（包含自動分頁）共用同一個節流器
+                # 連線池至少容納所有平行收集的執行緒
+                adapter = RateLimitedAdapter(
+                    self.rate_limiter, pool_maxsize=max(10, self.api_max_workers)
+                )
+                self._gl_client.session.mount("https://", adapter)
+                self._gl_client.session.mount("http://", adapter)
+
                 # 驗證 Token 是否有效
                 self._gl_client.auth()
                 current_user = self._gl_client.user
@@ -115,7 +131,11 @@ class GitLabConfig:
             return False
 
     def rate_limit_wait(self) -> None:
-        """API 請求節流：在每次請求後等待，避免觸發 Rate Limiting"""
+        """
+        固定等待 API_REQUEST_DELAY 秒（保留供相容）
+
+        經由 get_client() 發出的請求已在傳輸層由 rate_limiter 節流，不需再呼叫此方法。
+        """
         time.sleep(self.api_request_delay)
 
     def get_projects(
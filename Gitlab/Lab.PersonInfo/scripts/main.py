@@ -8,20 +8,22 @@ GitLab 開發者分析系統主程式
 
     # 批次分析所有開發者
     uv run python scripts/main.py analyze-all --from 2024-01-01 --to 2024-12-31
+
+    # 同時寫出中間表格（供除錯或個別分析器重跑）
+    uv run python scripts/main.py analyze-all --persist-intermediates
+
+    # 另以 tracemalloc 記錄各階段 Python 配置的記憶體峰值（較慢；RSS 峰值預設即會記錄）
+    uv run python scripts/main.py analyze-all --trace-memory
 """
 
 import click
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# 收集器
-from collectors.data_merger import DataMerger
+from config.env import load_env
 
-# 分析器
-from analyzers.commit_analyzer import CommitQualityAnalyzer
-from analyzers.contribution_analyzer import ContributionAnalyzer
-from analyzers.tech_breadth_analyzer import TechBreadthAnalyzer
-from analyzers.score_calculator import ScoreCalculator
+# 分析管線（數據合併 → 各維度分析 → 綜合評分）
+from analyzers.pipeline import AnalysisPipeline
 
 
 @click.group()
@@ -47,7 +49,30 @@ def analyze(user: str, start_date: str, end_date: str):
 @cli.command()
 @click.option("--from", "start_date", type=str, default=None, help="開始日期 (YYYY-MM-DD)")
 @click.option("--to", "end_date", type=str, default=None, help="結束日期 (YYYY-MM-DD)")
-def analyze_all(start_date: str, end_date: str):
+@click.option(
+    "--persist-intermediates",
+    is_flag=True,
+    default=False,
+    help="寫出中間表格（合併後數據、各維度評分），預設只在記憶體中傳遞",
+)
+@click.option(
+    "--trace-memory/--no-trace-memory",
+    default=False,
+    help="另以 tracemalloc 記錄各階段記憶體峰值（預設只記錄 RSS 峰值，開啟後執行明顯變慢）",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="各維度分析的平行行程數（預設為 CPU 核心數，1 表示依序執行）",
+)
+def analyze_all(
+    start_date: str,
+    end_date: str,
+    persist_intermediates: bool,
+    trace_memory: bool,
+    workers: int,
+):
     """批次分析所有開發者"""
     print("=" * 60)
     print("GitLab 開發者分析系統")
@@ -56,46 +81,30 @@ def analyze_all(start_date: str, end_date: str):
     if start_date:
         print(f"時間範圍: {start_date} ~ {end_date or '現在'}")
 
-    # 步驟 1: 數據合併與清洗
-    print("\n📦 步驟 1: 數據合併與清洗")
-    merger = DataMerger()
-    merger.process_all()
-
-    # 步驟 2: 執行各項分析
-    print("\n📊 步驟 2: 執行分析")
-
-    print("\n2.1 Commit 品質分析 (23% 權重)")
-    commit_analyzer = CommitQualityAnalyzer()
-    commit_analyzer.analyze_all_developers()
-
-    print("\n2.2 程式碼貢獻量分析 (12% 權重)")
-    contribution_analyzer = ContributionAnalyzer()
-    contribution_analyzer.analyze_all_developers()
-
-    print("\n2.3 技術廣度分析 (18% 權重)")
-    tech_analyzer = TechBreadthAnalyzer()
-    tech_analyzer.analyze_all_developers()
-
-    # 步驟 3: 計算綜合評分
-    print("\n🎯 步驟 3: 計算綜合評分")
-    calculator = ScoreCalculator()
-    results = calculator.calculate_final_scores()
+    # 合併、分析、評分之間以記憶體傳遞 DataFrame；各維度分析平行執行
+    pipeline = AnalysisPipeline(
+        persist_intermediates=persist_intermediates,
+        trace_memory=trace_memory,
+        max_workers=workers,
+    )
+    outputs = pipeline.run()
+    results = outputs["final_scores"]
 
     # 顯示結果
     print("\n" + "=" * 60)
     print("✅ 分析完成！")
     print("=" * 60)
 
+    pipeline.print_stage_report()
+
     if len(results) > 0:
         print("\n🏆 前 10 位開發者：")
         print(results.head(10)[["name", "email", "final_score", "grade"]].to_string(index=False))
 
         output_dir = Path(__file__).parent / "output" / "processed"
         print(f"\n📁 詳細報告已儲存至: {output_dir}")
-        print(f"   - final_scores.csv")
-        print(f"   - commit_quality_scores.csv")
-        print(f"   - contribution_scores.csv")
-        print(f"   - tech_breadth_scores.csv")
+        for report_file in pipeline.report_files:
+            print(f"   - {report_file.name}")
 
 
 @cli.command()
@@ -107,4 +116,5 @@ def team_report(start_date: str, end_date: str):
 
 
 if __name__ == "__main__":
+    load_env()
     cli()
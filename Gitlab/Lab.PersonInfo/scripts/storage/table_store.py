@@ -0,0 +1,170 @@
+"""
+表格儲存後端
+
+各階段（收集、合併、分析、評分）之間的中間數據以表格名稱存取，不直接綁定檔案格式：
+- ParquetTableStore：預設格式，保留欄位型別、壓縮儲存，讀取時只載入需要的欄位
+- CsvTableStore：utf-8-sig CSV，供相容舊流程或作為最終匯出
+
+透過環境變數 STORAGE_FORMAT（parquet 或 csv）切換；未安裝 pyarrow 時自動使用 CSV。
+"""
+
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+
+class TableStore(ABC):
+    """表格儲存後端基底類別"""
+
+    extension: str = ""
+
+    def __init__(self, base_dir: Path):
+        """
+        初始化儲存後端
+
+        Args:
+            base_dir: 表格檔案所在目錄
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name: str) -> Path:
+        """取得表格檔案路徑（name 不含副檔名，例如 all_commits_merged）"""
+        return self.base_dir / f"{name}{self.extension}"
+
+    def exists(self, name: str) -> bool:
+        """表格是否存在"""
+        return self.path(name).exists()
+
+    @abstractmethod
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        讀取表格
+
+        Args:
+            name: 表格名稱
+            columns: 只讀取這些欄位（不存在的欄位略過），None 表示全部
+
+        Returns:
+            DataFrame
+        """
+
+    @abstractmethod
+    def write(self, name: str, df: pd.DataFrame) -> Path:
+        """
+        寫入表格（覆寫）
+
+        Args:
+            name: 表格名稱
+            df: 要寫入的 DataFrame
+
+        Returns:
+            寫入的檔案路徑
+        """
+
+    def export_csv(self, name: str, output_dir: Optional[Path] = None) -> Path:
+        """
+        將表格匯出為 utf-8-sig CSV（最終報表使用）
+
+        Args:
+            name: 表格名稱
+            output_dir: 匯出目錄，預設與表格相同
+
+        Returns:
+            CSV 檔案路徑
+        """
+        output_file = Path(output_dir or self.base_dir) / f"{name}.csv"
+        if output_file != self.path(name):
+            self.read(name).to_csv(output_file, index=False, encoding="utf-8-sig")
+        return output_file
+
+
+class CsvTableStore(TableStore):
+    """utf-8-sig CSV 儲存"""
+
+    extension = ".csv"
+
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return _read_csv(self.path(name), columns)
+
+    def write(self, name: str, df: pd.DataFrame) -> Path:
+        output_file = self.path(name)
+        df.to_csv(output_file, index=False, encoding="utf-8-sig")
+        return output_file
+
+
+class ParquetTableStore(TableStore):
+    """Parquet 儲存（需安裝 pyarrow）"""
+
+    extension = ".parquet"
+
+    def exists(self, name: str) -> bool:
+        # 沿用舊流程產生的 CSV
+        return self.path(name).exists() or self._csv_path(name).exists()
+
+    def read(self, name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        input_file = self.path(name)
+        if not input_file.exists() and self._csv_path(name).exists():
+            return _read_csv(self._csv_path(name), columns)
+
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            available = set(pq.read_schema(input_file).names)
+            columns = [column for column in columns if column in available]
+        return pd.read_parquet(input_file, columns=columns)
+
+    def write(self, name: str, df: pd.DataFrame) -> Path:
+        import pyarrow as pa
+
+        output_file = self.path(name)
+        try:
+            df.to_parquet(output_file, index=False, compression="zstd")
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 混合型別的欄位（例如同時有數字與字串）以字串儲存
+            df = df.copy()
+            for column in df.columns[df.dtypes == object]:
+                df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+            df.to_parquet(output_file, index=False, compression="zstd")
+        return output_file
+
+    def _csv_path(self, name: str) -> Path:
+        return self.base_dir / f"{name}.csv"
+
+
+def _read_csv(input_file: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """讀取 CSV；指定欄位時只解析存在的欄位"""
+    if columns is None:
+        return pd.read_csv(input_file)
+    wanted = set(columns)
+    return pd.read_csv(input_file, usecols=lambda column: column in wanted)
+
+
+def get_table_store(base_dir: Path, storage_format: Optional[str] = None) -> TableStore:
+    """
+    依設定建立儲存後端
+
+    Args:
+        base_dir: 表格檔案所在目錄
+        storage_format: 'parquet' 或 'csv'，預設讀取環境變數 STORAGE_FORMAT（預設 parquet）
+
+    Returns:
+        TableStore
+    """
+    storage_format = (storage_format or os.getenv("STORAGE_FORMAT", "parquet")).lower()
+
+    if storage_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("⚠️ 未安裝 pyarrow，改用 CSV 儲存中間數據")
+            return CsvTableStore(base_dir)
+        return ParquetTableStore(base_dir)
+
+    if storage_format == "csv":
+        return CsvTableStore(base_dir)
+
+    raise ValueError(f"不支援的儲存格式: {storage_format}（可用: parquet, csv）")
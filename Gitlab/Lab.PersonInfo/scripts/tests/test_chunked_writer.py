@@ -0,0 +1,73 @@
+"""
+分塊表格寫入測試（ChunkedTableWriter 跨分塊放寬 Parquet 欄位型別）
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from collectors.chunked_writer import ChunkedTableWriter, iter_table_chunks
+
+
+def _write_chunks(output_file, chunks):
+    with ChunkedTableWriter(output_file, chunk_size=2) as writer:
+        for rows in chunks:
+            writer.write_many(rows)
+    return writer
+
+
+def test_parquet_widens_null_and_int_columns(tmp_path):
+    output_file = tmp_path / "commits.parquet"
+
+    writer = _write_chunks(
+        output_file,
+        [
+            # 第一個分塊：branch 全為空值、total 為整數
+            [{"sha": "a", "branch": None, "total": 1}, {"sha": "b", "branch": None, "total": 2}],
+            [{"sha": "c", "branch": "main", "total": 2.5}, {"sha": "d", "branch": None, "total": 3}],
+        ],
+    )
+
+    assert writer.rows_written == 4
+    schema = pq.read_schema(output_file)
+    assert pa.types.is_string(schema.field("branch").type) or pa.types.is_large_string(
+        schema.field("branch").type
+    )
+    assert pa.types.is_floating(schema.field("total").type)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    df = pd.read_parquet(output_file)
+    assert df["sha"].tolist() == ["a", "b", "c", "d"]
+    assert df["branch"].tolist()[2] == "main"
+    assert df["branch"].isna().tolist() == [True, True, False, True]
+    assert df["total"].tolist() == [1.0, 2.0, 2.5, 3.0]
+
+
+def test_parquet_incompatible_columns_fall_back_to_string(tmp_path):
+    output_file = tmp_path / "file_changes.parquet"
+
+    _write_chunks(
+        output_file,
+        [
+            [{"file": "a.py", "size": 10}, {"file": "b.py", "size": 20}],
+            [{"file": "c.py", "size": "binary"}, {"file": "d.py", "size": 30}],
+            # 分塊內混合型別
+            [{"file": "e.py", "size": 40}, {"file": "f.py", "size": "-"}],
+        ],
+    )
+
+    chunks = list(iter_table_chunks(output_file))
+    df = pd.concat(chunks, ignore_index=True)
+    assert df["size"].tolist() == ["10", "20", "binary", "30", "40", "-"]
+
+
+def test_parquet_lossy_widening_raises(tmp_path):
+    output_file = tmp_path / "big.parquet"
+
+    writer = ChunkedTableWriter(output_file)
+    writer.write_frame(pd.DataFrame({"value": [2**53 + 1]}))
+    # 超過 2**53 的整數轉為浮點數會失真，不會默默轉換
+    with pytest.raises(ValueError, match="失真"):
+        writer.write_frame(pd.DataFrame({"value": [0.5]}))
+    writer.close()
@@ -0,0 +1,112 @@
+"""
+Commit 品質評分測試（CommitQualityAnalyzer 向量化評分）
+"""
+
+import pandas as pd
+import pytest
+
+from analyzers.commit_analyzer import RESULT_COLUMNS, CommitQualityAnalyzer
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return CommitQualityAnalyzer(input_dir=str(tmp_path), output_dir=str(tmp_path), persist=False)
+
+
+@pytest.fixture
+def commits_df():
+    return pd.DataFrame(
+        [
+            # dev@example.com：email 大小寫不同仍視為同一人
+            {"author_email": "dev@example.com", "title": "feat: add x", "message": "", "total": 50},
+            {"author_email": "Dev@Example.com", "title": "fix: bug y", "message": None, "total": 200},
+            {"author_email": "dev@example.com", "title": "update stuff", "message": "", "total": 600},
+            {"author_email": "DEV@example.com", "title": "Refactor", "message": "", "total": None},
+            # other@example.com：中文修復關鍵字出現在 message
+            {"author_email": "other@example.com", "title": "調整設定", "message": "修正 typo", "total": 10},
+        ]
+    )
+
+
+def test_annotate_commits_flags(commits_df):
+    annotated = CommitQualityAnalyzer._annotate_commits(commits_df)
+
+    assert annotated["email_key"].tolist() == ["dev@example.com"] * 4 + ["other@example.com"]
+    assert annotated["is_conventional"].tolist() == [True, True, False, False, False]
+    assert annotated["is_small"].tolist() == [True, False, False, False, True]
+    assert annotated["is_medium"].tolist() == [False, True, False, False, False]
+    # 變更行數為空值時歸為大型
+    assert annotated["is_large"].tolist() == [False, False, True, True, False]
+    assert annotated["is_fix"].tolist() == [False, True, False, False, True]
+
+
+def test_score_developers(analyzer, commits_df):
+    scores = analyzer.score_developers(commits_df)
+
+    assert list(scores.columns) == RESULT_COLUMNS
+    assert sorted(scores.index) == ["dev@example.com", "other@example.com"]
+
+    dev = scores.loc["dev@example.com"]
+    assert dev["total_commits"] == 4
+    assert dev["conventional_count"] == 2
+    assert (dev["small_changes"], dev["medium_changes"], dev["large_changes"]) == (1, 1, 2)
+    assert dev["fix_count"] == 1
+    assert dev["conventional_rate"] == pytest.approx(0.5)
+    assert dev["small_rate"] == pytest.approx(0.25)
+    assert dev["fix_rate"] == pytest.approx(0.25)
+    # 各子分數落在門檻區間內的線性插值
+    assert dev["message_score"] == pytest.approx(6.0)
+    assert dev["size_score"] == pytest.approx(4.125)
+    assert dev["fix_score"] == pytest.approx(7 + 0.05 / 0.15 * 2)
+    assert dev["commit_quality_score"] == pytest.approx(
+        (dev["message_score"] + dev["size_score"] + dev["fix_score"]) / 3
+    )
+
+    other = scores.loc["other@example.com"]
+    assert other["total_commits"] == 1
+    assert other["message_score"] == pytest.approx(1.0)
+    assert other["size_score"] == pytest.approx(10.0)
+    assert other["fix_score"] == pytest.approx(1.0)
+
+
+def test_analyze_developer_matches_batch(analyzer, commits_df):
+    result = analyzer.analyze_developer("DEV@EXAMPLE.COM", commits_df)
+    batch = analyzer.score_developers(commits_df).loc["dev@example.com"]
+
+    assert result["email"] == "DEV@EXAMPLE.COM"
+    for column in RESULT_COLUMNS:
+        assert result[column] == pytest.approx(batch[column])
+
+
+def test_analyze_developer_without_commits(analyzer, commits_df):
+    result = analyzer.analyze_developer("nobody@example.com", commits_df)
+
+    assert result["email"] == "nobody@example.com"
+    assert result["total_commits"] == 0
+    assert result["commit_quality_score"] == 0
+
+
+def test_analyze_all_developers(analyzer, commits_df):
+    developers_df = pd.DataFrame(
+        [
+            {"email": "DEV@example.com", "username": "dev", "name": "Dev"},
+            {"email": "other@example.com", "username": "other", "name": "Other"},
+            {"email": "idle@example.com", "username": "idle", "name": "Idle"},
+        ]
+    )
+
+    df = analyzer.analyze_all_developers(commits_df=commits_df, developers_df=developers_df)
+
+    assert list(df.columns) == ["email"] + RESULT_COLUMNS + ["username", "name"]
+    assert df["commit_quality_score"].is_monotonic_decreasing
+
+    rows = df.set_index("email")
+    assert rows.loc["DEV@example.com", "total_commits"] == 4
+    assert rows.loc["other@example.com", "total_commits"] == 1
+
+    # 沒有 commit 的開發者保留 email，數量與分數為 0，明細留空
+    idle = rows.loc["idle@example.com"]
+    assert idle["total_commits"] == 0
+    assert idle["commit_quality_score"] == 0
+    assert pd.isna(idle["conventional_rate"])
+    assert idle["name"] == "Idle"
@@ -0,0 +1,146 @@
+"""
+開發者身份統一測試（DataMerger.unify_developers union-find 合併）
+"""
+
+import pandas as pd
+import pytest
+
+from collectors.data_merger import DataMerger, _IdentityUnion
+from storage.table_store import get_table_store
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    path = tmp_path / "raw"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def merger(tmp_path, raw_dir):
+    return DataMerger(input_dir=str(raw_dir), output_dir=str(tmp_path / "processed"), persist=False)
+
+
+def _write(raw_dir, name, rows):
+    get_table_store(raw_dir).write(name, pd.DataFrame(rows))
+
+
+def _by_email(df):
+    return df.set_index("email")
+
+
+def test_identity_union_links_records():
+    identities = _IdentityUnion()
+    identities.link({"email": "a@x.com", "username": "alice"})
+    identities.link({"email": "", "username": "alice", "name": "alice"})
+    identities.link({"email": "b@x.com", "username": "bob"})
+
+    assert identities.group_of("email", "a@x.com") == identities.group_of("name", "alice")
+    assert identities.group_of("email", "a@x.com") != identities.group_of("email", "b@x.com")
+    # 空值不建立節點
+    assert identities.group_of("email", "") == "email\x1f"
+
+
+def test_same_name_not_merged_by_default(merger, raw_dir):
+    _write(
+        raw_dir,
+        "git_developers",
+        [
+            {"email": "chen.a@x.com", "name": "Chen", "commit_count": 3},
+            {"email": "chen.b@x.com", "name": "chen", "commit_count": 5},
+        ],
+    )
+
+    df = merger.unify_developers()
+
+    assert sorted(df["email"]) == ["chen.a@x.com", "chen.b@x.com"]
+    assert (df["aliases"] == "").all()
+
+
+def test_merge_by_name_merges_same_name(merger, raw_dir):
+    _write(
+        raw_dir,
+        "git_developers",
+        [
+            {"email": "chen.a@x.com", "name": "Chen", "commit_count": 3},
+            {"email": "chen.b@x.com", "name": "chen", "commit_count": 5},
+        ],
+    )
+
+    df = merger.unify_developers(merge_by_name=True)
+
+    assert len(df) == 1
+    row = df.iloc[0]
+    # 代表 email 為 commit 數最多者
+    assert row["email"] == "chen.b@x.com"
+    assert row["aliases"] == "chen.a@x.com"
+    assert row["commit_count"] == 8
+
+
+def test_email_and_username_link_across_sources(merger, raw_dir):
+    _write(
+        raw_dir,
+        "git_developers",
+        [{"email": "Dev@X.com", "name": "Dev", "commit_count": 2}],
+    )
+    _write(
+        raw_dir,
+        "gitlab_merge_requests",
+        [{"author_email": "dev@x.com", "author_username": "dev", "author_name": "Dev"}],
+    )
+    _write(
+        raw_dir,
+        "gitlab_commits",
+        [
+            {"author_email": "dev@x.com", "author_name": "Dev"},
+            {"author_email": "dev@x.com", "author_name": "Dev"},
+        ],
+    )
+
+    df = merger.unify_developers()
+
+    assert len(df) == 1
+    row = df.iloc[0]
+    assert row["email"] == "dev@x.com"
+    assert row["username"] == "dev"
+    assert row["name"] == "Dev"
+    assert row["source"] == "git"
+    assert row["commit_count"] == 4
+
+
+def test_manual_mapping_is_transitive(merger, raw_dir):
+    _write(
+        raw_dir,
+        "git_developers",
+        [
+            {"email": "a@x.com", "name": "A", "commit_count": 9},
+            {"email": "b@x.com", "name": "B", "commit_count": 1},
+            {"email": "c@x.com", "name": "C", "commit_count": 1},
+            {"email": "other@x.com", "name": "Other", "commit_count": 1},
+        ],
+    )
+
+    df = merger.unify_developers(manual_mapping={"a@x.com": "B@x.com", "b@x.com": "c@x.com"})
+
+    rows = _by_email(df)
+    assert sorted(rows.index) == ["c@x.com", "other@x.com"]
+    # 手動映射目標優先於 commit 數
+    assert rows.loc["c@x.com", "aliases"] == "a@x.com;b@x.com"
+    assert rows.loc["c@x.com", "commit_count"] == 11
+
+
+def test_aliases_rewrite_author_email(merger, raw_dir):
+    _write(
+        raw_dir,
+        "git_developers",
+        [
+            {"email": "a@x.com", "name": "A", "commit_count": 1},
+            {"email": "a@home.com", "name": "A", "commit_count": 1},
+        ],
+    )
+    merger.unify_developers(manual_mapping={"a@home.com": "a@x.com"})
+
+    commits = pd.DataFrame({"author_email": ["A@Home.com", "a@x.com", "z@x.com"]})
+    result = merger._canonicalize_authors(commits)
+
+    assert result["author_email"].tolist() == ["a@x.com", "a@x.com", "z@x.com"]
@@ -0,0 +1,124 @@
+"""
+git log -z 記錄解析測試（GitLocalCollector._iter_commit_records / _iter_numstat_z）
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from collectors.git_local_collector import GitLocalCollector
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="需要 git")
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def _commit(repo, message, files):
+    """寫入檔案並提交（files 為 {路徑: 內容}，內容為 bytes 時寫入二進位）"""
+    for path, content in files.items():
+        target = repo / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            target.write_bytes(content)
+        else:
+            target.write_text(content, encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.name", "Dev | One")
+    _git(path, "config", "user.email", "dev@example.com")
+    return path
+
+
+def _records(repo):
+    collector = GitLocalCollector(str(repo), output_dir=str(repo.parent / "out"))
+    return list(collector._iter_commit_records())
+
+
+def test_subject_and_body_with_pipes(repo):
+    _commit(repo, "feat: a | b | c\n\nbody line | with pipe\n\nsecond paragraph", {"a.txt": "1\n2\n"})
+
+    [(commit, parents, files)] = _records(repo)
+
+    assert commit["title"] == "feat: a | b | c"
+    assert commit["author_name"] == "Dev | One"
+    assert commit["message"] == "feat: a | b | c\n\nbody line | with pipe\n\nsecond paragraph"
+    assert parents == []
+    assert files == [(2, 0, "a.txt", "")]
+    assert (commit["additions"], commit["deletions"], commit["changed_files"]) == (2, 0, 1)
+
+
+def test_paths_with_pipes_and_spaces(repo):
+    _commit(repo, "add files", {"docs/notes|1.md": "x\n", "src/my module/file.py": "y\nz\n"})
+
+    [(_, _, files)] = _records(repo)
+
+    assert sorted(files) == [(1, 0, "docs/notes|1.md", ""), (2, 0, "src/my module/file.py", "")]
+
+
+def test_rename_reports_old_and_new_path(repo):
+    _commit(repo, "add", {"old name.py": "".join(f"line {i}\n" for i in range(20))})
+    _git(repo, "mv", "old name.py", "new|name.py")
+    _commit(repo, "rename", {"new|name.py": "".join(f"line {i}\n" for i in range(20)) + "extra\n"})
+
+    rename, _ = _records(repo)
+    commit, _, files = rename
+
+    assert commit["title"] == "rename"
+    assert files == [(1, 0, "new|name.py", "old name.py")]
+
+
+def test_binary_file_counts_zero_lines(repo):
+    _commit(repo, "binary", {"image.bin": b"\x00\x01\x02\xff", "text.txt": "a\n"})
+
+    [(commit, _, files)] = _records(repo)
+
+    assert sorted(files) == [(0, 0, "image.bin", ""), (1, 0, "text.txt", "")]
+    assert commit["changed_files"] == 2
+    assert commit["additions"] == 1
+
+
+def test_merge_commit_has_two_parents_and_no_files(repo):
+    _commit(repo, "base", {"base.txt": "base\n"})
+    _git(repo, "checkout", "-q", "-b", "feature")
+    _commit(repo, "feature work", {"feature.txt": "f\n"})
+    _git(repo, "checkout", "-q", "main")
+    _commit(repo, "main work", {"main.txt": "m\n"})
+    _git(repo, "merge", "-q", "--no-ff", "-m", "Merge branch 'feature'", "feature")
+
+    records = _records(repo)
+    merges = [record for record in records if len(record[1]) > 1]
+
+    assert len(records) == 4
+    assert len(merges) == 1
+    merge, parents, files = merges[0]
+    assert merge["title"] == "Merge branch 'feature'"
+    assert len(parents) == 2
+    assert files == []
+    assert merge["changed_files"] == 0
+
+
+def test_numstat_z_parser_handles_rename_binary_and_newlines():
+    text = (
+        "\n3\t1\tsrc/a.py\x00"
+        "-\t-\tlogo.png\x00"
+        "0\t0\t\x00old|dir/b.py\x00new dir/b.py\x00"
+        "2\t0\tline\nbreak.txt\x00"
+    )
+
+    assert list(GitLocalCollector._iter_numstat_z(text)) == [
+        (3, 1, "src/a.py", ""),
+        (0, 0, "logo.png", ""),
+        (0, 0, "new dir/b.py", "old|dir/b.py"),
+        (2, 0, "line\nbreak.txt", ""),
+    ]
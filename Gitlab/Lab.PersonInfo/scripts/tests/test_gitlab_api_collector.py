@@ -0,0 +1,79 @@
+"""
+GitLab API 收集器續傳測試（GitLabAPICollector._collect_pages 檢查點與時間游標）
+"""
+
+import pandas as pd
+import pytest
+
+from collectors import gitlab_api_collector
+from collectors.gitlab_api_collector import GitLabAPICollector
+from collectors.sync_state import SyncStateStore
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setattr(gitlab_api_collector, "PAGE_SIZE", 3)
+    # 不建立 GitLab 連線，只測試分頁與檢查點
+    collector = object.__new__(GitLabAPICollector)
+    collector.sync_state = SyncStateStore(tmp_path)
+    yield collector
+    collector.sync_state.close()
+
+
+def _newest_first_lister(commits):
+    """模擬 Commits 列表：由新到舊，支援 until 篩選"""
+
+    def list_method(page, per_page, until=None, **params):
+        items = [c for c in commits if until is None or pd.Timestamp(c) <= pd.Timestamp(until)]
+        return items[(page - 1) * per_page : page * per_page]
+
+    return list_method
+
+
+def test_resume_with_time_cursor_skips_nothing(collector):
+    commits = [f"2024-01-{day:02d}T00:00:00Z" for day in range(20, 0, -1)]
+    pages = {}
+    interrupt = {"page": 3}
+
+    def handle_page(page, items):
+        if page == interrupt["page"]:
+            raise RuntimeError("中斷")
+        pages[page] = list(items)
+        return list(items)
+
+    lister = _newest_first_lister(commits)
+    with pytest.raises(RuntimeError):
+        collector._collect_pages(1, "commits", lister, {}, handle_page, cursor_param="until")
+
+    checkpoint = collector.sync_state.get_checkpoint(1, "commits")
+    assert checkpoint["next_page"] == 3
+    assert checkpoint["cursor"] == "2024-01-15T00:00:00Z"
+
+    # 中斷期間推送新 commit：offset 分頁會位移，時間游標不受影響
+    commits[:0] = ["2024-02-02T00:00:00Z", "2024-02-01T00:00:00Z"]
+    interrupt["page"] = None
+    latest = collector._collect_pages(1, "commits", lister, {}, handle_page, cursor_param="until")
+
+    assert latest == "2024-01-20T00:00:00Z"
+    # 分片編號接續檢查點，不覆寫先前分頁
+    assert min(pages) == 1 and sorted(pages) == list(range(1, len(pages) + 1))
+    collected = {item for items in pages.values() for item in items}
+    assert collected == {f"2024-01-{day:02d}T00:00:00Z" for day in range(1, 21)}
+    assert collector.sync_state.get_checkpoint(1, "commits")["done"]
+
+
+def test_resume_with_offset_continues_from_next_page(collector):
+    items = list(range(8))
+    requested = []
+
+    def list_method(page, per_page, **params):
+        requested.append(page)
+        return items[(page - 1) * per_page : page * per_page]
+
+    collector.sync_state.save_checkpoint(1, "merge_requests", 2, watermark="2024-01-01T00:00:00Z")
+    collector._collect_pages(1, "merge_requests", list_method, {}, lambda page, batch: [])
+
+    assert requested == [2, 3]
+    checkpoint = collector.sync_state.get_checkpoint(1, "merge_requests")
+    assert checkpoint["done"] and checkpoint["next_page"] == 4
+    assert checkpoint["watermark"] == "2024-01-01T00:00:00Z"
@@ -0,0 +1,76 @@
+"""
+分析管線測試（各維度輸入裁切）
+"""
+
+import pandas as pd
+
+from analyzers.dimensions import get_dimensions
+from analyzers.pipeline import AnalysisPipeline
+
+
+def _inputs():
+    return {
+        "developers": pd.DataFrame(columns=["email", "username", "name", "aliases"]),
+        "commits": pd.DataFrame(
+            columns=["author_email", "title", "message", "total", "additions", "deletions", "authored_date"]
+        ),
+        "file_changes": pd.DataFrame(columns=["author_email", "file_path", "file_extension"]),
+        "reviews": pd.DataFrame(columns=["reviewer"]),
+    }
+
+
+def test_project_input_keeps_declared_columns():
+    inputs = _inputs()
+    commit_quality, contribution, tech_breadth = get_dimensions(
+        ["commit_quality", "contribution", "tech_breadth"]
+    )
+
+    key = AnalysisPipeline._project_input(inputs, contribution, "commits")
+    assert list(inputs[key].columns) == ["author_email", "additions", "deletions", "authored_date"]
+
+    key = AnalysisPipeline._project_input(inputs, tech_breadth, "file_changes")
+    assert list(inputs[key].columns) == ["author_email", "file_extension"]
+
+    # 表格缺少的宣告欄位略過，分析器自行處理
+    del inputs["commits"]["message"]
+    key = AnalysisPipeline._project_input(inputs, commit_quality, "commits")
+    assert list(inputs[key].columns) == ["author_email", "title", "total"]
+
+
+def test_project_input_shares_identical_projections():
+    inputs = _inputs()
+    commit_quality, tech_breadth = get_dimensions(["commit_quality", "tech_breadth"])
+
+    first = AnalysisPipeline._project_input(inputs, commit_quality, "developers")
+    second = AnalysisPipeline._project_input(inputs, tech_breadth, "developers")
+
+    assert first == second
+    assert list(inputs[first].columns) == ["email", "username", "name"]
+
+
+def test_project_input_passes_undeclared_inputs():
+    inputs = _inputs()
+    (commit_quality,) = get_dimensions(["commit_quality"])
+
+    # 分析器未宣告欄位的基礎輸入與其他維度的輸出沿用原鍵
+    assert AnalysisPipeline._project_input(inputs, commit_quality, "reviews") == "reviews"
+    assert AnalysisPipeline._project_input(inputs, commit_quality, "contribution") == "contribution"
+
+
+def test_run_stage_records_rss_without_tracing(capsys):
+    pipeline = AnalysisPipeline(trace_memory=False)
+
+    pipeline._run_stage("建立表格", lambda: pd.DataFrame({"value": range(100_000)}))
+
+    (stage,) = pipeline.stages
+    assert stage.rows == 100_000
+    assert stage.peak_mb == 0
+    assert stage.rss_mb > 0
+    assert stage.rss_growth_mb >= 0
+
+    pipeline.print_stage_report()
+    row = capsys.readouterr().out.splitlines()[-2].split()
+    # RSS 峰值預設即顯示，tracemalloc 峰值未開啟時為 "-"
+    assert row[0] == "建立表格"
+    assert row[2] == f"{stage.rss_mb:.1f}"
+    assert row[4] == "-"
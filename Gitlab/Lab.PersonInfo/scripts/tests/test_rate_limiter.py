@@ -0,0 +1,36 @@
+"""
+請求節流測試（config.rate_limiter.RateLimiter）
+"""
+
+import time
+
+from config.rate_limiter import RateLimiter
+
+
+def test_no_rate_does_not_throttle():
+    limiter = RateLimiter(rate=None, burst=1)
+    now = time.monotonic()
+
+    assert all(limiter._reserve(now) == 0 for _ in range(100))
+
+
+def test_no_rate_still_honours_server_headers():
+    limiter = RateLimiter(rate=None, burst=1)
+    now = time.monotonic()
+
+    limiter.update_from_headers({"Retry-After": "30"}, status_code=429)
+    assert limiter._reserve(now) > 25
+
+    limiter = RateLimiter(rate=None, burst=1)
+    limiter.update_from_headers(
+        {"RateLimit-Remaining": "0", "RateLimit-Reset": str(time.time() + 60)}
+    )
+    assert limiter._reserve(time.monotonic()) > 55
+
+
+def test_configured_rate_throttles_after_burst():
+    limiter = RateLimiter(rate=2, burst=3)
+    now = time.monotonic()
+
+    assert [limiter._reserve(now) for _ in range(3)] == [0, 0, 0]
+    assert limiter._reserve(now) > 0
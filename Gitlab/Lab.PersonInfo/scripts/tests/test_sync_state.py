@@ -0,0 +1,40 @@
+"""
+同步水位測試（SyncStateStore.set_watermark 只往後推進）
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from collectors.sync_state import SyncStateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SyncStateStore(tmp_path)
+    yield store
+    store.close()
+
+
+def test_set_watermark_only_moves_forward(store):
+    store.set_watermark(1, "commits", "2024-01-20T08:00:00+08:00")
+    assert store.get_watermark(1, "commits") == "2024-01-20T00:00:00+00:00"
+
+    # 較舊的水位不覆蓋，較新的水位（含小數秒）才推進
+    store.set_watermark(1, "commits", "2024-01-19T23:59:59Z")
+    assert store.get_watermark(1, "commits") == "2024-01-20T00:00:00+00:00"
+    store.set_watermark(1, "commits", "2024-01-20T00:00:00.5Z")
+    assert store.get_watermark(1, "commits") == "2024-01-20T00:00:00.500000+00:00"
+
+    # 各專案、各資源的水位互不影響
+    assert store.get_watermark(1, "merge_requests") is None
+    assert store.get_watermark(2, "commits") is None
+
+
+def test_set_watermark_keeps_newest_under_parallel_writes(store):
+    days = [f"2024-01-{day:02d}T00:00:00Z" for day in range(1, 29)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda value: store.set_watermark(1, "commits", value), reversed(days * 4)))
+
+    assert store.get_watermark(1, "commits") == "2024-01-28T00:00:00+00:00"
@@ -17,10 +17,8 @@ def export_all_projects():
     print(f"連線到 GitLab: {GITLAB_URL}")
     client = GitLabClient(GITLAB_URL, GITLAB_TOKEN)
     
-    # 取得所有專案
-    print("正在取得所有專案...")
-    projects = client.get_projects()
-    print(f"找到 {len(projects)} 個專案")
+    # 逐頁取得所有專案（keyset 分頁），邊取得邊寫入，記憶體只保留目前分頁
+    projects = client.iter_projects()
     
     # 準備輸出目錄
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -57,6 +55,7 @@ def export_all_projects():
     with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
+        exported = 0
         
         for idx, project in enumerate(projects, 1):
             # 取得完整專案資訊
@@ -93,13 +92,14 @@ def export_all_projects():
                     row['creator_name'] = full_project.owner.get('name', '')
                 
                 writer.writerow(row)
-                print(f"  [{idx}/{len(projects)}] {full_project.path_with_namespace}")
+                exported += 1
+                print(f"  [{idx}] {full_project.path_with_namespace}")
                 
             except Exception as e:
                 print(f"  [錯誤] 無法取得專案 {project.id}: {e}")
                 continue
     
-    print(f"\n✅ 完成！匯出 {len(projects)} 個專案到 {output_file}")
+    print(f"\n✅ 完成！匯出 {exported} 個專案到 {output_file}")
 
 
 if __name__ == "__main__":
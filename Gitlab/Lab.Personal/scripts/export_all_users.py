@@ -17,10 +17,8 @@ def export_all_users():
     print(f"連線到 GitLab: {GITLAB_URL}")
     client = GitLabClient(GITLAB_URL, GITLAB_TOKEN)
     
-    # 取得所有使用者
-    print("正在取得所有使用者...")
-    users = client.get_all_users()
-    print(f"找到 {len(users)} 個使用者")
+    # 逐頁取得所有使用者（keyset 分頁），邊取得邊寫入，記憶體只保留目前分頁
+    users = client.iter_all_users()
     
     # 準備輸出目錄
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -70,6 +68,7 @@ def export_all_users():
     with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
+        exported = 0
         
         for idx, user in enumerate(users, 1):
             try:
@@ -116,13 +115,14 @@ def export_all_users():
                 }
                 
                 writer.writerow(row)
-                print(f"  [{idx}/{len(users)}] {user.username} ({user.name})")
+                exported += 1
+                print(f"  [{idx}] {user.username} ({user.name})")
                 
             except Exception as e:
                 print(f"  [錯誤] 無法處理使用者 {user.id}: {e}")
                 continue
     
-    print(f"\n✅ 完成！匯出 {len(users)} 個使用者到 {output_file}")
+    print(f"\n✅ 完成！匯出 {exported} 個使用者到 {output_file}")
 
 
 if __name__ == "__main__":
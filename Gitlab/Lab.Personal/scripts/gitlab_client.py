@@ -7,17 +7,36 @@ GitLab API 操作封裝類別
 - Merge Requests 操作
 - 使用者操作
 - 群組操作
+- 串流列表（iter_* 產生器，逐頁取得；專案與使用者列表採 keyset 分頁）
+- 回應快取（可選，持久化於磁碟）
+- 請求節流（可選，依 GitLab RateLimit 標頭調整）
+- 連線池（大小對應並行執行緒數、keep-alive 重用、重試與逾時）
 """
 
 import gitlab
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 
+from http_adapter import GitLabHTTPAdapter
+from http_cache import ResponseCache
+from rate_limiter import RateLimiter
+
 
 class GitLabClient:
     """GitLab API 操作封裝類別"""
     
-    def __init__(self, gitlab_url: str, private_token: str, ssl_verify: bool = False):
+    # 列表 API 每頁筆數（GitLab 上限為 100）
+    PAGE_SIZE = 100
+    
+    # 支援 keyset 分頁的列表（/projects、/users）使用的排序；keyset 不受頁數深度影響
+    KEYSET_PARAMS = {'pagination': 'keyset', 'order_by': 'id', 'sort': 'asc'}
+    
+    def __init__(self, gitlab_url: str, private_token: str, ssl_verify: bool = False,
+                 cache_dir: Optional[str] = None, cache_ttl: float = 3600,
+                 rate_limit: Optional[float] = None, rate_burst: int = 20,
+                 pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 connect_timeout: Optional[float] = 10, read_timeout: Optional[float] = 120):
         """
         初始化 GitLab 客戶端
         
@@ -25,8 +44,182 @@ class GitLabClient:
             gitlab_url: GitLab 伺服器 URL
             private_token: 私人存取權杖
             ssl_verify: 是否驗證 SSL 憑證
+            cache_dir: 回應快取目錄 (可選，指定後啟用持久化快取)
+            cache_ttl: 可變資源（MR、成員、列表）的快取有效秒數
+            rate_limit: 初始每秒請求數 (可選，指定後啟用節流)
+            rate_burst: 可累積的爆發請求數
+            pool_size: keep-alive 連線池大小，應與並行執行緒數相同
+            max_retries: 連線錯誤與暫時性 5xx (502/503/504) 的重試次數
+            backoff_factor: 重試的指數退避係數
+            connect_timeout: 預設連線逾時秒數 (None 表示不限)
+            read_timeout: 預設讀取逾時秒數 (None 表示不限；個別請求可另外指定 timeout)
         """
         self.gl = gitlab.Gitlab(gitlab_url, private_token=private_token, ssl_verify=ssl_verify)
+        
+        # 請求統計（多執行緒共用，需加鎖）
+        self._stats_lock = threading.Lock()
+        self._request_stats = {'saved_requests': 0}
+        
+        self.cache: Optional[ResponseCache] = None
+        self.rate_limiter: Optional[RateLimiter] = None
+        self._adapter: Optional[GitLabHTTPAdapter] = None
+        self.configure_connections(pool_size, max_retries=max_retries, backoff_factor=backoff_factor,
+                                   connect_timeout=connect_timeout, read_timeout=read_timeout)
+        if rate_limit:
+            self.enable_rate_limit(rate_limit, rate_burst)
+        if cache_dir:
+            self.enable_cache(cache_dir, cache_ttl)
+    
+    # ==================== 傳輸設定 ====================
+    
+    def enable_cache(self, cache_dir: str, ttl: float = 3600) -> None:
+        """
+        啟用持久化回應快取
+        
+        以 commit SHA 定址的資源（commit 詳細資訊、diff）永久有效；
+        其他資源在 ttl 秒內直接使用，過期後以 ETag 重新驗證。
+        
+        Args:
+            cache_dir: 快取目錄
+            ttl: 可變資源的快取有效秒數
+        """
+        self.cache = ResponseCache(cache_dir, ttl=ttl)
+        self._mount_adapter()
+    
+    def enable_rate_limit(self, rate: float, burst: int = 20) -> None:
+        """
+        啟用請求節流（所有執行緒共用同一個 token bucket）
+        
+        初始以 rate 節流；取得 GitLab 回應的 RateLimit 標頭後，
+        改為依伺服器剩餘額度與重置時間調整，並遵守 Retry-After。
+        
+        Args:
+            rate: 初始每秒請求數
+            burst: 可累積的爆發請求數
+        """
+        self.rate_limiter = RateLimiter(rate=rate, burst=burst)
+        self._mount_adapter()
+    
+    def configure_connections(self, pool_size: int, max_retries: int = 3, backoff_factor: float = 0.5,
+                              connect_timeout: Optional[float] = 10,
+                              read_timeout: Optional[float] = 120) -> None:
+        """
+        設定連線池、重試與逾時
+        
+        所有執行緒共用同一個 Session；連線池小於並行數時，多出的連線用完即關閉，
+        下一次請求必須重新建立 TCP / TLS 連線。requests 不支援 HTTP/2，
+        因此以 HTTP/1.1 keep-alive 搭配足夠的連線池重用連線。
+        
+        Args:
+            pool_size: keep-alive 連線池大小（建議等於並行執行緒數）
+            max_retries: 連線錯誤與暫時性 5xx 的重試次數
+            backoff_factor: 重試的指數退避係數
+            connect_timeout: 預設連線逾時秒數 (None 表示不限)
+            read_timeout: 預設讀取逾時秒數 (None 表示不限)
+        """
+        self.pool_size = max(1, pool_size)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = None
+        if connect_timeout is not None or read_timeout is not None:
+            self.timeout = (connect_timeout, read_timeout)
+        self._mount_adapter()
+    
+    def _mount_adapter(self) -> None:
+        """依目前設定建立 HTTP Adapter 並掛載到 python-gitlab 的 Session（取代舊的 Adapter）"""
+        adapter = GitLabHTTPAdapter(
+            cache=self.cache,
+            rate_limiter=self.rate_limiter,
+            pool_size=self.pool_size,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            timeout=self.timeout
+        )
+        self.gl.session.mount('https://', adapter)
+        self.gl.session.mount('http://', adapter)
+        if self._adapter is not None:
+            self._adapter.close()
+        self._adapter = adapter
+    
+    # ==================== 請求統計 ====================
+    
+    def _count_saved_request(self, count: int = 1) -> None:
+        """累計因使用 lazy handle 而省下的 API 請求數"""
+        with self._stats_lock:
+            self._request_stats['saved_requests'] += count
+    
+    def get_request_stats(self) -> Dict[str, int]:
+        """
+        取得請求統計
+        
+        Returns:
+            統計字典：saved_requests 為透過 lazy handle 省下的 GET 請求數；
+            啟用快取時另含 cache_hits / cache_revalidated / cache_misses；
+            啟用節流時另含 throttle_waits / throttle_wait_seconds / throttle_throttled；
+            連線池統計為 pool_requests / pool_new_connections / pool_reused / pool_retries
+        """
+        with self._stats_lock:
+            stats = dict(self._request_stats)
+        
+        if self.cache is not None:
+            for name, value in self.cache.get_stats().items():
+                stats[f'cache_{name}'] = value
+        if self.rate_limiter is not None:
+            for name, value in self.rate_limiter.get_stats().items():
+                stats[f'throttle_{name}'] = value
+        if self._adapter is not None:
+            for name, value in self._adapter.get_stats().items():
+                stats[f'pool_{name}'] = value
+        return stats
+    
+    # ==================== Lazy Handle ====================
+    
+    def _project_handle(self, project_id: int) -> Any:
+        """
+        取得專案的 lazy handle
+        
+        python-gitlab 的 lazy 物件只記錄 ID、不會發出請求，足以存取
+        commits、mergerequests、members 等子資源；需要專案屬性時請改用 get_project。
+        
+        Args:
+            project_id: 專案 ID
+        
+        Returns:
+            lazy 專案物件
+        """
+        self._count_saved_request()
+        return self.gl.projects.get(project_id, lazy=True)
+    
+    def _group_handle(self, group_id: int) -> Any:
+        """
+        取得群組的 lazy handle（用於存取子群組、專案、成員等子資源）
+        
+        Args:
+            group_id: 群組 ID
+        
+        Returns:
+            lazy 群組物件
+        """
+        self._count_saved_request()
+        return self.gl.groups.get(group_id, lazy=True)
+    
+    # ==================== 串流列表 ====================
+    
+    def _iter_list(self, manager: Any, keyset: bool = False, **params) -> Iterator[Any]:
+        """
+        逐頁取得列表（python-gitlab iterator 模式），取得第一頁即可開始處理
+        
+        Args:
+            manager: python-gitlab 的 RESTManager，例如 project.commits
+            keyset: 是否使用 keyset 分頁（只有部分端點支援）
+            **params: 查詢參數
+        
+        Yields:
+            列表中的物件
+        """
+        if keyset:
+            params = {**self.KEYSET_PARAMS, **params}
+        yield from manager.list(iterator=True, per_page=self.PAGE_SIZE, **params)
     
     # ==================== 專案操作 ====================
     
@@ -49,41 +242,45 @@ class GitLabClient:
         Returns:
             專案物件列表
         """
+        return list(self.iter_projects(group_id, project_ids, search, searches))
+    
+    def iter_projects(
+        self, 
+        group_id: Optional[int] = None, 
+        project_ids: Optional[List[int]] = None,
+        search: Optional[str] = None,
+        searches: Optional[List[str]] = None
+    ) -> Iterator[Any]:
+        """
+        逐頁取得專案（參數同 get_projects）；整個實例的專案列表使用 keyset 分頁
+        
+        Yields:
+            專案物件
+        """
         if project_ids:
-            return [self.gl.projects.get(pid) for pid in project_ids]
+            for pid in project_ids:
+                yield self.gl.projects.get(pid)
+            return
         
-        # 處理多個搜尋關鍵字的情況
+        # 多個搜尋關鍵字：逐頁取得所有專案，在客戶端過濾
         if searches and len(searches) > 1:
-            # 先取得所有專案
-            if group_id:
-                group = self.gl.groups.get(group_id)
-                all_projects = group.projects.list(all=True)
-            else:
-                all_projects = self.gl.projects.list(all=True)
-            
-            # 客戶端過濾：專案名稱包含任一關鍵字
-            filtered_projects = []
-            for project in all_projects:
-                for search_term in searches:
-                    if search_term.lower() in project.name.lower():
-                        filtered_projects.append(project)
-                        break  # 找到一個符合就加入，不重複
-            return filtered_projects
+            for project in self._iter_project_list(group_id):
+                # 專案名稱包含任一關鍵字即符合（不重複）
+                if any(term.lower() in project.name.lower() for term in searches):
+                    yield project
+            return
         
         # 處理單一搜尋關鍵字或沒有搜尋的情況
         search_term = searches[0] if searches and len(searches) == 1 else search
-        
+        yield from self._iter_project_list(group_id, search_term)
+    
+    def _iter_project_list(self, group_id: Optional[int] = None,
+                            search: Optional[str] = None) -> Iterator[Any]:
+        """逐頁取得群組或整個實例的專案（群組專案端點不支援 keyset 分頁）"""
+        params = {'search': search} if search else {}
         if group_id:
-            group = self.gl.groups.get(group_id)
-            params = {'all': True}
-            if search_term:
-                params['search'] = search_term
-            return group.projects.list(**params)
-        else:
-            params = {'all': True}
-            if search_term:
-                params['search'] = search_term
-            return self.gl.projects.list(**params)
+            return self._iter_list(self._group_handle(group_id).projects, **params)
+        return self._iter_list(self.gl.projects, keyset=True, **params)
     
     def get_project(self, project_id: int) -> Any:
         """
@@ -97,13 +294,69 @@ class GitLabClient:
         """
         return self.gl.projects.get(project_id)
     
+    def get_project_members(self, project_id: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        取得專案成員
+        
+        Args:
+            project_id: 專案 ID
+            timeout: 請求逾時秒數 (可選)
+        
+        Returns:
+            成員物件列表
+        """
+        return list(self.iter_project_members(project_id, timeout=timeout))
+    
+    def iter_project_members(self, project_id: int, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        逐頁取得專案成員
+        
+        Args:
+            project_id: 專案 ID
+            timeout: 每個分頁請求的逾時秒數 (可選)
+        
+        Yields:
+            成員物件
+        """
+        project = self._project_handle(project_id)
+        yield from self._iter_list(project.members, timeout=timeout)
+    
+    def get_project_members_all(self, project_id: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        取得專案的有效成員（members/all：含直接、繼承自上層群組與分享群組的成員）
+        
+        Args:
+            project_id: 專案 ID
+            timeout: 每個分頁請求的逾時秒數 (可選)
+        
+        Returns:
+            成員物件列表，access_level 為各成員的最高有效權限
+        """
+        project = self._project_handle(project_id)
+        return list(self._iter_list(project.members_all, timeout=timeout))
+    
+    def get_project_contributors(self, project_id: int, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        取得專案貢獻者統計
+        
+        Args:
+            project_id: 專案 ID
+            timeout: 請求逾時秒數 (可選)
+        
+        Returns:
+            貢獻者統計列表
+        """
+        project = self._project_handle(project_id)
+        return project.repository_contributors(timeout=timeout)
+    
     # ==================== Commits 操作 ====================
     
     def get_project_commits(
         self, 
         project_id: int, 
         since: Optional[str] = None,
-        until: Optional[str] = None
+        until: Optional[str] = None,
+        author: Optional[str] = None
     ) -> List[Any]:
         """
         取得專案的 commits
@@ -112,18 +365,36 @@ class GitLabClient:
             project_id: 專案 ID
             since: 起始日期 (ISO 格式)
             until: 結束日期 (ISO 格式)
+            author: 伺服器端作者篩選 (可選，比對 commit 作者的名稱或 email)
         
         Returns:
             commit 物件列表
         """
-        project = self.gl.projects.get(project_id)
-        params = {'all': True}
+        return list(self.iter_project_commits(project_id, since, until, author))
+    
+    def iter_project_commits(
+        self, 
+        project_id: int, 
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        author: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        逐頁取得專案的 commits（參數同 get_project_commits）
+        
+        Yields:
+            commit 物件
+        """
+        project = self._project_handle(project_id)
+        params = {}
         if since:
             params['since'] = since
         if until:
             params['until'] = until
+        if author:
+            params['author'] = author
         
-        return project.commits.list(**params)
+        yield from self._iter_list(project.commits, **params)
     
     def get_commit_detail(self, project_id: int, commit_id: str) -> Any:
         """
@@ -136,7 +407,7 @@ class GitLabClient:
         Returns:
             commit 詳細資訊物件
         """
-        project = self.gl.projects.get(project_id)
+        project = self._project_handle(project_id)
         return project.commits.get(commit_id)
     
     def get_commit_diff(self, project_id: int, commit_id: str) -> List[Dict[str, Any]]:
@@ -150,8 +421,10 @@ class GitLabClient:
         Returns:
             diff 列表
         """
-        commit_detail = self.get_commit_detail(project_id, commit_id)
-        return commit_detail.diff(get_all=True)
+        # diff 只需要 commit ID，使用 lazy commit 省下一次 commit 詳細資訊請求
+        commit = self._project_handle(project_id).commits.get(commit_id, lazy=True)
+        self._count_saved_request()
+        return commit.diff(get_all=True)
     
     # ==================== Merge Requests 操作 ====================
     
@@ -159,7 +432,9 @@ class GitLabClient:
         self,
         project_id: int,
         updated_after: Optional[str] = None,
-        updated_before: Optional[str] = None
+        updated_before: Optional[str] = None,
+        author_id: Optional[int] = None,
+        author_username: Optional[str] = None
     ) -> List[Any]:
         """
         取得專案的 Merge Requests
@@ -168,18 +443,42 @@ class GitLabClient:
             project_id: 專案 ID
             updated_after: 更新時間起始 (ISO 格式)
             updated_before: 更新時間結束 (ISO 格式)
+            author_id: 伺服器端作者篩選：使用者 ID (可選)
+            author_username: 伺服器端作者篩選：使用者名稱 (可選，與 author_id 擇一)
         
         Returns:
             MR 物件列表
         """
-        project = self.gl.projects.get(project_id)
-        params = {'all': True}
+        return list(self.iter_project_merge_requests(
+            project_id, updated_after, updated_before, author_id, author_username
+        ))
+    
+    def iter_project_merge_requests(
+        self,
+        project_id: int,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        author_id: Optional[int] = None,
+        author_username: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        逐頁取得專案的 Merge Requests（參數同 get_project_merge_requests）
+        
+        Yields:
+            MR 物件
+        """
+        project = self._project_handle(project_id)
+        params = {}
         if updated_after:
             params['updated_after'] = updated_after
         if updated_before:
             params['updated_before'] = updated_before
+        if author_id:
+            params['author_id'] = author_id
+        elif author_username:
+            params['author_username'] = author_username
         
-        return project.mergerequests.list(**params)
+        yield from self._iter_list(project.mergerequests, **params)
     
     def get_merge_request_detail(self, project_id: int, mr_iid: int) -> Any:
         """
@@ -192,9 +491,24 @@ class GitLabClient:
         Returns:
             MR 詳細資訊物件
         """
-        project = self.gl.projects.get(project_id)
+        project = self._project_handle(project_id)
         return project.mergerequests.get(mr_iid)
     
+    def _merge_request_handle(self, project_id: int, mr_iid: int) -> Any:
+        """
+        取得 Merge Request 的 lazy handle（用於存取討論、變更等子資源）
+        
+        Args:
+            project_id: 專案 ID
+            mr_iid: MR 內部 ID
+        
+        Returns:
+            lazy MR 物件
+        """
+        mr = self._project_handle(project_id).mergerequests.get(mr_iid, lazy=True)
+        self._count_saved_request()
+        return mr
+    
     def get_merge_request_discussions(self, project_id: int, mr_iid: int) -> List[Any]:
         """
         取得 Merge Request 的討論
@@ -206,8 +520,21 @@ class GitLabClient:
         Returns:
             討論物件列表
         """
-        mr_detail = self.get_merge_request_detail(project_id, mr_iid)
-        return mr_detail.discussions.list(all=True)
+        return list(self.iter_merge_request_discussions(project_id, mr_iid))
+    
+    def iter_merge_request_discussions(self, project_id: int, mr_iid: int) -> Iterator[Any]:
+        """
+        逐頁取得 Merge Request 的討論
+        
+        Args:
+            project_id: 專案 ID
+            mr_iid: MR 內部 ID
+        
+        Yields:
+            討論物件
+        """
+        mr = self._merge_request_handle(project_id, mr_iid)
+        yield from self._iter_list(mr.discussions)
     
     def get_merge_request_changes(self, project_id: int, mr_iid: int) -> Dict[str, Any]:
         """
@@ -220,8 +547,8 @@ class GitLabClient:
         Returns:
             變更資訊字典
         """
-        mr_detail = self.get_merge_request_detail(project_id, mr_iid)
-        return mr_detail.changes()
+        mr = self._merge_request_handle(project_id, mr_iid)
+        return mr.changes()
     
     # ==================== 使用者操作 ====================
     
@@ -232,7 +559,19 @@ class GitLabClient:
         Returns:
             使用者物件列表
         """
-        return self.gl.users.list(all=True)
+        return list(self.iter_all_users())
+    
+    def iter_all_users(self, **filters) -> Iterator[Any]:
+        """
+        以 keyset 分頁逐頁取得所有使用者，記憶體只保留目前分頁
+        
+        Args:
+            **filters: 其他查詢參數，例如 active=True、username='xxx'
+        
+        Yields:
+            使用者物件
+        """
+        yield from self._iter_list(self.gl.users, keyset=True, **filters)
     
     # ==================== 群組操作 ====================
     
@@ -259,29 +598,28 @@ class GitLabClient:
         Returns:
             群組物件列表
         """
-        # 處理多個搜尋關鍵字的情況
+        return list(self.iter_groups(group_name, group_names))
+    
+    def iter_groups(self, group_name: Optional[str] = None,
+                    group_names: Optional[List[str]] = None) -> Iterator[Any]:
+        """
+        逐頁取得群組（參數同 get_groups）
+        
+        Yields:
+            群組物件
+        """
+        # 多個搜尋關鍵字：逐頁取得所有群組，在客戶端過濾
         if group_names and len(group_names) > 1:
-            # 先取得所有群組
-            all_groups = self.gl.groups.list(all=True)
-            
-            # 客戶端過濾：群組名稱包含任一關鍵字
-            filtered_groups = []
-            for group in all_groups:
-                for search_term in group_names:
-                    if search_term.lower() in group.name.lower():
-                        filtered_groups.append(group)
-                        break  # 找到一個符合就加入，不重複
-            return filtered_groups
+            for group in self._iter_list(self.gl.groups):
+                # 群組名稱包含任一關鍵字即符合（不重複）
+                if any(term.lower() in group.name.lower() for term in group_names):
+                    yield group
+            return
         
         # 處理單一搜尋關鍵字或沒有搜尋的情況
         search_term = group_names[0] if group_names and len(group_names) == 1 else group_name
-        
-        if search_term:
-            # 搜尋特定群組
-            return self.gl.groups.list(search=search_term, all=True)
-        else:
-            # 取得所有群組
-            return self.gl.groups.list(all=True)
+        params = {'search': search_term} if search_term else {}
+        yield from self._iter_list(self.gl.groups, **params)
     
     def get_group_subgroups(self, group_id: int) -> List[Any]:
         """
@@ -293,8 +631,19 @@ class GitLabClient:
         Returns:
             子群組列表
         """
-        group = self.gl.groups.get(group_id)
-        return group.subgroups.list(all=True)
+        return list(self.iter_group_subgroups(group_id))
+    
+    def iter_group_subgroups(self, group_id: int) -> Iterator[Any]:
+        """
+        逐頁取得群組的子群組
+        
+        Args:
+            group_id: 群組 ID
+        
+        Yields:
+            子群組物件
+        """
+        yield from self._iter_list(self._group_handle(group_id).subgroups)
     
     def get_group_projects(self, group_id: int) -> List[Any]:
         """
@@ -306,8 +655,19 @@ class GitLabClient:
         Returns:
             專案列表
         """
-        group = self.gl.groups.get(group_id)
-        return group.projects.list(all=True)
+        return list(self.iter_group_projects(group_id))
+    
+    def iter_group_projects(self, group_id: int) -> Iterator[Any]:
+        """
+        逐頁取得群組的專案
+        
+        Args:
+            group_id: 群組 ID
+        
+        Yields:
+            專案物件
+        """
+        yield from self._iter_list(self._group_handle(group_id).projects)
     
     def get_group_members(self, group_id: int) -> List[Any]:
         """
@@ -319,5 +679,28 @@ class GitLabClient:
         Returns:
             成員列表
         """
-        group = self.gl.groups.get(group_id)
-        return group.members.list(all=True)
+        return list(self.iter_group_members(group_id))
+    
+    def iter_group_members(self, group_id: int) -> Iterator[Any]:
+        """
+        逐頁取得群組的成員
+        
+        Args:
+            group_id: 群組 ID
+        
+        Yields:
+            成員物件
+        """
+        yield from self._iter_list(self._group_handle(group_id).members)
+    
+    def get_group_members_all(self, group_id: int) -> List[Any]:
+        """
+        取得群組的有效成員（members/all：含繼承自上層群組的成員）
+        
+        Args:
+            group_id: 群組 ID
+        
+        Returns:
+            成員列表
+        """
+        return list(self._iter_list(self._group_handle(group_id).members_all))
@@ -104,10 +104,9 @@ class UserDetailsAnalyzer:
         """取得目標用戶列表"""
         if usernames and len(usernames) > 0:
             # 指定用戶名稱
-            all_users = self.client.get_all_users()
             return [
                 {'id': u.id, 'username': u.username, 'name': u.name, 'email': getattr(u, 'email', '')}
-                for u in all_users 
+                for u in self.client.iter_all_users()
                 if u.username in usernames
             ]
         else:
@@ -385,8 +384,8 @@ class UserDetailsAnalyzer:
     def _get_user_profile(self, user_id: int) -> List[Dict]:
         """取得用戶個人資料"""
         try:
-            users = self.client.get_all_users()
-            for user in users:
+            # 逐頁搜尋，找到即停止，不必取得所有使用者
+            for user in self.client.iter_all_users():
                 if user.id == user_id:
                     return [{
                         'id': user.id,
@@ -14,19 +14,26 @@ import argparse
 import sys
 import os
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
 import urllib3
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from concurrent.futures import ThreadPoolExecutor
+import queue
 import signal
 import time
+from functools import partial
+from collections import Counter
+from itertools import islice
+import requests
 
 # 抑制 SSL 不安全連線警告（self-signed certificates）
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 from gitlab_client import GitLabClient
+from permission_resolver import PermissionResolver
+from stream_exporter import StreamingExporter, SpillWriter, FORMATS
 import config
 
 
@@ -58,6 +65,116 @@ class AccessLevelUtil:
         return AccessLevelUtil.LEVELS.get(level, 'Unknown')
 
 
+def _take(iterator: Iterator, count: int) -> List[Any]:
+    """從產生器取出最多 count 個項目（在執行緒池中執行，會觸發下一頁請求）"""
+    return list(islice(iterator, count))
+
+
+class ConcurrentFetchEngine:
+    """
+    跨專案共用的並行抓取引擎
+
+    所有任務都提交到同一個有界執行緒池，max_workers 即為整次查詢的全域並行額度，
+    不再隨專案數量重複建立執行緒池。任務完成後的回呼一律在呼叫 run_until_complete
+    的執行緒上執行，因此回呼可以安全地寫入共用結果，也可以再提交後續任務。
+    """
+
+    def __init__(self, max_workers: int = 10):
+        """
+        初始化抓取引擎
+
+        Args:
+            max_workers: 全域並行請求上限
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Any, tuple] = {}
+        # 完成的 future 由 add_done_callback 放入佇列，主執行緒依完成順序取出，不必反覆掃描所有待完成任務
+        self._completed: queue.Queue = queue.Queue()
+        self._group_pending: Dict[Any, int] = {}
+        self.submitted = 0
+        self.completed = 0
+
+    def __enter__(self) -> 'ConcurrentFetchEngine':
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        # 發生例外（例如 Ctrl-C）時取消尚未開始的任務，避免卡在關閉流程
+        self._executor.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+        self._executor = None
+
+    def submit(self, func: Callable, *args,
+               on_done: Optional[Callable[[Any, Optional[Exception]], None]] = None,
+               group: Any = None, **kwargs) -> None:
+        """
+        提交任務
+
+        Args:
+            func: 要在執行緒池中執行的函數
+            on_done: 完成回呼，參數為 (result, error)
+            group: 任務群組鍵（例如專案 ID），用於追蹤整組任務何時完成
+        """
+        future = self._executor.submit(func, *args, **kwargs)
+        self._pending[future] = (on_done, group)
+        future.add_done_callback(self._completed.put)
+        if group is not None:
+            self._group_pending[group] = self._group_pending.get(group, 0) + 1
+        self.submitted += 1
+
+    def submit_pages(self, items: Iterable,
+                     on_page: Callable[[List[Any], Optional[Exception]], None],
+                     group: Any = None, page_size: int = GitLabClient.PAGE_SIZE) -> None:
+        """
+        逐頁消耗列表產生器（例如 GitLabClient.iter_*）
+
+        每次在執行緒池中取出一頁，回呼處理完這一頁（可提交明細任務）後再提交下一頁，
+        明細請求不必等到整個列表下載完成；同一個產生器一次只會被一個執行緒使用。
+
+        Args:
+            items: 列表產生器（建立時不應發出請求）
+            on_page: 每頁完成回呼，參數為 (該頁物件列表, error)
+            group: 任務群組鍵，最後一頁完成前群組不會結束
+            page_size: 每頁筆數，取得不足一頁即視為最後一頁
+        """
+        iterator = iter(items)
+
+        def on_done(page, error):
+            on_page(page or [], error)
+            if error is None and len(page) == page_size:
+                self.submit(_take, iterator, page_size, on_done=on_done, group=group)
+
+        self.submit(_take, iterator, page_size, on_done=on_done, group=group)
+
+    def run_until_complete(self, on_group_done: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        等待所有任務（包含回呼中新提交的任務）完成
+
+        Args:
+            on_group_done: 某個群組的所有任務都完成時呼叫，參數為群組鍵
+        """
+        while self._pending:
+            future = self._completed.get()
+            on_done, group = self._pending.pop(future)
+            self.completed += 1
+
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+
+            # 先執行回呼（可能在同一群組提交新任務），再遞減群組計數
+            if on_done:
+                on_done(result, error)
+
+            if group is not None:
+                self._group_pending[group] -= 1
+                if self._group_pending[group] == 0:
+                    del self._group_pending[group]
+                    if on_group_done:
+                        on_group_done(group)
+
+
 # ==================== 抽象介面 (介面隔離原則) ====================
 
 class IProgressReporter(ABC):
@@ -109,6 +226,12 @@ class IDataExporter(ABC):
     def export(self, df: pd.DataFrame, filename: str) -> None:
         """匯出資料"""
         pass
+    
+    @abstractmethod
+    def export_rows(self, rows: Iterable[Dict[str, Any]], filename: str,
+                    columns: Optional[List[str]] = None) -> int:
+        """串流匯出資料列（不需先建立 DataFrame）"""
+        pass
 
 
 # ==================== 進度報告類別 (單一職責原則) ====================
@@ -166,12 +289,40 @@ class SilentProgressReporter(IProgressReporter):
 
 # ==================== 資料獲取器 (單一職責原則) ====================
 
+def _effective_permission_rows(resolver: PermissionResolver, project: Any) -> List[Dict[str, Any]]:
+    """以解析器計算專案有效權限，轉換為專案授權記錄（每位有效成員一筆）"""
+    return [
+        {
+            'project_id': project.id,
+            'project_name': project.name,
+            'member_type': 'User',
+            'member_id': access['member_id'],
+            'member_name': access['member_name'],
+            'member_username': access['member_username'],
+            'member_email': access['member_email'],
+            'access_level': access['access_level'],
+            'access_level_name': AccessLevelUtil.get_level_name(access['access_level']),
+            'access_source': access['access_source'],
+            'access_source_name': access['access_source_name']
+        }
+        for access in resolver.resolve_project(project)
+    ]
+
+
 class ProjectDataFetcher(IDataFetcher):
     """專案資料獲取器（包含授權資訊）"""
     
-    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None):
+    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None,
+                 resolver: Optional[PermissionResolver] = None):
+        """
+        Args:
+            client: GitLab 客戶端
+            progress_reporter: 進度報告器
+            resolver: 有效權限解析器 (可選，指定後輸出含繼承與分享群組的有效權限)
+        """
         self.client = client
         self.progress = progress_reporter or SilentProgressReporter()
+        self.resolver = resolver
     
     def fetch(self, project_name: Optional[str] = None, 
               group_id: Optional[int] = None,
@@ -204,6 +355,13 @@ class ProjectDataFetcher(IDataFetcher):
                     self.progress.report_progress(idx, len(projects), project.name)
                     project_detail = self.client.get_project(project.id)
                     
+                    # 有效權限：展開繼承與分享群組，標示每位成員的權限來源
+                    if self.resolver:
+                        result['permissions'].extend(
+                            _effective_permission_rows(self.resolver, project_detail)
+                        )
+                        continue
+                    
                     # 獲取專案成員
                     members = project_detail.members.list(all=True)
                     
@@ -248,9 +406,17 @@ class ProjectDataFetcher(IDataFetcher):
 class ProjectPermissionFetcher(IDataFetcher):
     """專案授權資料獲取器"""
     
-    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None):
+    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None,
+                 resolver: Optional[PermissionResolver] = None):
+        """
+        Args:
+            client: GitLab 客戶端
+            progress_reporter: 進度報告器
+            resolver: 有效權限解析器 (可選，指定後輸出含繼承與分享群組的有效權限)
+        """
         self.client = client
         self.progress = progress_reporter or SilentProgressReporter()
+        self.resolver = resolver
     
     def fetch(self, project_name: Optional[str] = None,
               group_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -276,6 +442,11 @@ class ProjectPermissionFetcher(IDataFetcher):
                 self.progress.report_progress(idx, len(projects), project.name)
                 project_detail = self.client.get_project(project.id)
                 
+                # 有效權限：展開繼承與分享群組，標示每位成員的權限來源
+                if self.resolver:
+                    permissions_data.extend(_effective_permission_rows(self.resolver, project_detail))
+                    continue
+                
                 # 獲取專案成員
                 members = project_detail.members.list(all=True)
                 
@@ -316,19 +487,42 @@ class ProjectPermissionFetcher(IDataFetcher):
 class UserDataFetcher(IDataFetcher):
     """使用者資料獲取器"""
     
-    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None):
+    # diff 處理模式：none 不下載 diff；stats 只保留每個檔案的新增 / 刪除行數；full 另將 diff 原文寫入側檔
+    DIFF_MODES = ('none', 'stats', 'full')
+    
+    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None,
+                 max_workers: int = 10, request_timeout: float = 30, diff_mode: str = 'full'):
+        """
+        Args:
+            client: GitLab 客戶端
+            progress_reporter: 進度報告器
+            max_workers: 跨專案共用的全域並行請求上限
+            request_timeout: 成員 / 貢獻者請求的逾時秒數
+            diff_mode: diff 處理模式 (none / stats / full)
+        """
+        if diff_mode not in self.DIFF_MODES:
+            raise ValueError(f"不支援的 diff 模式: {diff_mode}")
+        
         self.client = client
         self.progress = progress_reporter or SilentProgressReporter()
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.diff_mode = diff_mode
     
     def fetch(self, username: Optional[str] = None,
               project_name: Optional[str] = None,
               start_date: Optional[str] = None,
               end_date: Optional[str] = None,
               group_id: Optional[int] = None,
-              user_info: Optional[Any] = None) -> Dict[str, Any]:
+              user_info: Optional[Any] = None,
+              prune_by_events: bool = False,
+              diff_writer: Optional[SpillWriter] = None) -> Dict[str, Any]:
         """
         獲取使用者資料
         
+        指定使用者時，commits 與 MRs 先以伺服器端作者篩選縮小傳輸量，
+        再以 email / 名稱 / username 在客戶端精確比對。
+        
         Args:
             username: 使用者名稱 (可選)
             project_name: 專案名稱 (可選，篩選特定專案)
@@ -336,6 +530,9 @@ class UserDataFetcher(IDataFetcher):
             end_date: 結束日期
             group_id: 群組 ID (可選)
             user_info: 使用者資訊物件 (可選，用於精確匹配)
+            prune_by_events: 只分析使用者在期間內有事件的專案 (需要 user_info；
+                             以其他身分推送、未產生事件的 commits 會被略過)
+            diff_writer: diff 原文的側檔寫入器 (full 模式使用；code_changes 只保留 diff_ref)
         
         Returns:
             使用者資料字典
@@ -408,6 +605,7 @@ class UserDataFetcher(IDataFetcher):
             })
             
             # 獲取使用者事件
+            events_loaded = False
             try:
                 self.progress.report_start(f"正在獲取使用者事件...")
                 user_obj = self.client.gl.users.get(user_info.id)
@@ -432,239 +630,120 @@ class UserDataFetcher(IDataFetcher):
                     })
                 
                 self.progress.report_complete(f"找到 {len(events)} 個使用者事件")
+                events_loaded = True
             except Exception as e:
                 self.progress.report_warning(f"Failed to get user events: {e}")
         
-        if projects:
-            self.progress.report_start(f"正在分析 {len(projects)} 個專案的使用者活動...")
+        match_ctx = {
+            'username': username,
+            'user_id': user_info.id if user_info else None,
+            'target_email': target_email,
+            'target_name': target_name,
+            'target_username': target_username
+        }
         
-        for idx, project in enumerate(projects, 1):
-            self.progress.report_progress(idx, len(projects), project.name)
-            
-            # 獲取 commits
-            commits = self.client.get_project_commits(
-                project.id,
-                since=start_date,
-                until=end_date
+        # 依使用者事件縮小專案範圍（可選）
+        if prune_by_events:
+            if user_info and events_loaded:
+                event_project_ids = {event['project_id'] for event in user_data['user_events']}
+                pruned = [project for project in projects if project.id in event_project_ids]
+                self.progress.report_complete(
+                    f"依使用者事件篩選專案：{len(projects)} → {len(pruned)} 個"
+                )
+                projects = pruned
+            else:
+                self.progress.report_warning("無法取得使用者事件，略過依事件篩選專案")
+        
+        if projects:
+            self.progress.report_start(
+                f"正在分析 {len(projects)} 個專案的使用者活動（全域並行上限 {self.max_workers}）..."
             )
-            
-            # 過濾符合條件的 commits
-            filtered_commits = []
+        
+        projects_by_id = {project.id: project for project in projects}
+        projects_done = 0
+        
+        def on_project_done(project_id):
+            nonlocal projects_done
+            projects_done += 1
+            self.progress.report_progress(projects_done, len(projects), projects_by_id[project_id].name)
+        
+        # 所有專案共用同一個執行緒池：列表請求完成後，於回呼中再提交 commit / MR 明細請求
+        with ConcurrentFetchEngine(max_workers=self.max_workers) as engine:
+            for project in projects:
+                self._submit_project_tasks(engine, project, start_date, end_date, match_ctx, user_data)
+            engine.run_until_complete(on_group_done=on_project_done)
+        
+        return user_data
+    
+    def _submit_project_tasks(self, engine: ConcurrentFetchEngine, project: Any,
+                              start_date: Optional[str], end_date: Optional[str],
+                              match_ctx: Dict[str, Any], user_data: Dict[str, Any]) -> None:
+        """
+        提交單一專案的所有抓取任務
+        
+        列表類任務（commits、MRs、成員、貢獻者）直接提交；commits 與 MRs 逐頁取得，
+        每頁完成後即由回呼提交該頁的明細任務，全部任務共用引擎的並行額度。
+        
+        Args:
+            engine: 共用的抓取引擎
+            project: 專案物件
+            start_date: 開始日期
+            end_date: 結束日期
+            match_ctx: 使用者匹配條件
+            user_data: 結果容器（只會在回呼中寫入）
+        """
+        
+        # 多個作者篩選條件可能回傳同一個 commit，在回呼中去重
+        seen_commits = set()
+        
+        def on_commits_listed(commits, error):
+            if error:
+                self.progress.report_warning(f"Failed to list commits for {project.name}: {error}")
+                return
             for commit in commits:
-                # 改善匹配邏輯：使用 email 優先，其次 name，最後 username
-                if username:
-                    match = False
-                    if target_email and commit.author_email == target_email:
-                        match = True
-                    elif target_name and commit.author_name == target_name:
-                        match = True
-                    elif commit.author_name == username:
-                        match = True
-                    
-                    if not match:
-                        continue
-                
-                filtered_commits.append(commit)
-            
-            # 處理過濾後的 commits（加入進度提示）
-            if filtered_commits:
-                self.progress.report_start(f"正在處理 {len(filtered_commits)} 個 commits...")
-            
-            # 定義處理單個 commit 的函數
-            def process_commit(commit):
-                try:
-                    commit_detail = self.client.get_commit_detail(project.id, commit.id)
-                    diff = self.client.get_commit_diff(project.id, commit.id)
-                    
-                    commit_info = {
-                        'project_id': project.id,
-                        'project_name': project.name,
-                        'commit_id': commit.id,
-                        'commit_short_id': commit.short_id,
-                        'author_name': commit.author_name,
-                        'author_email': commit.author_email,
-                        'committed_date': commit.committed_date,
-                        'title': commit.title,
-                        'message': commit.message,
-                        'stats': commit_detail.stats,
-                        'diff': diff
-                    }
-                    
-                    # 收集程式碼異動
-                    code_changes = []
-                    for file_diff in diff:
-                        code_changes.append({
-                            'project_id': project.id,
-                            'project_name': project.name,
-                            'commit_id': commit.id,
-                            'author_name': commit.author_name,
-                            'author_email': commit.author_email,
-                            'file_path': file_diff.get('new_path') or file_diff.get('old_path'),
-                            'old_path': file_diff.get('old_path'),
-                            'new_path': file_diff.get('new_path'),
-                            'new_file': file_diff.get('new_file'),
-                            'renamed_file': file_diff.get('renamed_file'),
-                            'deleted_file': file_diff.get('deleted_file'),
-                            'diff': file_diff.get('diff', '')
-                        })
-                    
-                    return (commit_info, code_changes, None)
-                except Exception as e:
-                    return (None, None, f"Failed to get commit detail for {commit.id}: {e}")
-            
-            # 使用並行處理提升效能
-            max_workers = 10  # 可調整並行數量
-            completed = 0
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 提交所有任務
-                futures = {executor.submit(process_commit, commit): commit for commit in filtered_commits}
-                
-                # 處理完成的任務
-                for future in as_completed(futures):
-                    completed += 1
-                    
-                    # 每處理 10 個 commit 顯示一次進度
-                    if completed % 10 == 0 or completed == len(filtered_commits):
-                        self.progress.report_progress(completed, len(filtered_commits), f"處理 commit {completed}/{len(filtered_commits)}")
-                    
-                    commit_info, code_changes, error = future.result()
-                    
-                    if error:
-                        print(f"Warning: {error}")
-                        continue
-                    
-                    if commit_info:
-                        user_data['commits'].append(commit_info)
-                    
-                    if code_changes:
-                        user_data['code_changes'].extend(code_changes)
-            
-            # 獲取 Merge Requests
-            mrs = self.client.get_project_merge_requests(
-                project.id,
-                updated_after=start_date,
-                updated_before=end_date
-            )
-            
-            # 過濾符合條件的 MRs
-            filtered_mrs = []
+                if commit.id in seen_commits:
+                    continue
+                seen_commits.add(commit.id)
+                if self._match_commit(commit, match_ctx):
+                    engine.submit(self._process_commit, project, commit,
+                                  on_done=partial(on_commit_processed, commit), group=project.id)
+        
+        def on_commit_processed(commit, result, error):
+            if error:
+                self.progress.report_warning(f"Failed to get commit detail for {commit.id}: {error}")
+                return
+            commit_info, code_changes = result
+            if self.diff_mode == 'full':
+                # diff 原文立即寫入側檔，記憶體中只保留參照編號
+                for change in code_changes:
+                    diff_text = change.pop('diff', '')
+                    change['diff_ref'] = diff_writer.write(diff_text) if diff_writer else None
+            user_data['commits'].append(commit_info)
+            user_data['code_changes'].extend(code_changes)
+        
+        def on_mrs_listed(mrs, error):
+            if error:
+                self.progress.report_warning(f"Failed to list merge requests for {project.name}: {error}")
+                return
             for mr in mrs:
-                # 改善匹配邏輯：使用 username 匹配
-                if username:
-                    match = False
-                    if target_username and mr.author['username'] == target_username:
-                        match = True
-                    elif mr.author['username'] == username:
-                        match = True
-                    
-                    if not match:
-                        continue
-                
-                filtered_mrs.append(mr)
-            
-            # 處理過濾後的 MRs（使用並行處理）
-            if filtered_mrs:
-                self.progress.report_start(f"正在處理 {len(filtered_mrs)} 個 Merge Requests...")
-            
-            # 定義處理單個 MR 的函數
-            def process_mr(mr):
-                try:
-                    mr_detail = self.client.get_merge_request_detail(project.id, mr.iid)
-                    discussions = self.client.get_merge_request_discussions(project.id, mr.iid)
-                    
-                    mr_info = {
-                        'project_id': project.id,
-                        'project_name': project.name,
-                        'mr_iid': mr.iid,
-                        'title': mr.title,
-                        'state': mr.state,
-                        'author': mr.author['username'],
-                        'created_at': mr.created_at,
-                        'updated_at': mr.updated_at,
-                        'merged_at': getattr(mr, 'merged_at', None),
-                        'source_branch': mr.source_branch,
-                        'target_branch': mr.target_branch,
-                        'upvotes': mr.upvotes,
-                        'downvotes': mr.downvotes,
-                        'discussion_count': len(discussions)
-                    }
-                    
-                    # 分析 Code Review
-                    code_reviews = []
-                    for discussion in discussions:
-                        for note in discussion.attributes.get('notes', []):
-                            code_reviews.append({
-                                'project_id': project.id,
-                                'project_name': project.name,
-                                'mr_iid': mr.iid,
-                                'author': note.get('author', {}).get('username', ''),
-                                'created_at': note.get('created_at', ''),
-                                'body': note.get('body', ''),
-                                'type': note.get('type', ''),
-                                'resolvable': note.get('resolvable', False),
-                                'resolved': note.get('resolved', False)
-                            })
-                    
-                    return (mr_info, code_reviews, None)
-                except Exception as e:
-                    return (None, None, f"Failed to get MR detail for {mr.iid}: {e}")
-            
-            # 使用並行處理提升效能
-            max_workers = 10  # 可調整並行數量
-            mr_completed = 0
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 提交所有任務
-                futures = {executor.submit(process_mr, mr): mr for mr in filtered_mrs}
-                
-                # 處理完成的任務
-                for future in as_completed(futures):
-                    mr_completed += 1
-                    
-                    # 每處理 10 個 MR 顯示一次進度
-                    if mr_completed % 10 == 0 or mr_completed == len(filtered_mrs):
-                        self.progress.report_progress(mr_completed, len(filtered_mrs), f"處理 MR {mr_completed}/{len(filtered_mrs)}")
-                    
-                    mr_info, code_reviews, error = future.result()
-                    
-                    if error:
-                        print(f"Warning: {error}")
-                        continue
-                    
-                    if mr_info:
-                        user_data['merge_requests'].append(mr_info)
-                    
-                    if code_reviews:
-                        user_data['code_reviews'].extend(code_reviews)
-            
-            # 獲取專案授權資訊和貢獻者統計
-            try:
-                project_detail = self.client.get_project(project.id)
-                
-                # 獲取成員資訊（加入超時保護）
-                members = []
-                try:
-                    with ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(project_detail.members.list, all=True)
-                        members = future.result(timeout=30)  # 30秒超時
-                except FutureTimeoutError:
-                    self.progress.report_warning(f"獲取專案 {project.name} 成員列表超時 (30秒)，跳過此項目")
-                except Exception as e:
-                    self.progress.report_warning(f"獲取專案 {project.name} 成員列表失敗: {e}")
-                
-                for member in members:
-                    # 改善匹配邏輯：使用 username 匹配
-                    if username:
-                        match = False
-                        if target_username and member.username == target_username:
-                            match = True
-                        elif member.username == username:
-                            match = True
-                        
-                        if not match:
-                            continue
-                    
+                if self._match_merge_request(mr, match_ctx):
+                    engine.submit(self._process_merge_request, project, mr,
+                                  on_done=partial(on_mr_processed, mr), group=project.id)
+        
+        def on_mr_processed(mr, result, error):
+            if error:
+                self.progress.report_warning(f"Failed to get MR detail for {mr.iid}: {error}")
+                return
+            mr_info, code_reviews = result
+            user_data['merge_requests'].append(mr_info)
+            user_data['code_reviews'].extend(code_reviews)
+        
+        def on_members_listed(members, error):
+            if error:
+                self._report_request_error(project, '成員列表', error)
+                return
+            for member in members:
+                if self._match_member(member, match_ctx):
                     user_data['permissions'].append({
                         'project_id': project.id,
                         'project_name': project.name,
@@ -677,33 +756,13 @@ class UserDataFetcher(IDataFetcher):
                         'access_level_name': AccessLevelUtil.get_level_name(member.access_level),
                         'expires_at': getattr(member, 'expires_at', None)
                     })
-                
-                # 獲取專案貢獻者統計（加入超時保護）
-                contributors = []
-                try:
-                    # 使用 ThreadPoolExecutor 加入超時機制
-                    with ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(project_detail.repository_contributors)
-                        contributors = future.result(timeout=30)  # 30秒超時
-                except FutureTimeoutError:
-                    self.progress.report_warning(f"獲取專案 {project.name} 貢獻者統計超時 (30秒)，跳過此項目")
-                except Exception as e:
-                    self.progress.report_warning(f"獲取專案 {project.name} 貢獻者統計失敗: {e}")
-                
-                for contributor in contributors:
-                    # 如果指定了使用者，只獲取該使用者的統計
-                    if username:
-                        match = False
-                        if target_email and contributor.get('email') == target_email:
-                            match = True
-                        elif target_name and contributor.get('name') == target_name:
-                            match = True
-                        elif contributor.get('name') == username:
-                            match = True
-                        
-                        if not match:
-                            continue
-                    
+        
+        def on_contributors_listed(contributors, error):
+            if error:
+                self._report_request_error(project, '貢獻者統計', error)
+                return
+            for contributor in contributors:
+                if self._match_contributor(contributor, match_ctx):
                     user_data['contributors'].append({
                         'project_id': project.id,
                         'project_name': project.name,
@@ -713,10 +772,202 @@ class UserDataFetcher(IDataFetcher):
                         'total_additions': contributor.get('additions', 0),
                         'total_deletions': contributor.get('deletions', 0)
                     })
-            except Exception as e:
-                self.progress.report_warning(f"Failed to get project details/contributors for {project.name}: {e}")
         
-        return user_data
+        for author in self._commit_author_filters(match_ctx):
+            engine.submit_pages(self.client.iter_project_commits(project.id, since=start_date, until=end_date,
+                                                                 author=author),
+                                on_page=on_commits_listed, group=project.id)
+        engine.submit_pages(self.client.iter_project_merge_requests(project.id, updated_after=start_date,
+                                                                    updated_before=end_date,
+                                                                    author_id=match_ctx['user_id'],
+                                                                    author_username=match_ctx['target_username']),
+                            on_page=on_mrs_listed, group=project.id)
+        engine.submit(self.client.get_project_members, project.id, timeout=self.request_timeout,
+                      on_done=on_members_listed, group=project.id)
+        engine.submit(self.client.get_project_contributors, project.id, timeout=self.request_timeout,
+                      on_done=on_contributors_listed, group=project.id)
+    
+    def _report_request_error(self, project: Any, item: str, error: Exception) -> None:
+        """回報成員 / 貢獻者請求失敗（區分逾時與其他錯誤）"""
+        if isinstance(error, requests.exceptions.Timeout):
+            self.progress.report_warning(
+                f"獲取專案 {project.name} {item}超時 ({self.request_timeout}秒)，跳過此項目"
+            )
+        else:
+            self.progress.report_warning(f"獲取專案 {project.name} {item}失敗: {error}")
+    
+    # ---------- 匹配邏輯：使用 email 優先，其次 name，最後 username ----------
+    
+    @staticmethod
+    def _commit_author_filters(ctx: Dict[str, Any]) -> List[Optional[str]]:
+        """
+        伺服器端 commit 作者篩選條件（未指定使用者時不篩選）
+        
+        commit 作者只有名稱與 email，與 GitLab 帳號沒有關聯；GitLab 的 author 參數
+        一次只能比對一個值，因此每個已知身分各查詢一次，結果再由 _match_commit 精確比對。
+        """
+        if not ctx['username']:
+            return [None]
+        identities = [ctx['target_email'], ctx['target_name'], ctx['username']]
+        return list(dict.fromkeys(value for value in identities if value))
+    
+    @staticmethod
+    def _match_commit(commit: Any, ctx: Dict[str, Any]) -> bool:
+        """判斷 commit 是否屬於目標使用者"""
+        if not ctx['username']:
+            return True
+        if ctx['target_email'] and commit.author_email == ctx['target_email']:
+            return True
+        if ctx['target_name'] and commit.author_name == ctx['target_name']:
+            return True
+        return commit.author_name == ctx['username']
+    
+    @staticmethod
+    def _match_merge_request(mr: Any, ctx: Dict[str, Any]) -> bool:
+        """判斷 MR 是否由目標使用者建立"""
+        if not ctx['username']:
+            return True
+        if ctx['target_username'] and mr.author['username'] == ctx['target_username']:
+            return True
+        return mr.author['username'] == ctx['username']
+    
+    @staticmethod
+    def _match_member(member: Any, ctx: Dict[str, Any]) -> bool:
+        """判斷專案成員是否為目標使用者"""
+        if not ctx['username']:
+            return True
+        if ctx['target_username'] and member.username == ctx['target_username']:
+            return True
+        return member.username == ctx['username']
+    
+    @staticmethod
+    def _match_contributor(contributor: Dict[str, Any], ctx: Dict[str, Any]) -> bool:
+        """判斷貢獻者統計是否屬於目標使用者"""
+        if not ctx['username']:
+            return True
+        if ctx['target_email'] and contributor.get('email') == ctx['target_email']:
+            return True
+        if ctx['target_name'] and contributor.get('name') == ctx['target_name']:
+            return True
+        return contributor.get('name') == ctx['username']
+    
+    # ---------- 明細處理（在執行緒池中執行） ----------
+    
+    @staticmethod
+    def _count_diff_lines(diff_text: str) -> tuple:
+        """
+        計算單一檔案 diff 的新增 / 刪除行數
+        
+        Args:
+            diff_text: GitLab 回傳的 unified diff（不含 ---/+++ 檔頭）
+        
+        Returns:
+            (additions, deletions)
+        """
+        additions = deletions = 0
+        for line in diff_text.splitlines():
+            if line.startswith('+'):
+                additions += 1
+            elif line.startswith('-'):
+                deletions += 1
+        return additions, deletions
+    
+    def _process_commit(self, project: Any, commit: Any) -> tuple:
+        """
+        取得單個 commit 的明細與 diff
+        
+        commit 記錄不保留 diff；code_changes 依 diff 模式只保留每個檔案的行數統計，
+        full 模式另外帶上 diff 原文，由回呼立即寫入側檔。
+        
+        Returns:
+            (commit_info, code_changes)
+        """
+        commit_detail = self.client.get_commit_detail(project.id, commit.id)
+        diff = self.client.get_commit_diff(project.id, commit.id) if self.diff_mode != 'none' else []
+        
+        commit_info = {
+            'project_id': project.id,
+            'project_name': project.name,
+            'commit_id': commit.id,
+            'commit_short_id': commit.short_id,
+            'author_name': commit.author_name,
+            'author_email': commit.author_email,
+            'committed_date': commit.committed_date,
+            'title': commit.title,
+            'message': commit.message,
+            'stats': commit_detail.stats
+        }
+        
+        # 收集程式碼異動
+        code_changes = []
+        for file_diff in diff:
+            diff_text = file_diff.get('diff') or ''
+            additions, deletions = self._count_diff_lines(diff_text)
+            change = {
+                'project_id': project.id,
+                'project_name': project.name,
+                'commit_id': commit.id,
+                'author_name': commit.author_name,
+                'author_email': commit.author_email,
+                'file_path': file_diff.get('new_path') or file_diff.get('old_path'),
+                'old_path': file_diff.get('old_path'),
+                'new_path': file_diff.get('new_path'),
+                'new_file': file_diff.get('new_file'),
+                'renamed_file': file_diff.get('renamed_file'),
+                'deleted_file': file_diff.get('deleted_file'),
+                'additions': additions,
+                'deletions': deletions
+            }
+            if self.diff_mode == 'full':
+                change['diff'] = diff_text
+            code_changes.append(change)
+        
+        return (commit_info, code_changes)
+    
+    def _process_merge_request(self, project: Any, mr: Any) -> tuple:
+        """
+        取得單個 MR 的明細與討論
+        
+        Returns:
+            (mr_info, code_reviews)
+        """
+        mr_detail = self.client.get_merge_request_detail(project.id, mr.iid)
+        discussions = self.client.get_merge_request_discussions(project.id, mr.iid)
+        
+        mr_info = {
+            'project_id': project.id,
+            'project_name': project.name,
+            'mr_iid': mr.iid,
+            'title': mr.title,
+            'state': mr.state,
+            'author': mr.author['username'],
+            'created_at': mr.created_at,
+            'updated_at': mr.updated_at,
+            'merged_at': getattr(mr, 'merged_at', None),
+            'source_branch': mr.source_branch,
+            'target_branch': mr.target_branch,
+            'upvotes': mr.upvotes,
+            'downvotes': mr.downvotes,
+            'discussion_count': len(discussions)
+        }
+        
+        # 分析 Code Review
+        code_reviews = []
+        for discussion in discussions:
+            for note in discussion.attributes.get('notes', []):
+                code_reviews.append({
+                    'project_id': project.id,
+                    'project_name': project.name,
+                    'mr_iid': mr.iid,
+                    'author': note.get('author', {}).get('username', ''),
+                    'created_at': note.get('created_at', ''),
+                    'body': note.get('body', ''),
+                    'type': note.get('type', ''),
+                    'resolvable': note.get('resolvable', False),
+                    'resolved': note.get('resolved', False)
+                })
+        
+        return (mr_info, code_reviews)
 
 
 class UserProjectsFetcher(IDataFetcher):
@@ -815,11 +1066,31 @@ class UserProjectsFetcher(IDataFetcher):
 
 
 class GroupDataFetcher(IDataFetcher):
-    """群組資料獲取器（包含子群組、專案、授權資訊）"""
+    """
+    群組資料獲取器（包含子群組、專案、授權資訊）
     
-    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None):
+    以廣度優先走訪群組階層：每個群組的明細、成員、子群組、專案列表同時提交到
+    共用的 ConcurrentFetchEngine，子群組在列表回呼中加入佇列；同一群組或專案
+    只會抓取一次（專案可能分享到多個群組），專案授權請求也共用同一個並行額度。
+    """
+    
+    def __init__(self, client: GitLabClient, progress_reporter: Optional[IProgressReporter] = None,
+                 max_workers: int = 10, recursive: bool = False,
+                 resolver: Optional[PermissionResolver] = None):
+        """
+        Args:
+            client: GitLab 客戶端
+            progress_reporter: 進度報告器
+            max_workers: 全域並行請求上限
+            recursive: 是否遞迴走訪符合條件群組的所有子孫群組
+            resolver: 有效權限解析器 (可選，指定後專案授權改為含繼承與分享群組的有效權限，
+                      群組成員與解析器共用快取)
+        """
         self.client = client
         self.progress = progress_reporter or SilentProgressReporter()
+        self.max_workers = max_workers
+        self.recursive = recursive
+        self.resolver = resolver
     
     def fetch(self, group_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -835,152 +1106,238 @@ class GroupDataFetcher(IDataFetcher):
         groups = self.client.get_groups(group_name=group_name)
         self.progress.report_complete(f"找到 {len(groups)} 個群組")
         
-        groups_data = []
-        subgroups_data = []
-        projects_data = []
-        permissions_data = []
+        data = {
+            'groups': [],
+            'subgroups': [],
+            'projects': [],
+            'permissions': []
+        }
+        if not groups:
+            return data
         
-        if groups:
-            self.progress.report_start(f"正在分析 {len(groups)} 個群組...")
+        mode = "，遞迴走訪子群組" if self.recursive else ""
+        self.progress.report_start(
+            f"正在分析 {len(groups)} 個群組（全域並行上限 {self.max_workers}{mode}）..."
+        )
         
-        for idx, group in enumerate(groups, 1):
-            try:
-                self.progress.report_progress(idx, len(groups), group.name)
-                
-                # 取得完整群組資訊
-                group_detail = self.client.get_group(group.id)
+        # 走訪狀態（只在呼叫 run_until_complete 的執行緒上的回呼中修改）
+        state = {
+            'visited_groups': set(),
+            'visited_projects': set(),
+            'group_info': {},   # group_id -> 群組資訊（各任務回呼逐步填入）
+            'order': [],        # 群組發現順序，輸出時依此排序
+            'names': {},
+            'done': 0
+        }
+        
+        def on_group_done(group_id):
+            state['done'] += 1
+            self.progress.report_progress(state['done'], len(state['order']), state['names'][group_id])
+        
+        with ConcurrentFetchEngine(max_workers=self.max_workers) as engine:
+            for group in groups:
+                self._visit_group(engine, group, state, data)
+            engine.run_until_complete(on_group_done=on_group_done)
+        
+        data['groups'] = [
+            state['group_info'][group_id] for group_id in state['order']
+            if 'group_id' in state['group_info'][group_id]
+        ]
+        return data
+    
+    def _visit_group(self, engine: ConcurrentFetchEngine, group: Any,
+                     state: Dict[str, Any], data: Dict[str, List]) -> None:
+        """
+        提交單一群組的抓取任務（已走訪的群組略過）
+        
+        Args:
+            engine: 共用的抓取引擎
+            group: 群組物件（列表項目即可，明細另外取得）
+            state: 走訪狀態
+            data: 結果容器（只會在回呼中寫入）
+        """
+        if group.id in state['visited_groups']:
+            return
+        state['visited_groups'].add(group.id)
+        state['order'].append(group.id)
+        state['names'][group.id] = group.name
+        
+        # 明細與各列表各自完成後填入；group_id 等基本欄位由明細回呼寫入
+        group_info = state['group_info'].setdefault(group.id, {})
+        
+        def on_detail(group_detail, error):
+            if error:
+                self.progress.report_warning(f"Failed to fetch group {group.name}: {error}")
+                return
+            group_info.update({
+                'group_id': group_detail.id,
+                'group_name': group_detail.name,
+                'group_path': group_detail.path,
+                'group_full_path': group_detail.full_path,
+                'description': getattr(group_detail, 'description', ''),
+                'visibility': getattr(group_detail, 'visibility', ''),
+                'created_at': getattr(group_detail, 'created_at', ''),
+                'web_url': getattr(group_detail, 'web_url', ''),
+                'parent_id': getattr(group_detail, 'parent_id', None),
+            })
+        
+        def on_members(members, error):
+            if error:
+                self.progress.report_warning(f"Failed to fetch members of group {group.name}: {error}")
+                members = []
+            group_info['total_members'] = len(members)
+            group_info['owners'] = len([m for m in members if m.access_level == 50])
+            group_info['maintainers'] = len([m for m in members if m.access_level == 40])
+            group_info['developers'] = len([m for m in members if m.access_level == 30])
+            group_info['reporters'] = len([m for m in members if m.access_level == 20])
+            group_info['guests'] = len([m for m in members if m.access_level == 10])
+            
+            # 群組成員授權資訊
+            for member in members:
+                data['permissions'].append({
+                    'group_id': group.id,
+                    'group_name': group.name,
+                    'resource_type': 'Group',
+                    'member_id': member.id,
+                    'member_name': getattr(member, 'name', ''),
+                    'member_username': member.username,
+                    'member_email': getattr(member, 'email', ''),
+                    'access_level': member.access_level,
+                    'access_level_name': AccessLevelUtil.get_level_name(member.access_level),
+                    'expires_at': getattr(member, 'expires_at', None)
+                })
+        
+        def on_subgroups(subgroups, error):
+            subgroups = [] if error else subgroups
+            group_info['subgroups_count'] = len(subgroups)
+            for subgroup in subgroups:
+                data['subgroups'].append({
+                    'parent_group_id': group.id,
+                    'parent_group_name': group.name,
+                    'subgroup_id': subgroup.id,
+                    'subgroup_name': subgroup.name,
+                    'subgroup_path': subgroup.path,
+                    'subgroup_full_path': subgroup.full_path,
+                    'description': getattr(subgroup, 'description', ''),
+                    'visibility': getattr(subgroup, 'visibility', ''),
+                    'web_url': getattr(subgroup, 'web_url', ''),
+                })
+                # 廣度優先：子群組加入同一個引擎的佇列
+                if self.recursive:
+                    self._visit_group(engine, subgroup, state, data)
+        
+        def on_projects(projects, error):
+            projects = [] if error else projects
+            group_info['projects_count'] = len(projects)
+            for project in projects:
+                data['projects'].append({
+                    'group_id': group.id,
+                    'group_name': group.name,
+                    'project_id': project.id,
+                    'project_name': project.name,
+                    'project_path': project.path,
+                    'description': getattr(project, 'description', ''),
+                    'visibility': getattr(project, 'visibility', ''),
+                    'created_at': getattr(project, 'created_at', ''),
+                    'last_activity_at': getattr(project, 'last_activity_at', ''),
+                    'web_url': getattr(project, 'web_url', ''),
+                })
                 
-                # 群組基本資訊
-                group_info = {
-                    'group_id': group_detail.id,
-                    'group_name': group_detail.name,
-                    'group_path': group_detail.path,
-                    'group_full_path': group_detail.full_path,
-                    'description': getattr(group_detail, 'description', ''),
-                    'visibility': getattr(group_detail, 'visibility', ''),
-                    'created_at': getattr(group_detail, 'created_at', ''),
-                    'web_url': getattr(group_detail, 'web_url', ''),
-                    'parent_id': getattr(group_detail, 'parent_id', None),
+                # 分享到多個群組的專案，授權只抓取一次
+                if project.id not in state['visited_projects']:
+                    state['visited_projects'].add(project.id)
+                    engine.submit(self._fetch_project_permissions, project, group,
+                                  on_done=partial(on_project_permissions, project))
+        
+        def on_project_permissions(project, result, error):
+            if error:
+                self.progress.report_warning(f"Failed to get permissions for project {project.name}: {error}")
+                return
+            data['permissions'].extend(result)
+        
+        engine.submit(self.client.get_group, group.id, on_done=on_detail, group=group.id)
+        get_members = self.resolver.get_group_members if self.resolver else self.client.get_group_members
+        engine.submit(get_members, group.id, on_done=on_members, group=group.id)
+        engine.submit(self.client.get_group_subgroups, group.id, on_done=on_subgroups, group=group.id)
+        engine.submit(self.client.get_group_projects, group.id, on_done=on_projects, group=group.id)
+    
+    def _fetch_project_permissions(self, project: Any, listed_in: Any) -> List[Dict[str, Any]]:
+        """
+        取得專案成員與共享群組授權（在執行緒池中執行）
+        
+        授權記錄歸屬於專案所在的群組（namespace）；取不到時歸屬於列出此專案的群組。
+        
+        Args:
+            project: 專案物件
+            listed_in: 列出此專案的群組
+        
+        Returns:
+            授權記錄列表
+        """
+        namespace = getattr(project, 'namespace', None) or {}
+        if namespace.get('kind') == 'group':
+            owner = {'group_id': namespace['id'], 'group_name': namespace.get('name', '')}
+        else:
+            owner = {'group_id': listed_in.id, 'group_name': listed_in.name}
+        
+        project_detail = self.client.get_project(project.id)
+        
+        # 有效權限：展開繼承與分享群組，標示每位成員的權限來源
+        if self.resolver:
+            return [
+                {
+                    **owner,
+                    'resource_type': 'Project',
+                    'resource_id': project.id,
+                    'resource_name': project.name,
+                    'member_id': access['member_id'],
+                    'member_name': access['member_name'],
+                    'member_username': access['member_username'],
+                    'member_email': access['member_email'],
+                    'access_level': access['access_level'],
+                    'access_level_name': AccessLevelUtil.get_level_name(access['access_level']),
+                    'expires_at': access['expires_at'],
+                    'access_source': access['access_source'],
+                    'access_source_name': access['access_source_name']
                 }
-                
-                # 取得群組成員
-                members = self.client.get_group_members(group_detail.id)
-                group_info['total_members'] = len(members)
-                group_info['owners'] = len([m for m in members if m.access_level == 50])
-                group_info['maintainers'] = len([m for m in members if m.access_level == 40])
-                group_info['developers'] = len([m for m in members if m.access_level == 30])
-                group_info['reporters'] = len([m for m in members if m.access_level == 20])
-                group_info['guests'] = len([m for m in members if m.access_level == 10])
-                
-                # 群組成員授權資訊
-                for member in members:
-                    permissions_data.append({
-                        'group_id': group_detail.id,
-                        'group_name': group_detail.name,
-                        'resource_type': 'Group',
-                        'member_id': member.id,
-                        'member_name': getattr(member, 'name', ''),
-                        'member_username': member.username,
-                        'member_email': getattr(member, 'email', ''),
-                        'access_level': member.access_level,
-                        'access_level_name': AccessLevelUtil.get_level_name(member.access_level),
-                        'expires_at': getattr(member, 'expires_at', None)
-                    })
-                
-                # 取得子群組
-                try:
-                    subgroups = self.client.get_group_subgroups(group_detail.id)
-                    group_info['subgroups_count'] = len(subgroups)
-                    
-                    for subgroup in subgroups:
-                        subgroups_data.append({
-                            'parent_group_id': group_detail.id,
-                            'parent_group_name': group_detail.name,
-                            'subgroup_id': subgroup.id,
-                            'subgroup_name': subgroup.name,
-                            'subgroup_path': subgroup.path,
-                            'subgroup_full_path': subgroup.full_path,
-                            'description': getattr(subgroup, 'description', ''),
-                            'visibility': getattr(subgroup, 'visibility', ''),
-                            'web_url': getattr(subgroup, 'web_url', ''),
-                        })
-                except:
-                    group_info['subgroups_count'] = 0
-                
-                # 取得群組專案
-                try:
-                    projects = self.client.get_group_projects(group_detail.id)
-                    group_info['projects_count'] = len(projects)
-                    
-                    for project in projects:
-                        project_info = {
-                            'group_id': group_detail.id,
-                            'group_name': group_detail.name,
-                            'project_id': project.id,
-                            'project_name': project.name,
-                            'project_path': project.path,
-                            'description': getattr(project, 'description', ''),
-                            'visibility': getattr(project, 'visibility', ''),
-                            'created_at': getattr(project, 'created_at', ''),
-                            'last_activity_at': getattr(project, 'last_activity_at', ''),
-                            'web_url': getattr(project, 'web_url', ''),
-                        }
-                        projects_data.append(project_info)
-                        
-                        # 取得專案成員授權
-                        try:
-                            project_detail = self.client.get_project(project.id)
-                            project_members = project_detail.members.list(all=True)
-                            
-                            for member in project_members:
-                                permissions_data.append({
-                                    'group_id': group_detail.id,
-                                    'group_name': group_detail.name,
-                                    'resource_type': 'Project',
-                                    'resource_id': project.id,
-                                    'resource_name': project.name,
-                                    'member_id': member.id,
-                                    'member_name': getattr(member, 'name', ''),
-                                    'member_username': member.username,
-                                    'member_email': getattr(member, 'email', ''),
-                                    'access_level': member.access_level,
-                                    'access_level_name': AccessLevelUtil.get_level_name(member.access_level),
-                                    'expires_at': getattr(member, 'expires_at', None)
-                                })
-                            
-                            # 取得共享給群組的授權
-                            shared_groups = getattr(project_detail, 'shared_with_groups', [])
-                            for shared_group in shared_groups:
-                                permissions_data.append({
-                                    'group_id': group_detail.id,
-                                    'group_name': group_detail.name,
-                                    'resource_type': 'Project',
-                                    'resource_id': project.id,
-                                    'resource_name': project.name,
-                                    'member_id': shared_group.get('group_id'),
-                                    'member_name': shared_group.get('group_name'),
-                                    'member_username': '',
-                                    'member_email': '',
-                                    'access_level': shared_group.get('group_access_level'),
-                                    'access_level_name': AccessLevelUtil.get_level_name(shared_group.get('group_access_level')),
-                                    'expires_at': shared_group.get('expires_at', None)
-                                })
-                        except Exception as e:
-                            self.progress.report_warning(f"Failed to get permissions for project {project.name}: {e}")
-                except:
-                    group_info['projects_count'] = 0
-                
-                groups_data.append(group_info)
-                
-            except Exception as e:
-                self.progress.report_warning(f"Failed to fetch group {group.name}: {e}")
+                for access in self.resolver.resolve_project(project_detail)
+            ]
+        
+        project_members = project_detail.members.list(all=True)
+        
+        permissions = []
+        for member in project_members:
+            permissions.append({
+                **owner,
+                'resource_type': 'Project',
+                'resource_id': project.id,
+                'resource_name': project.name,
+                'member_id': member.id,
+                'member_name': getattr(member, 'name', ''),
+                'member_username': member.username,
+                'member_email': getattr(member, 'email', ''),
+                'access_level': member.access_level,
+                'access_level_name': AccessLevelUtil.get_level_name(member.access_level),
+                'expires_at': getattr(member, 'expires_at', None)
+            })
         
-        return {
-            'groups': groups_data,
-            'subgroups': subgroups_data,
-            'projects': projects_data,
-            'permissions': permissions_data
-        }
+        # 取得共享給群組的授權
+        shared_groups = getattr(project_detail, 'shared_with_groups', [])
+        for shared_group in shared_groups:
+            permissions.append({
+                **owner,
+                'resource_type': 'Project',
+                'resource_id': project.id,
+                'resource_name': project.name,
+                'member_id': shared_group.get('group_id'),
+                'member_name': shared_group.get('group_name'),
+                'member_username': '',
+                'member_email': '',
+                'access_level': shared_group.get('group_access_level'),
+                'access_level_name': AccessLevelUtil.get_level_name(shared_group.get('group_access_level')),
+                'expires_at': shared_group.get('expires_at', None)
+            })
+        return permissions
 
 
 # ==================== 資料處理器 (單一職責原則) ====================
@@ -1106,11 +1463,8 @@ class UserDataProcessor(IDataProcessor):
         else:
             result['commits'] = pd.DataFrame()
         
-        # 處理程式碼異動
-        if user_data['code_changes']:
-            result['code_changes'] = pd.DataFrame(user_data['code_changes'])
-        else:
-            result['code_changes'] = pd.DataFrame()
+        # 程式碼異動（含 diff 原文）不建立 DataFrame，由服務直接串流匯出；統計只需要每位作者的檔案數
+        files_changed = Counter(change['author_name'] for change in user_data['code_changes'])
         
         # 處理 Merge Requests
         if user_data['merge_requests']:
@@ -1131,18 +1485,25 @@ class UserDataProcessor(IDataProcessor):
             result['permissions'] = pd.DataFrame()
         
         # 產生統計資料（包含授權統計）
-        result['statistics'] = self._generate_statistics(result)
+        result['statistics'] = self._generate_statistics(result, files_changed)
         
         return result
     
-    def _generate_statistics(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """產生統計資料（包含授權統計、貢獻者統計和事件統計）"""
+    def _generate_statistics(self, data: Dict[str, pd.DataFrame],
+                             files_changed: Optional[Counter] = None) -> pd.DataFrame:
+        """
+        產生統計資料（包含授權統計、貢獻者統計和事件統計）
+        
+        Args:
+            data: 各類資料的 DataFrame
+            files_changed: 每位作者異動的檔案數
+        """
+        files_changed = files_changed or Counter()
         stats = []
         
         commits_df = data.get('commits', pd.DataFrame())
         mrs_df = data.get('merge_requests', pd.DataFrame())
         reviews_df = data.get('code_reviews', pd.DataFrame())
-        changes_df = data.get('code_changes', pd.DataFrame())
         permissions_df = data.get('permissions', pd.DataFrame())
         contributors_df = data.get('contributors', pd.DataFrame())
         events_df = data.get('user_events', pd.DataFrame())
@@ -1202,7 +1563,7 @@ class UserDataProcessor(IDataProcessor):
                     'merged_mrs': len(author_mrs[author_mrs['state'] == 'merged']) if not author_mrs.empty else 0,
                     'projects_contributed': author_commits['project_name'].nunique(),
                     'total_code_reviews': len(reviews_df[reviews_df['author'] == author]) if not reviews_df.empty else 0,
-                    'total_files_changed': len(changes_df[changes_df['author_name'] == author]) if not changes_df.empty else 0,
+                    'total_files_changed': files_changed[author],
                     # 新增授權統計
                     'total_projects_with_access': total_projects_with_access,
                     'owner_projects': owner_projects,
@@ -1315,22 +1676,55 @@ class GroupDataProcessor(IDataProcessor):
 # ==================== 資料匯出器 (單一職責原則) ====================
 
 class DataExporter(IDataExporter):
-    """資料匯出器 - 支援 CSV"""
+    """資料匯出器 - 支援 CSV（可 gzip / zstd 壓縮）、JSONL、Parquet，分塊串流寫出"""
     
-    def __init__(self, output_dir: str = "./output"):
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, output_dir: str = "./output", output_format: str = 'csv',
+                 chunk_size: int = 5000, spill_columns: Optional[List[str]] = None):
+        """
+        Args:
+            output_dir: 輸出目錄
+            output_format: 輸出格式 (csv / csv.gz / csv.zst / jsonl / parquet)
+            chunk_size: 每次寫出的筆數
+            spill_columns: 分流到側檔的大型文字欄位 (可選，例如 ['body']，主檔只保留參照編號)
+        """
+        self.writer = StreamingExporter(output_dir, output_format=output_format,
+                                        chunk_size=chunk_size, spill_columns=spill_columns)
+        self.output_dir = self.writer.output_dir
+    
+    @property
+    def extension(self) -> str:
+        """輸出檔的副檔名（不含點）"""
+        return self.writer.extension
     
     def export(self, df: pd.DataFrame, filename: str) -> None:
-        """匯出資料到 CSV"""
+        """匯出 DataFrame"""
         if df.empty:
             print(f"Warning: No data to export for {filename}")
             return
         
-        # 匯出 CSV
-        csv_path = self.output_dir / f"{filename}.csv"
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        print(f"✓ CSV exported: {csv_path}")
+        self.writer.write_frame(df, filename)
+    
+    def open_side_file(self, filename: str, column: str) -> SpillWriter:
+        """建立大型欄位的側檔寫入器（<檔名>-<欄位>.jsonl，壓縮方式與輸出格式相同）"""
+        return self.writer.open_side_file(filename, column)
+    
+    def export_rows(self, rows: Iterable[Dict[str, Any]], filename: str,
+                    columns: Optional[List[str]] = None) -> int:
+        """
+        串流匯出資料列
+        
+        Args:
+            rows: 資料列產生器
+            filename: 檔名（不含副檔名）
+            columns: 欄位順序 (可選，預設取第一筆的欄位)
+        
+        Returns:
+            匯出的筆數
+        """
+        count = self.writer.write_rows(rows, filename, columns=columns)
+        if count == 0:
+            print(f"Warning: No data to export for {filename}")
+        return count
 
 
 # ==================== 服務層 (開放封閉原則) ====================
@@ -1347,6 +1741,33 @@ class BaseService(ABC):
     def execute(self, **kwargs) -> None:
         """執行服務"""
         pass
+    
+    def _report_client_stats(self) -> None:
+        """顯示 GitLab 客戶端的請求統計"""
+        client = getattr(self.fetcher, 'client', None)
+        if client is None or not hasattr(client, 'get_request_stats'):
+            return
+        
+        stats = client.get_request_stats()
+        if stats.get('saved_requests'):
+            print(f"✓ 節省 API 請求: {stats['saved_requests']} 次（lazy handle）")
+        if 'cache_hits' in stats:
+            print(f"✓ 回應快取: 命中 {stats['cache_hits']} 次、"
+                  f"重新驗證 {stats['cache_revalidated']} 次、重新下載 {stats['cache_misses']} 次")
+        if stats.get('throttle_waits'):
+            print(f"✓ 請求節流: 等待 {stats['throttle_waits']} 次、共 {stats['throttle_wait_seconds']:.1f} 秒"
+                  f"（伺服器限流 {stats['throttle_throttled']} 次）")
+        
+        if stats.get('pool_requests'):
+            reuse_rate = stats['pool_reused'] / stats['pool_requests'] * 100
+            print(f"✓ 連線池: 請求 {stats['pool_requests']} 次、重用連線 {stats['pool_reused']} 次 ({reuse_rate:.0f}%)、"
+                  f"新建連線 {stats['pool_new_connections']} 次、重試 {stats['pool_retries']} 次")
+        
+        resolver = getattr(self.fetcher, 'resolver', None)
+        if resolver is not None:
+            resolver_stats = resolver.get_stats()
+            print(f"✓ 有效權限解析: {resolver_stats['projects']} 個專案、群組請求 {resolver_stats['group_requests']} 次、"
+                  f"查詢直接成員 {resolver_stats['direct_lookups']} 次")
 
 
 class ProjectStatsService(BaseService):
@@ -1386,6 +1807,8 @@ class ProjectStatsService(BaseService):
         
         print(f"✓ Total projects: {len(processed_data['projects'])}")
         
+        self._report_client_stats()
+        
         elapsed_time = time.time() - start_time
         print(f"✓ 執行時間: {elapsed_time:.2f} 秒")
         print("=" * 70)
@@ -1422,6 +1845,8 @@ class ProjectPermissionService(BaseService):
         
         print(f"\n✓ Total permission records: {len(df)}")
         
+        self._report_client_stats()
+        
         elapsed_time = time.time() - start_time
         print(f"✓ 執行時間: {elapsed_time:.2f} 秒")
         print("=" * 70)
@@ -1434,7 +1859,8 @@ class UserStatsService(BaseService):
                 project_name: Optional[str] = None,
                 start_date: Optional[str] = None,
                 end_date: Optional[str] = None,
-                group_id: Optional[int] = None) -> None:
+                group_id: Optional[int] = None,
+                prune_by_events: bool = False) -> None:
         """執行使用者統計"""
         start_time = time.time()
         
@@ -1468,20 +1894,7 @@ class UserStatsService(BaseService):
         if project_name:
             print(f"\n📂 查詢範圍：專案 '{project_name}'")
         
-        # 獲取資料
-        user_data = self.fetcher.fetch(
-            username=username,
-            project_name=project_name,
-            start_date=start_date,
-            end_date=end_date,
-            group_id=group_id,
-            user_info=user_info  # 傳遞使用者資訊以便精確匹配
-        )
-        
-        # 處理資料
-        processed_data = self.processor.process(user_data)
-        
-        # 匯出資料
+        # 匯出檔名
         if username and project_name:
             base_filename = f"{username}-{project_name}-user"
         elif username:
@@ -1491,6 +1904,33 @@ class UserStatsService(BaseService):
         else:
             base_filename = "all-users"
         
+        # full 模式：diff 原文在取得時就寫入側檔，不留在記憶體中
+        diff_writer = None
+        if getattr(self.fetcher, 'diff_mode', None) == 'full':
+            diff_writer = self.exporter.open_side_file(f"{base_filename}-code_changes", 'diff')
+        
+        # 獲取資料
+        try:
+            user_data = self.fetcher.fetch(
+                username=username,
+                project_name=project_name,
+                start_date=start_date,
+                end_date=end_date,
+                group_id=group_id,
+                user_info=user_info,  # 傳遞使用者資訊以便精確匹配
+                prune_by_events=prune_by_events,
+                diff_writer=diff_writer
+            )
+        finally:
+            if diff_writer:
+                diff_writer.close()
+        
+        if diff_writer and diff_writer.count:
+            print(f"✓ diff 原文已寫入: {diff_writer.path} ({diff_writer.count} 筆，code_changes 以 diff_ref 對應)")
+        
+        # 處理資料
+        processed_data = self.processor.process(user_data)
+        
         # 匯出各類資料並計數
         exported_count = 0
         exported_files = []  # 記錄已匯出的檔案
@@ -1501,6 +1941,13 @@ class UserStatsService(BaseService):
                 exported_files.append((data_type, filename))
                 exported_count += 1
         
+        # 程式碼異動含 diff 原文，直接從資料列串流匯出（不建立 DataFrame）
+        if user_data['code_changes']:
+            filename = f"{base_filename}-code_changes"
+            self.exporter.export_rows(user_data['code_changes'], filename)
+            exported_files.append(('code_changes', filename))
+            exported_count += 1
+        
         # 產生索引檔案
         if exported_files:
             self._generate_index_file(base_filename, exported_files)
@@ -1531,6 +1978,8 @@ class UserStatsService(BaseService):
             print("✓ 查詢完成！")
             print(f"✓ 共匯出 {exported_count} 個資料檔案")
         
+        self._report_client_stats()
+        
         elapsed_time = time.time() - start_time
         print(f"✓ 執行時間: {elapsed_time:.2f} 秒")
         print("=" * 70)
@@ -1565,7 +2014,7 @@ class UserStatsService(BaseService):
         }
         
         for data_type, filename in exported_files:
-            content += f"- [{filename}]({filename}.csv)\n"
+            content += f"- [{filename}]({filename}.{self.exporter.extension})\n"
         
         # 寫入索引檔案
         with open(index_path, 'w', encoding='utf-8') as f:
@@ -1648,6 +2097,8 @@ class UserProjectsService(BaseService):
             print("✓ 查詢完成！")
             print(f"✓ 共匯出 {exported_count} 個資料檔案")
         
+        self._report_client_stats()
+        
         elapsed_time = time.time() - start_time
         print(f"✓ 執行時間: {elapsed_time:.2f} 秒")
         print("=" * 70)
@@ -1703,6 +2154,8 @@ class GroupStatsService(BaseService):
             self.exporter.export(processed_data['permissions'], permissions_filename)
             print(f"✓ Total permission records: {len(processed_data['permissions'])}")
         
+        self._report_client_stats()
+        
         elapsed_time = time.time() - start_time
         print(f"✓ 執行時間: {elapsed_time:.2f} 秒")
         print("=" * 70)
@@ -1714,29 +2167,45 @@ class GitLabCLI:
     """GitLab CLI 主程式"""
     
     def __init__(self):
+        # 全域並行請求上限（可於 config.py 設定 MAX_WORKERS）
+        self.max_workers = getattr(config, 'MAX_WORKERS', 10)
         self.client = GitLabClient(
             gitlab_url=config.GITLAB_URL,
             private_token=config.GITLAB_TOKEN,
-            ssl_verify=False
+            ssl_verify=False,
+            # 請求節流（預設停用；可於 config.py 設定 RATE_LIMIT / RATE_LIMIT_BURST 啟用）
+            rate_limit=getattr(config, 'RATE_LIMIT', None),
+            rate_burst=getattr(config, 'RATE_LIMIT_BURST', 20),
+            # 連線池與執行緒數相同，所有執行緒都能重用 keep-alive 連線
+            pool_size=self.max_workers,
+            max_retries=getattr(config, 'MAX_RETRIES', 3),
+            connect_timeout=getattr(config, 'CONNECT_TIMEOUT', 10),
+            read_timeout=getattr(config, 'READ_TIMEOUT', 120)
         )
         self.exporter = DataExporter(output_dir=config.OUTPUT_DIR)
         self.progress = ConsoleProgressReporter()
     
-    def create_project_stats_service(self) -> ProjectStatsService:
+    def _create_resolver(self, effective_access: bool) -> Optional[PermissionResolver]:
+        """建立有效權限解析器（未啟用時回傳 None）"""
+        return PermissionResolver(self.client) if effective_access else None
+    
+    def create_project_stats_service(self, effective_access: bool = False) -> ProjectStatsService:
         """創建專案統計服務"""
-        fetcher = ProjectDataFetcher(self.client, self.progress)
+        fetcher = ProjectDataFetcher(self.client, self.progress, resolver=self._create_resolver(effective_access))
         processor = ProjectDataProcessor()
         return ProjectStatsService(fetcher, processor, self.exporter)
     
-    def create_project_permission_service(self) -> ProjectPermissionService:
+    def create_project_permission_service(self, effective_access: bool = False) -> ProjectPermissionService:
         """創建專案授權服務"""
-        fetcher = ProjectPermissionFetcher(self.client, self.progress)
+        fetcher = ProjectPermissionFetcher(self.client, self.progress,
+                                           resolver=self._create_resolver(effective_access))
         processor = ProjectPermissionProcessor()
         return ProjectPermissionService(fetcher, processor, self.exporter)
     
-    def create_user_stats_service(self) -> UserStatsService:
+    def create_user_stats_service(self, diff_mode: str = 'full') -> UserStatsService:
         """創建使用者統計服務"""
-        fetcher = UserDataFetcher(self.client, self.progress)
+        fetcher = UserDataFetcher(self.client, self.progress, max_workers=self.max_workers,
+                                  diff_mode=diff_mode)
         processor = UserDataProcessor()
         return UserStatsService(fetcher, processor, self.exporter)
     
@@ -1746,9 +2215,11 @@ class GitLabCLI:
         processor = UserProjectsProcessor()
         return UserProjectsService(fetcher, processor, self.exporter)
     
-    def create_group_stats_service(self) -> GroupStatsService:
+    def create_group_stats_service(self, recursive: bool = False,
+                                   effective_access: bool = False) -> GroupStatsService:
         """創建群組統計服務"""
-        fetcher = GroupDataFetcher(self.client, self.progress)
+        fetcher = GroupDataFetcher(self.client, self.progress, max_workers=self.max_workers,
+                                   recursive=recursive, resolver=self._create_resolver(effective_access))
         processor = GroupDataProcessor()
         return GroupStatsService(fetcher, processor, self.exporter)
     
@@ -1756,6 +2227,8 @@ class GitLabCLI:
         """執行 CLI"""
         parser = self._create_parser()
         args = parser.parse_args()
+        self._configure_client(args)
+        self._configure_exporter(args)
         
         try:
             args.func(args)
@@ -1768,6 +2241,21 @@ class GitLabCLI:
             traceback.print_exc()
             sys.exit(1)
     
+    def _configure_client(self, args) -> None:
+        """依命令列參數設定 GitLab 客戶端（回應快取）"""
+        if args.cache_dir and not args.no_cache:
+            self.client.enable_cache(args.cache_dir, ttl=args.cache_ttl)
+            print(f"✓ 已啟用回應快取: {args.cache_dir} (TTL {args.cache_ttl:.0f} 秒)")
+    
+    def _configure_exporter(self, args) -> None:
+        """依命令列參數設定匯出格式（分塊串流寫出）"""
+        self.exporter = DataExporter(
+            output_dir=config.OUTPUT_DIR,
+            output_format=args.output_format,
+            chunk_size=args.chunk_size,
+            spill_columns=args.spill_columns
+        )
+    
     def _create_parser(self) -> argparse.ArgumentParser:
         """創建參數解析器"""
         parser = argparse.ArgumentParser(
@@ -1838,15 +2326,86 @@ class GitLabCLI:
   
   # 21. 取得多個群組的資訊 🆕
   python gl-cli.py group-stats --group-name "group1" "group2" "group3"
+  
+  # 22. 只分析使用者期間內有事件的專案（單一使用者跨大量專案時大幅減少請求）
+  python gl-cli.py user-details --username alice --start-date 2024-01-01 --prune-by-events
+  
+  # 23. 取得群組及其所有子孫群組的資訊
+  python gl-cli.py group-stats --group-name "my-group" --recursive
+  
+  # 24. 稽核有效權限（含繼承與分享群組的成員，access_source 標示權限來源）
+  python gl-cli.py project-permission --project-name "my-project" --effective-access
+  
+  # 25. 以 zstd 壓縮 CSV 匯出（diff 原文側檔同樣以 zstd 壓縮）
+  python gl-cli.py user-details --username alice --output-format csv.zst
+  
+  # 26. 只保留每個檔案的新增 / 刪除行數，不保存 diff 原文（大量 commits 時記憶體最省）
+  python gl-cli.py user-details --username alice --start-date 2024-01-01 --diff-mode stats
+  
+  # 27. 啟用持久化回應快取（第二次執行相同區間幾乎不需重新下載）
+  python gl-cli.py user-details --username alice --start-date 2024-01-01 --cache-dir ./.gl-cache
   """
         )
         
+        # 所有子命令共用的參數
+        common_parser = argparse.ArgumentParser(add_help=False)
+        cache_group = common_parser.add_argument_group('回應快取')
+        cache_group.add_argument(
+            '--cache-dir',
+            type=str,
+            default=getattr(config, 'CACHE_DIR', None),
+            help='持久化回應快取目錄 (指定後啟用快取；commit 詳細資訊與 diff 永久有效)'
+        )
+        cache_group.add_argument(
+            '--cache-ttl',
+            type=float,
+            default=getattr(config, 'CACHE_TTL', 3600),
+            help='可變資源（MR、成員、列表）的快取有效秒數，過期後以 ETag 重新驗證 (預設: 3600)'
+        )
+        cache_group.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='停用回應快取（即使 config.py 設定了 CACHE_DIR）'
+        )
+        
+        output_group = common_parser.add_argument_group('輸出格式')
+        output_group.add_argument(
+            '--output-format',
+            choices=FORMATS,
+            default=getattr(config, 'OUTPUT_FORMAT', 'csv'),
+            help='輸出格式 (預設: csv；csv.zst 需要 zstandard，parquet 需要 pyarrow)'
+        )
+        output_group.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='每次寫出的筆數，記憶體只保留目前分塊 (預設: 5000)'
+        )
+        output_group.add_argument(
+            '--spill-columns',
+            nargs='*',
+            default=[],
+            metavar='COLUMN',
+            help='分流到側檔的大型文字欄位，主檔只保留 <欄位>_ref 參照編號 (例如: --spill-columns body)'
+        )
+        
+        # 輸出授權資訊的子命令共用的參數
+        access_parser = argparse.ArgumentParser(add_help=False)
+        access_parser.add_argument(
+            '--effective-access',
+            action='store_true',
+            help='輸出有效權限：展開繼承自上層群組與分享群組的成員，並以 access_source 欄位標示來源 '
+                 '(direct / inherited / shared / unknown)；群組成員只抓取一次並快取。'
+                 '稽核用途，請求數多於只列出專案成員'
+        )
+        
         subparsers = parser.add_subparsers(dest='command', help='可用的命令')
         subparsers.required = True
         
         # 1. project-stats 命令
         project_stats_parser = subparsers.add_parser(
             'project-stats',
+            parents=[common_parser, access_parser],
             help='取得專案所有資訊'
         )
         project_stats_parser.add_argument(
@@ -1865,6 +2424,7 @@ class GitLabCLI:
         # 2. project-permission 命令
         project_perm_parser = subparsers.add_parser(
             'project-permission',
+            parents=[common_parser, access_parser],
             help='取得專案授權資訊'
         )
         project_perm_parser.add_argument(
@@ -1883,6 +2443,7 @@ class GitLabCLI:
         # 3. user-details 命令
         user_stats_parser = subparsers.add_parser(
             'user-details',
+            parents=[common_parser],
             help='取得使用者資訊'
         )
         user_stats_parser.add_argument(
@@ -1912,11 +2473,25 @@ class GitLabCLI:
             type=int,
             help=f'群組 ID (預設: {config.TARGET_GROUP_ID})'
         )
+        user_stats_parser.add_argument(
+            '--prune-by-events',
+            action='store_true',
+            help='只分析使用者在期間內有事件（push、MR、留言等）的專案，大幅減少請求數 '
+                 '(需指定 --username；以其他身分推送、未產生事件的 commits 會被略過)'
+        )
+        user_stats_parser.add_argument(
+            '--diff-mode',
+            choices=UserDataFetcher.DIFF_MODES,
+            default=getattr(config, 'DIFF_MODE', 'full'),
+            help='diff 處理方式：none 不下載 diff；stats 只保留每個檔案的新增 / 刪除行數；'
+                 'full 另將 diff 原文寫入 <檔名>-code_changes-diff.jsonl 側檔 (預設: full)'
+        )
         user_stats_parser.set_defaults(func=self._cmd_user_stats)
         
         # 4. user-projects 命令
         user_projects_parser = subparsers.add_parser(
             'user-projects',
+            parents=[common_parser],
             help='取得使用者專案列表'
         )
         user_projects_parser.add_argument(
@@ -1936,6 +2511,7 @@ class GitLabCLI:
         # 5. group-stats 命令
         group_stats_parser = subparsers.add_parser(
             'group-stats',
+            parents=[common_parser, access_parser],
             help='取得群組所有資訊'
         )
         group_stats_parser.add_argument(
@@ -1944,13 +2520,18 @@ class GitLabCLI:
             nargs='*',
             help='群組名稱 (可選，不填則取得全部；可指定多個，例如: --group-name group1 group2)'
         )
+        group_stats_parser.add_argument(
+            '--recursive',
+            action='store_true',
+            help='遞迴走訪符合條件群組的所有子孫群組（廣度優先並行抓取，重複的群組與專案只抓一次）'
+        )
         group_stats_parser.set_defaults(func=self._cmd_group_stats)
         
         return parser
     
     def _cmd_project_stats(self, args):
         """執行專案統計命令（支援多筆專案）"""
-        service = self.create_project_stats_service()
+        service = self.create_project_stats_service(effective_access=args.effective_access)
         
         # 處理多筆專案名稱
         project_names = args.project_name if args.project_name else [None]
@@ -1980,7 +2561,7 @@ class GitLabCLI:
     
     def _cmd_project_permission(self, args):
         """執行專案授權命令（支援多筆專案）"""
-        service = self.create_project_permission_service()
+        service = self.create_project_permission_service(effective_access=args.effective_access)
         
         # 處理多筆專案名稱
         project_names = args.project_name if args.project_name else [None]
@@ -2010,7 +2591,7 @@ class GitLabCLI:
     
     def _cmd_user_stats(self, args):
         """執行使用者統計命令（支援多筆使用者和專案）"""
-        service = self.create_user_stats_service()
+        service = self.create_user_stats_service(diff_mode=args.diff_mode)
         
         # 處理多筆使用者名稱
         usernames = args.username if args.username else [None]
@@ -2046,7 +2627,8 @@ class GitLabCLI:
                     project_name=project_name,
                     start_date=args.start_date or config.START_DATE,
                     end_date=args.end_date or config.END_DATE,
-                    group_id=args.group_id or config.TARGET_GROUP_ID
+                    group_id=args.group_id or config.TARGET_GROUP_ID,
+                    prune_by_events=args.prune_by_events
                 )
     
     def _cmd_user_projects(self, args):
@@ -2094,7 +2676,8 @@ class GitLabCLI:
     
     def _cmd_group_stats(self, args):
         """執行群組統計命令（支援多筆群組）"""
-        service = self.create_group_stats_service()
+        service = self.create_group_stats_service(recursive=args.recursive,
+                                                  effective_access=args.effective_access)
         
         # 處理多筆群組名稱
         group_names = args.group_name if args.group_name else [None]
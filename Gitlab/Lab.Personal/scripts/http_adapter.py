@@ -0,0 +1,171 @@
+"""
+GitLab 客戶端使用的 HTTP Adapter
+
+掛載到 python-gitlab 的 requests Session 上，在傳輸層處理：
+- GET 回應的持久化快取與 ETag 重新驗證
+- 依 GitLab RateLimit 標頭調整的請求節流
+- 連線池大小、暫時性錯誤重試（指數退避）與預設連線 / 讀取逾時
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from http_cache import ResponseCache
+from rate_limiter import RateLimiter
+
+
+# 暫時性的伺服器錯誤才重試；429 由 RateLimiter 依 Retry-After 處理
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+def build_retry(max_retries: int, backoff_factor: float) -> Retry:
+    """
+    建立 urllib3 重試策略
+
+    連線錯誤一律可重試；讀取逾時與 5xx 只重試冪等方法，避免重複建立 MR 留言等資源。
+    重試用完後回傳最後一次回應，由 python-gitlab 轉成例外。
+
+    Args:
+        max_retries: 最多重試次數
+        backoff_factor: 指數退避係數（第 n 次重試前等待 backoff_factor * 2^(n-1) 秒）
+
+    Returns:
+        Retry 物件
+    """
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class GitLabHTTPAdapter(HTTPAdapter):
+    """支援回應快取、請求節流與連線池調校的 HTTP Adapter"""
+
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 timeout: Optional[Tuple[float, float]] = None, **kwargs):
+        """
+        初始化 Adapter
+
+        Args:
+            cache: 回應快取 (可選，None 表示不快取)
+            rate_limiter: 請求節流器 (可選，None 表示不節流)
+            pool_size: 每個主機保留的 keep-alive 連線數，應不小於並行的執行緒數，
+                       否則多出的連線用完即關閉，下次請求需重新建立 TLS 連線
+            max_retries: 連線錯誤與暫時性 5xx 的重試次數
+            backoff_factor: 重試的指數退避係數
+            timeout: 預設的 (連線, 讀取) 逾時秒數 (可選；呼叫端自行指定 timeout 時以呼叫端為準)
+            **kwargs: 傳給 HTTPAdapter 的參數
+        """
+        super().__init__(pool_maxsize=pool_size,
+                         max_retries=build_retry(max_retries, backoff_factor), **kwargs)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+
+        self._stats_lock = threading.Lock()
+        self._retries = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得連線池統計
+
+        Returns:
+            requests：實際送到伺服器的請求數；new_connections：新建立的連線數；
+            reused：重用既有 keep-alive 連線的請求數；retries：重試次數
+        """
+        requests_sent = new_connections = 0
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                requests_sent += pool.num_requests
+                new_connections += pool.num_connections
+
+        with self._stats_lock:
+            retries = self._retries
+        # 重試也會計入 num_requests，因此重用數以實際請求數扣除新連線計算
+        return {
+            'requests': requests_sent,
+            'new_connections': new_connections,
+            'reused': max(0, requests_sent - new_connections),
+            'retries': retries,
+        }
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        """送出請求；可快取的 GET 先查快取，必要時以 If-None-Match 重新驗證"""
+        if kwargs.get('timeout') is None and self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+
+        if self.cache is None or request.method != 'GET' or stream:
+            return self._send_throttled(request, stream=stream, **kwargs)
+
+        token = request.headers.get('PRIVATE-TOKEN') or request.headers.get('Authorization')
+        key = self.cache.make_key(request.url, token)
+        entry = self.cache.get(key)
+
+        if entry and entry['fresh']:
+            self.cache.record('hits')
+            return self._build_response(request, entry)
+
+        if entry and entry['etag']:
+            request = request.copy()
+            request.headers['If-None-Match'] = entry['etag']
+
+        response = self._send_throttled(request, stream=stream, **kwargs)
+
+        if entry and response.status_code == 304:
+            # 內容未變更：釋放連線並回傳快取內容
+            response.close()
+            self.cache.touch(key)
+            self.cache.record('revalidated')
+            return self._build_response(request, entry)
+
+        if response.status_code == 200:
+            self.cache.put(key, request.url, response.status_code, dict(response.headers), response.content)
+        self.cache.record('misses')
+        return response
+
+    def _send_throttled(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """實際送出請求；快取命中不經過此處，因此不消耗節流額度"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = super().send(request, **kwargs)
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(response.headers, response.status_code)
+        self._count_retries(response)
+        return response
+
+    def _count_retries(self, response: requests.Response) -> None:
+        """累計 urllib3 在這次請求中的重試次數"""
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None and retries.history:
+            with self._stats_lock:
+                self._retries += len(retries.history)
+
+    def _build_response(self, request: requests.PreparedRequest, entry: dict) -> requests.Response:
+        """以快取項目組出 requests.Response"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = 'OK'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
@@ -0,0 +1,165 @@
+"""
+GitLab API 回應的持久化快取
+
+以 SQLite 儲存 GET 回應（狀態碼、標頭、內容、ETag），提供：
+- 以 commit SHA 定址的資源（commit 詳細資訊、diff）視為不可變，永久有效
+- 其他可變資源（MR、成員、列表）在 TTL 內直接使用，過期後以 ETag/If-None-Match 重新驗證
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# 以 40 碼 commit SHA 定址的資源內容永遠不會改變
+IMMUTABLE_PATH_PATTERN = re.compile(
+    r"/projects/[^/]+/repository/commits/[0-9a-f]{40}(/diff)?$"
+)
+
+
+class ResponseCache:
+    """SQLite 回應快取（多執行緒共用）"""
+
+    def __init__(self, cache_dir: str, ttl: float = 3600):
+        """
+        初始化快取
+
+        Args:
+            cache_dir: 快取目錄
+            ttl: 可變資源的有效秒數，過期後需重新驗證
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "http-cache.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                immutable INTEGER NOT NULL,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+    # ==================== 快取鍵 ====================
+
+    @staticmethod
+    def make_key(url: str, auth_token: Optional[str] = None) -> str:
+        """
+        產生快取鍵（端點 + 排序後的查詢參數 + 權杖雜湊）
+
+        不同權杖可見的資料可能不同，因此以權杖雜湊區隔快取，但不儲存權杖本身。
+
+        Args:
+            url: 完整請求 URL
+            auth_token: 請求使用的權杖 (可選)
+
+        Returns:
+            快取鍵
+        """
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+        scope = hashlib.sha256((auth_token or '').encode('utf-8')).hexdigest()[:16]
+        return hashlib.sha256(f"{scope}|{normalized}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_immutable(url: str) -> bool:
+        """判斷資源是否以 commit SHA 定址（內容不可變）"""
+        return bool(IMMUTABLE_PATH_PATTERN.search(urlsplit(url).path))
+
+    # ==================== 讀寫 ====================
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        讀取快取項目
+
+        Returns:
+            快取項目字典（另含 fresh 欄位表示是否可直接使用），不存在時回傳 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, etag, immutable, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        status, headers, body, etag, immutable, stored_at = row
+        return {
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'etag': etag,
+            'immutable': bool(immutable),
+            'fresh': bool(immutable) or (time.time() - stored_at) < self.ttl,
+        }
+
+    def put(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        寫入快取項目
+
+        Args:
+            key: 快取鍵
+            url: 請求 URL
+            status: HTTP 狀態碼
+            headers: 回應標頭
+            body: 回應內容
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, url, status, json.dumps(headers), body,
+                    headers.get('ETag') or headers.get('etag'),
+                    int(self.is_immutable(url)), time.time()
+                )
+            )
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """重新驗證成功（304）後更新儲存時間"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    # ==================== 統計 ====================
+
+    def record(self, outcome: str) -> None:
+        """
+        記錄快取結果
+
+        Args:
+            outcome: 'hits'（直接命中）、'revalidated'（304 重新驗證）或 'misses'（重新下載）
+        """
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """取得快取統計"""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """關閉資料庫連線"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,214 @@
+"""
+專案有效權限解析
+
+群組成員只抓取一次並快取，在記憶體中計算每個專案的有效權限與來源：
+- direct：專案的直接成員
+- inherited：專案所在群組及其上層群組的成員
+- shared：專案分享給的群組成員（含該群組繼承的成員），權限以分享時設定的上限為準
+
+每個專案呼叫一次 members/all 取得有效成員；有效成員無法全部由群組成員解釋時
+（表示專案有直接成員），才另外呼叫專案直接成員 API。
+
+這是稽核功能，不會減少請求數：除了每個專案一次 members/all（必要時再加一次直接成員），
+每個群組還需要一次明細與成員請求（快取後跨專案共用），總請求數不少於只列出專案成員的做法。
+
+無權讀取（403 / 404）的上層群組會中止往上追溯，無權列出成員的群組視為沒有成員；
+只能由這些群組解釋的權限來源標示為 unknown。
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import gitlab
+
+
+# 同一成員有多個相同權限的來源時，依此順序決定顯示的來源
+SOURCE_PRIORITY = {'direct': 0, 'inherited': 1, 'shared': 2}
+
+# 視為無權讀取的 HTTP 狀態碼
+UNREADABLE_STATUS = (403, 404)
+
+
+def _readable(loader: Callable[[int], Any]) -> Callable[[int], Any]:
+    """
+    包裝載入函數：無權讀取（403 / 404）時回傳 None，讓結果也能快取，不會每個專案重試
+
+    Args:
+        loader: 載入函數
+
+    Returns:
+        包裝後的載入函數（其他錯誤照常拋出）
+    """
+    def load(key: int) -> Any:
+        try:
+            return loader(key)
+        except gitlab.exceptions.GitlabError as e:
+            if e.response_code in UNREADABLE_STATUS:
+                return None
+            raise
+    return load
+
+
+class PermissionResolver:
+    """專案有效權限解析器（執行緒安全，快取可跨專案共用）"""
+
+    def __init__(self, client: Any, timeout: Optional[float] = None):
+        """
+        初始化解析器
+
+        Args:
+            client: GitLabClient
+            timeout: 專案成員請求的逾時秒數 (可選)
+        """
+        self.client = client
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self._caches: Dict[str, Dict[int, Any]] = {'group': {}, 'members': {}, 'members_all': {}}
+
+        self._stats = {'projects': 0, 'direct_lookups': 0, 'group_requests': 0}
+
+    # ==================== 群組快取 ====================
+
+    def _cached(self, cache_name: str, key: int, loader: Callable[[int], Any]) -> Any:
+        """
+        取得快取值；同一個鍵同時只會有一個執行緒載入，其他執行緒等待結果
+
+        Args:
+            cache_name: 快取名稱
+            key: 群組 ID
+            loader: 載入函數
+
+        Returns:
+            快取值（載入失敗時拋出例外，不會寫入快取）
+        """
+        cache = self._caches[cache_name]
+        with self._lock:
+            if key in cache:
+                return cache[key]
+            key_lock = self._key_locks.setdefault((cache_name, key), threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in cache:
+                    return cache[key]
+            value = loader(key)
+            with self._lock:
+                cache[key] = value
+                self._stats['group_requests'] += 1
+            return value
+
+    def get_group(self, group_id: int) -> Optional[Any]:
+        """取得群組明細（快取；無權讀取時為 None）"""
+        return self._cached('group', group_id, _readable(self.client.get_group))
+
+    def get_group_members(self, group_id: int) -> List[Any]:
+        """取得群組的直接成員（快取；無權讀取時為空列表）"""
+        return self._cached('members', group_id, _readable(self.client.get_group_members)) or []
+
+    def get_group_members_all(self, group_id: int) -> List[Any]:
+        """取得群組的有效成員，含繼承自上層群組的成員（快取；無權讀取時為空列表）"""
+        return self._cached('members_all', group_id, _readable(self.client.get_group_members_all)) or []
+
+    def get_ancestors(self, group_id: int) -> List[Any]:
+        """
+        取得群組及其所有上層群組（遇到無權讀取的群組即停止）
+
+        Args:
+            group_id: 群組 ID
+
+        Returns:
+            群組明細列表，由近到遠（第一個為群組本身）
+        """
+        chain = []
+        current: Optional[int] = group_id
+        while current and len(chain) < 20:  # GitLab 群組最多 20 層
+            group = self.get_group(current)
+            if group is None:
+                break
+            chain.append(group)
+            current = getattr(group, 'parent_id', None)
+        return chain
+
+    # ==================== 權限解析 ====================
+
+    def resolve_project(self, project: Any) -> List[Dict[str, Any]]:
+        """
+        計算專案的有效權限
+
+        Args:
+            project: 專案明細物件（需有 namespace 與 shared_with_groups）
+
+        Returns:
+            每位有效成員一筆：member_id、member_name、member_username、member_email、
+            access_level、expires_at、access_source（direct / inherited / shared / unknown）、
+            access_source_name（權限來源的群組或專案路徑）
+        """
+        candidates: Dict[int, Tuple[int, str, str]] = {}
+
+        def offer(member: Any, level: int, source: str, source_name: str) -> None:
+            current = candidates.get(member.id)
+            if (current is None or level > current[0]
+                    or (level == current[0] and SOURCE_PRIORITY[source] < SOURCE_PRIORITY[current[1]])):
+                candidates[member.id] = (level, source, source_name)
+
+        # 1. 繼承：專案所在群組與上層群組的直接成員
+        namespace = getattr(project, 'namespace', None) or {}
+        if namespace.get('kind') == 'group':
+            for group in self.get_ancestors(namespace['id']):
+                for member in self.get_group_members(group.id):
+                    offer(member, member.access_level, 'inherited', group.full_path)
+
+        # 2. 分享：分享群組的有效成員，權限不超過分享時設定的上限
+        for shared in getattr(project, 'shared_with_groups', None) or []:
+            limit = shared.get('group_access_level', 0)
+            source_name = shared.get('group_full_path') or shared.get('group_name', '')
+            for member in self.get_group_members_all(shared['group_id']):
+                offer(member, min(member.access_level, limit), 'shared', source_name)
+
+        # 3. 有效成員；有群組成員無法解釋的權限時，才查詢專案直接成員
+        effective = self.client.get_project_members_all(project.id, timeout=self.timeout)
+        unexplained = [
+            member for member in effective
+            if member.id not in candidates or candidates[member.id][0] < member.access_level
+        ]
+        if unexplained:
+            project_path = getattr(project, 'path_with_namespace', project.name)
+            for member in self.client.get_project_members(project.id, timeout=self.timeout):
+                offer(member, member.access_level, 'direct', project_path)
+
+        with self._lock:
+            self._stats['projects'] += 1
+            self._stats['direct_lookups'] += 1 if unexplained else 0
+
+        rows = []
+        for member in effective:
+            candidate = candidates.get(member.id)
+            if candidate and candidate[0] >= member.access_level:
+                _, source, source_name = candidate
+            else:
+                # 來源不在已知的群組 / 直接成員中（例如無權讀取的上層群組）
+                source, source_name = 'unknown', ''
+            rows.append({
+                'member_id': member.id,
+                'member_name': getattr(member, 'name', ''),
+                'member_username': member.username,
+                'member_email': getattr(member, 'email', ''),
+                'access_level': member.access_level,
+                'expires_at': getattr(member, 'expires_at', None),
+                'access_source': source,
+                'access_source_name': source_name,
+            })
+        return rows
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        取得統計
+
+        Returns:
+            projects：解析的專案數；direct_lookups：需要查詢直接成員的專案數；
+            group_requests：實際發出的群組請求數（其餘皆由快取提供）
+        """
+        with self._lock:
+            return dict(self._stats)
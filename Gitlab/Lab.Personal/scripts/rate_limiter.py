@@ -0,0 +1,137 @@
+"""
+GitLab API 請求節流
+
+以 token bucket 控制送出速率（多執行緒共用），並依 GitLab 回應標頭自動調整：
+- RateLimit-Remaining / RateLimit-Reset：把剩餘額度平均分配到重置前，閒置累積的額度可一次爆發使用
+- RateLimit-Limit：允許累積的爆發上限
+- Retry-After（或 429）：暫停所有請求直到指定時間
+伺服器未回傳上述標頭時，以初始速率節流。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+
+# 依伺服器額度計算速率時的下限（每秒請求數），避免等待時間無限放大
+MIN_RATE = 0.01
+
+
+class RateLimiter:
+    """token bucket 節流器（執行緒安全）"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 20):
+        """
+        初始化節流器
+
+        Args:
+            rate: 初始每秒請求數（尚未取得伺服器額度時使用）
+            burst: 初始可累積的爆發請求數
+        """
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._reset_at: Optional[float] = None
+
+        self._stats = {'waits': 0, 'wait_seconds': 0.0, 'throttled': 0}
+
+    # ==================== 取得額度 ====================
+
+    def acquire(self) -> None:
+        """取得一次請求額度，額度不足時阻塞等待"""
+        while True:
+            with self._lock:
+                wait = self._reserve(time.monotonic())
+                if wait > 0:
+                    self._stats['waits'] += 1
+                    self._stats['wait_seconds'] += wait
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _reserve(self, now: float) -> float:
+        """嘗試扣除一個 token；成功回傳 0，否則回傳需等待的秒數（呼叫端需持有鎖）"""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        if self._reset_at is not None and now >= self._reset_at:
+            # 伺服器額度已重置，恢復初始速率直到下一個回應更新額度
+            self._reset_at = None
+            self.rate = self.base_rate
+
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        wait = (1 - self._tokens) / self.rate
+        if self._reset_at is not None:
+            wait = min(wait, self._reset_at - now)
+        return max(wait, 0.001)
+
+    def _refill(self, now: float) -> None:
+        """依經過時間補充 token（呼叫端需持有鎖）"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    # ==================== 伺服器回饋 ====================
+
+    def update_from_headers(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """
+        依回應標頭調整節流狀態
+
+        Args:
+            headers: 回應標頭（不分大小寫）
+            status_code: HTTP 狀態碼
+        """
+        limit = _parse_number(headers.get('RateLimit-Limit'))
+        remaining = _parse_number(headers.get('RateLimit-Remaining'))
+        reset = _parse_number(headers.get('RateLimit-Reset'))
+        retry_after = _parse_number(headers.get('Retry-After'))
+
+        now = time.monotonic()
+        with self._lock:
+            self._refill(now)
+
+            if limit:
+                self.capacity = max(self.capacity, limit)
+
+            if remaining is not None and reset is not None:
+                window = max(reset - time.time(), 0.0)
+                self._reset_at = now + window
+                # 已累積的 token 不可超過伺服器剩餘額度，其餘額度平均分配到重置前
+                self._tokens = min(self._tokens, remaining)
+                if remaining <= 0:
+                    self._blocked_until = max(self._blocked_until, now + window)
+                else:
+                    self.rate = max((remaining - self._tokens) / max(window, 1.0), MIN_RATE)
+
+            if status_code == 429 or retry_after is not None:
+                if status_code == 429:
+                    self._stats['throttled'] += 1
+                self._tokens = 0.0
+                self._blocked_until = max(self._blocked_until, now + (retry_after or 1.0))
+
+    # ==================== 統計 ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得節流統計（等待次數、累計等待秒數、被伺服器限流次數）"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    """解析數值標頭，無法解析時回傳 None"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
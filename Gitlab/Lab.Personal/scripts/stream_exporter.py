@@ -0,0 +1,354 @@
+"""
+串流分塊匯出
+
+以資料列產生器為輸入，每累積 chunk_size 筆寫出一次，記憶體只保留目前分塊：
+- csv / csv.gz / csv.zst：CSV（UTF-8 BOM），可選 gzip 或 zstd 壓縮
+- jsonl：每行一筆 JSON
+- parquet：Parquet（每個分塊寫成一個 row group）
+
+大型文字欄位（例如 diff）可分流到側檔 <檔名>-<欄位>.jsonl[.gz|.zst]，
+主檔只保留 <欄位>_ref 參照編號，側檔每行為 {"ref": 編號, "<欄位>": 內容}。
+
+選用套件：csv.zst 需要 zstandard，parquet 需要 pyarrow。
+"""
+
+import csv
+import gzip
+import io
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence
+
+
+FORMATS = ('csv', 'csv.gz', 'csv.zst', 'jsonl', 'parquet')
+
+# 側檔與主檔使用相同的壓縮方式（parquet 的側檔不壓縮）
+SIDE_FILE_SUFFIX = {'csv.gz': '.jsonl.gz', 'csv.zst': '.jsonl.zst'}
+
+
+def _open_text(path: Path, compression: Optional[str]) -> IO[str]:
+    """
+    開啟文字輸出串流
+
+    Args:
+        path: 檔案路徑
+        compression: None / 'gz' / 'zst'
+
+    Returns:
+        可寫入的文字串流
+    """
+    if compression == 'gz':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zst':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("csv.zst 格式需要 zstandard 套件：pip install zstandard") from e
+        raw = open(path, 'wb')
+        stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def _clean(value: Any) -> Any:
+    """將 pandas 的缺值（NaN / NaT）轉為 None"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is not None and type(value).__name__ == 'NaTType':
+        return None
+    return value
+
+
+class SpillWriter:
+    """大型文字欄位的側檔寫入器"""
+
+    def __init__(self, path: Path, column: str, compression: Optional[str]):
+        self.path = path
+        self.column = column
+        self.compression = compression
+        self.count = 0
+        self._stream: Optional[IO[str]] = None
+
+    def write(self, value: Any) -> Optional[int]:
+        """寫入一個值並回傳參照編號（空值不寫入，回傳 None）"""
+        if value is None or value == '':
+            return None
+        if self._stream is None:
+            self._stream = _open_text(self.path, self.compression)
+        self.count += 1
+        self._stream.write(json.dumps({'ref': self.count, self.column: value}, ensure_ascii=False))
+        self._stream.write('\n')
+        return self.count
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class StreamingExporter:
+    """串流分塊匯出器"""
+
+    def __init__(self, output_dir: str = "./output", output_format: str = 'csv',
+                 chunk_size: int = 5000, spill_columns: Optional[Sequence[str]] = None):
+        """
+        初始化匯出器
+
+        Args:
+            output_dir: 輸出目錄
+            output_format: 輸出格式 (csv / csv.gz / csv.zst / jsonl / parquet)
+            chunk_size: 每個分塊的筆數
+            spill_columns: 分流到側檔的大型文字欄位 (可選，例如 ['body'])
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"不支援的輸出格式: {output_format}（可用: {', '.join(FORMATS)}）")
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format
+        self.chunk_size = max(1, chunk_size)
+        self.spill_columns = list(spill_columns or [])
+
+    @property
+    def extension(self) -> str:
+        """輸出檔的副檔名（不含點）"""
+        return self.output_format
+
+    def path_for(self, filename: str) -> Path:
+        """取得輸出檔路徑"""
+        return self.output_dir / f"{filename}.{self.extension}"
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]], filename: str,
+                   columns: Optional[Sequence[str]] = None) -> int:
+        """
+        串流寫出資料列
+
+        Args:
+            rows: 資料列（dict）產生器
+            filename: 檔名（不含副檔名）
+            columns: 欄位順序 (可選，預設取第一筆的欄位；之後才出現的欄位會被忽略)
+
+        Returns:
+            寫出的筆數（0 筆時不建立檔案）
+        """
+        chunks = self._chunks(iter(rows))
+        first = next(chunks, None)
+        if first is None:
+            return 0
+
+        columns = list(columns or first[0].keys())
+        spills = self._open_spills(filename, columns)
+        out_columns = [f"{c}_ref" if c in spills else c for c in columns]
+
+        def prepared() -> Iterator[List[Dict[str, Any]]]:
+            yield self._prepare(first, columns, spills)
+            for chunk in chunks:
+                yield self._prepare(chunk, columns, spills)
+
+        path = self.path_for(filename)
+        try:
+            if self.output_format == 'parquet':
+                total = self._write_parquet(path, out_columns, prepared())
+            elif self.output_format == 'jsonl':
+                total = self._write_jsonl(path, prepared())
+            else:
+                compression = self.output_format.partition('.')[2] or None
+                total = self._write_csv(path, out_columns, prepared(), compression)
+        finally:
+            for spill in spills.values():
+                spill.close()
+
+        print(f"✓ {self.output_format.upper()} exported: {path} ({total} 筆)")
+        for spill in spills.values():
+            if spill.count:
+                print(f"  ↳ {spill.column} 分流 {spill.count} 筆: {spill.path}")
+        return total
+
+    def write_frame(self, df: Any, filename: str) -> int:
+        """
+        分塊寫出 DataFrame（不一次轉換整個 DataFrame）
+
+        Args:
+            df: pandas DataFrame
+            filename: 檔名（不含副檔名）
+
+        Returns:
+            寫出的筆數
+        """
+        def rows() -> Iterator[Dict[str, Any]]:
+            for start in range(0, len(df), self.chunk_size):
+                for row in df.iloc[start:start + self.chunk_size].to_dict('records'):
+                    yield {key: _clean(value) for key, value in row.items()}
+
+        return self.write_rows(rows(), filename, columns=[str(c) for c in df.columns])
+
+    def open_side_file(self, filename: str, column: str) -> SpillWriter:
+        """
+        建立側檔寫入器（檔名與壓縮方式與分流欄位相同），供呼叫端在產生資料時直接寫出大型欄位
+
+        Args:
+            filename: 主檔檔名（不含副檔名）
+            column: 欄位名稱
+
+        Returns:
+            側檔寫入器（使用完畢需呼叫 close）
+        """
+        suffix = SIDE_FILE_SUFFIX.get(self.output_format, '.jsonl')
+        compression = suffix.rpartition('.')[2] if suffix != '.jsonl' else None
+        return SpillWriter(self.output_dir / f"{filename}-{column}{suffix}", column, compression)
+
+    # ==================== 內部實作 ====================
+
+    def _chunks(self, rows: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """將資料列切成分塊"""
+        while True:
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    break
+            if not chunk:
+                return
+            yield chunk
+
+    def _open_spills(self, filename: str, columns: List[str]) -> Dict[str, SpillWriter]:
+        """為需要分流的欄位建立側檔寫入器"""
+        return {
+            column: self.open_side_file(filename, column)
+            for column in self.spill_columns if column in columns
+        }
+
+    @staticmethod
+    def _prepare(chunk: List[Dict[str, Any]], columns: List[str],
+                 spills: Dict[str, SpillWriter]) -> List[Dict[str, Any]]:
+        """依欄位順序整理分塊，並將分流欄位替換為參照編號"""
+        prepared = []
+        for row in chunk:
+            out = {}
+            for column in columns:
+                value = row.get(column)
+                if column in spills:
+                    out[f"{column}_ref"] = spills[column].write(value)
+                else:
+                    out[column] = value
+            prepared.append(out)
+        return prepared
+
+    @staticmethod
+    def _write_csv(path: Path, columns: List[str], chunks: Iterable[List[Dict[str, Any]]],
+                   compression: Optional[str]) -> int:
+        total = 0
+        with _open_text(path, compression) as stream:
+            stream.write('\ufeff')  # 與 pandas encoding='utf-8-sig' 相同，方便 Excel 開啟
+            writer = csv.DictWriter(stream, fieldnames=columns, lineterminator='\n')
+            writer.writeheader()
+            for chunk in chunks:
+                writer.writerows(chunk)
+                total += len(chunk)
+        return total
+
+    @staticmethod
+    def _write_jsonl(path: Path, chunks: Iterable[List[Dict[str, Any]]]) -> int:
+        total = 0
+        with _open_text(path, None) as stream:
+            for chunk in chunks:
+                for row in chunk:
+                    stream.write(json.dumps(row, ensure_ascii=False, default=str))
+                    stream.write('\n')
+                total += len(chunk)
+        return total
+
+    @staticmethod
+    def _write_parquet(path: Path, columns: List[str], chunks: Iterable[List[Dict[str, Any]]]) -> int:
+        """
+        寫出 Parquet（每個分塊一個 row group）
+
+        欄位型別隨分塊放寬：全為空值的欄位在出現值後決定型別，整數欄位出現小數時改為浮點數；
+        型別放寬時以新型別重寫已寫出的 row group（只做不失真的轉換）。
+        型別無法合併（例如整數與字串）或轉換會失真時拋出 ValueError。
+        先寫入暫存檔，完成後才取代輸出檔，失敗時不會留下不完整的檔案。
+
+        Args:
+            path: 輸出檔路徑
+            columns: 欄位順序
+            chunks: 已整理的分塊
+
+        Returns:
+            寫出的筆數
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("parquet 格式需要 pyarrow 套件：pip install pyarrow") from e
+
+        def storage_schema(schema: Any) -> Any:
+            # 仍全為空值的欄位先以字串儲存（分流參照編號為整數）
+            return pa.schema([
+                pa.field(field.name, (pa.int64() if field.name.endswith('_ref') else pa.string())
+                         if pa.types.is_null(field.type) else field.type)
+                for field in schema
+            ])
+
+        def to_table(rows: List[Dict[str, Any]]) -> Any:
+            try:
+                return pa.Table.from_pylist(rows).select(columns)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(f"parquet 分塊內的欄位型別不一致: {e}") from e
+
+        def cast(table: Any, schema: Any) -> Any:
+            try:
+                return table.cast(schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(f"parquet 欄位型別轉換會失真: {e}") from e
+
+        def open_writer(schema: Any) -> None:
+            # 開啟新的暫存檔；已有寫出的 row group 時以放寬後的型別複製過去
+            nonlocal writer, current
+            generation = len(temp_paths)
+            temp_paths.append(path.with_name(f"{path.name}.tmp{generation}"))
+            new_writer = pq.ParquetWriter(temp_paths[-1], schema)
+            if writer is not None:
+                writer.close()
+                source = pq.ParquetFile(current)
+                try:
+                    for index in range(source.num_row_groups):
+                        new_writer.write_table(cast(source.read_row_group(index), schema))
+                finally:
+                    source.close()
+                current.unlink()
+            writer, current = new_writer, temp_paths[-1]
+
+        temp_paths: List[Path] = []
+        current: Optional[Path] = None
+        total = 0
+        writer = None
+        schema = None  # 目前推斷的欄位型別（全為空值的欄位為 null）
+        try:
+            for chunk in chunks:
+                table = to_table(chunk)
+                if schema is None:
+                    merged = table.schema
+                else:
+                    try:
+                        merged = pa.unify_schemas([schema, table.schema], promote_options='permissive')
+                    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                        raise ValueError(f"parquet 欄位型別無法合併: {e}") from e
+
+                target = storage_schema(merged)
+                if writer is None or target != writer.schema:
+                    open_writer(target)
+                schema = merged
+                writer.write_table(cast(table, target))
+                total += len(chunk)
+            writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            for temp_path in temp_paths:
+                temp_path.unlink(missing_ok=True)
+            raise
+
+        current.replace(path)
+        return total